@@ -0,0 +1,244 @@
+# assetpack.py
+import io
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+
+from config import BASE_ASSETS, ASSET_PACK_PATH, ASSET_PACK_ENABLED
+
+"""
+Pacote único de assets (arquivo .pak) lido via mmap.
+
+Em vez de dezenas de os.path.exists + open espalhados pelos módulos, o jogo abre um
+único arquivo por sessão: um cabeçalho com o índice (nome -> offset/tamanho/formato/hash)
+seguido dos arquivos originais concatenados. O arquivo é mapeado em memória e cada
+asset é entregue como memoryview (sem cópia) ou como objeto arquivo para o pygame.
+
+Se o pacote não existir (desenvolvimento), tudo cai de volta para os arquivos soltos
+em assets/ — os mesmos caminhos funcionam nos dois modos. Com pacote, um nome que não está
+no índice (asset novo, pacote antigo) também é procurado entre os arquivos soltos.
+
+Formato do arquivo:
+    b'ARPK1\\n'                       (6 bytes, assinatura)
+    tamanho do índice                (8 bytes, uint64 little-endian)
+    índice JSON (utf-8)              {"assets/img/x.png": {"offset", "length", "format", "sha1"}}
+    dados                            (cada asset alinhado em 16 bytes)
+
+Uso como script:
+    python assetpack.py build [pasta_assets] [arquivo_saida]  -> gera o pacote
+    python assetpack.py list [arquivo]                        -> lista o conteúdo
+"""
+
+_MAGIC = b'ARPK1\n'
+_ALIGN = 16
+
+
+def _norm(path):
+    """Normaliza um caminho para o formato de nome usado no índice ('assets/img/x.png')."""
+    name = path.replace('\\', '/')
+    while name.startswith('./'):
+        name = name[2:]
+    return name
+
+
+class AssetPack:
+    """
+    Pacote de assets aberto (somente leitura, mapeado em memória).
+
+    Construtor:
+        AssetPack(path) — abre o arquivo uma vez e lê o índice.
+
+    Métodos:
+        - has(name): bool — o asset está no pacote? (consulta só o índice)
+        - buffer(name): memoryview com os bytes do asset (sem cópia).
+        - open(name): objeto arquivo (io.BytesIO) com o conteúdo, para pygame.image.load,
+                      pygame.mixer.Sound(file=...), pygame.font.Font, etc.
+        - digest(name): sha1 do conteúdo gravado no índice.
+        - names(): lista de nomes no pacote.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path}: não é um pacote de assets válido")
+        (index_len,) = struct.unpack_from('<Q', self._mm, len(_MAGIC))
+        start = len(_MAGIC) + 8
+        self.index = json.loads(bytes(self._mm[start:start + index_len]).decode('utf-8'))
+        self._view = memoryview(self._mm)
+
+    def has(self, name):
+        return _norm(name) in self.index
+
+    def names(self):
+        return list(self.index.keys())
+
+    def buffer(self, name):
+        e = self.index[_norm(name)]
+        return self._view[e['offset']:e['offset'] + e['length']]
+
+    def open(self, name):
+        # o decodificador do pygame precisa de um objeto arquivo; a cópia aqui é só
+        # do arquivo comprimido (PNG/MP3), desprezível perto da decodificação
+        return io.BytesIO(self.buffer(name))
+
+    def digest(self, name):
+        return self.index[_norm(name)].get('sha1')
+
+
+# ---------------------- acesso transparente (pacote ou arquivos soltos) ----------------------
+
+_pack = None
+_pack_checked = False
+
+
+def get_pack():
+    """
+    Retorna o AssetPack da sessão (abre na primeira chamada) ou None se não houver pacote
+    (ou se ASSET_PACK_ENABLED for False) — nesse caso os arquivos soltos são usados.
+    """
+    global _pack, _pack_checked
+    if not _pack_checked:
+        _pack_checked = True
+        if ASSET_PACK_ENABLED and os.path.exists(ASSET_PACK_PATH):
+            try:
+                _pack = AssetPack(ASSET_PACK_PATH)
+            except Exception as e:
+                print("Pacote de assets inválido, usando arquivos soltos:", e, file=sys.stderr)
+                _pack = None
+    return _pack
+
+
+def exists(path):
+    """
+    Como os.path.exists, mas consulta primeiro o índice do pacote (nenhum stat para o que
+    está empacotado); nomes fora do índice são procurados entre os arquivos soltos.
+    """
+    pack = get_pack()
+    if pack is not None and pack.has(path):
+        return True
+    return os.path.exists(path)
+
+
+def open_asset(path):
+    """
+    Abre um asset para leitura binária.
+
+    Recebe:
+        - path: caminho relativo (ex.: os.path.join('assets', 'img', 'x.png')).
+    Retorna:
+        - objeto arquivo (do pacote ou, se não estiver no índice, do disco).
+          Lança FileNotFoundError se não existir.
+    """
+    pack = get_pack()
+    if pack is not None and pack.has(path):
+        return pack.open(path)
+    return open(path, 'rb')
+
+
+def asset_digest(path):
+    """
+    sha1 do conteúdo do asset: lido do índice do pacote ou None (o chamador calcula
+    a partir do arquivo solto).
+    """
+    pack = get_pack()
+    if pack is not None and pack.has(path):
+        return pack.digest(path)
+    return None
+
+
+def namehint(path):
+    """Extensão usada como dica de formato para pygame ao carregar de objeto arquivo."""
+    return os.path.splitext(path)[1].lstrip('.').lower()
+
+
+# ---------------------- construção do pacote ----------------------
+
+def build_pack(assets_dir=BASE_ASSETS, out_path=ASSET_PACK_PATH):
+    """
+    Empacota toda a árvore assets_dir num único arquivo.
+
+    Recebe:
+        - assets_dir: pasta raiz dos assets (padrão: config.BASE_ASSETS). Pode estar em
+                      qualquer lugar: os nomes no índice são sempre relativos a ela, com o
+                      prefixo BASE_ASSETS que o jogo usa ('assets/img/x.png').
+        - out_path: arquivo de saída (padrão: config.ASSET_PACK_PATH).
+    Retorna:
+        - dict com o índice gravado.
+    """
+    files = []
+    for root, _dirs, names in os.walk(assets_dir):
+        for n in sorted(names):
+            full = os.path.join(root, n)
+            if os.path.getsize(full) == 0:
+                # arquivos vazios (ex.: player.png) não são assets válidos
+                continue
+            files.append(full)
+    files.sort()
+
+    blobs = []
+    index = {}
+    for full in files:
+        with open(full, 'rb') as f:
+            data = f.read()
+        name = _norm(os.path.join(BASE_ASSETS, os.path.relpath(full, assets_dir)))
+        index[name] = {
+            'offset': 0,
+            'length': len(data),
+            'format': namehint(full),
+            'sha1': hashlib.sha1(data).hexdigest(),
+        }
+        blobs.append((name, data))
+
+    # o tamanho do índice depende dos offsets: calcula com folga fixa e preenche depois
+    def encode(idx):
+        return json.dumps(idx, sort_keys=True).encode('utf-8')
+
+    header_len = len(_MAGIC) + 8 + len(encode(index)) + 20 * len(index)
+    offset = header_len + (-header_len % _ALIGN)
+    for name, data in blobs:
+        index[name]['offset'] = offset
+        offset += len(data)
+        offset += -offset % _ALIGN
+    index_bytes = encode(index)
+    if len(index_bytes) > header_len - len(_MAGIC) - 8:
+        raise ValueError("índice maior que o espaço reservado no cabeçalho")
+    index_bytes = index_bytes.ljust(header_len - len(_MAGIC) - 8)
+
+    tmp = out_path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(struct.pack('<Q', len(index_bytes)))
+        f.write(index_bytes)
+        for name, data in blobs:
+            f.write(b'\0' * (index[name]['offset'] - f.tell()))
+            f.write(data)
+    os.replace(tmp, out_path)
+    return index
+
+
+def main(argv):
+    cmd = argv[0] if argv else 'build'
+    if cmd == 'build':
+        assets_dir = argv[1] if len(argv) > 1 else BASE_ASSETS
+        out_path = argv[2] if len(argv) > 2 else ASSET_PACK_PATH
+        index = build_pack(assets_dir, out_path)
+        total = sum(e['length'] for e in index.values())
+        print(f"{out_path}: {len(index)} asset(s), {total / (1024 * 1024):.1f} MB")
+        return 0
+    if cmd == 'list':
+        pack = AssetPack(argv[1] if len(argv) > 1 else ASSET_PACK_PATH)
+        for name in pack.names():
+            e = pack.index[name]
+            print(f"{e['offset']:>10} {e['length']:>10} {e['format']:>5}  {name}")
+        return 0
+    print("uso: python assetpack.py build [pasta_assets] [arquivo_saida] | list [arquivo]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
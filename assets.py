@@ -0,0 +1,540 @@
+# assets.py
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+import assetpack
+import bakecache
+from audio import BANK
+from atlas import Atlas, build as build_atlas
+from surfcache import DERIVED, surface_bytes
+from quality import QUALITY
+from config import ASSET_LOADER_WORKERS
+
+"""
+Registro central de assets (imagens e sons) compartilhado por todos os módulos.
+
+Antes cada fase (run_boss1, run_boss2, run_faroeste, menu) e cada PlayerSimple
+carregavam e reescalavam os mesmos arquivos por conta própria. O registro
+deduplica os pedidos pela chave (caminho, tamanho destino, modo de conversão)
+e guarda cada asset com um escopo de vida:
+
+    - SCOPE_SESSION:  fica residente até o programa terminar (menu, tutorial).
+    - SCOPE_CAMPAIGN: compartilhado entre as fases de uma campanha
+                      (frames dos jogadores, som de tiro).
+    - SCOPE_STAGE:    liberado quando a fase termina (fundos, chefes, sons da fase).
+
+Quem orquestra as fases (campaign.py) chama release_scope(...) ao final de cada
+fase/campanha. Pedir um asset já carregado com um escopo mais longo promove o
+escopo da entrada (nunca rebaixa).
+
+Cada fase declara seus assets num "manifesto" (dict nome -> spec criado com
+image_spec/sound_spec) e obtém tudo de uma vez com REGISTRY.load(manifesto).
+Imagens escaladas passam pelo cache em disco de bakecache.py, e os arquivos de origem
+são lidos do pacote único (assetpack.py) quando ele existir.
+
+Normalização: no modo 'auto' (padrão) cada imagem é inspecionada ao ser finalizada e
+recebe o formato de blit mais barato que a representa sem perdas:
+    - totalmente opaca          -> convert() (blit direto, sem mistura);
+    - alpha binário (0 ou 255)  -> convert() + colorkey com RLEACCEL;
+    - alpha parcial (bordas suaves, sombras) -> convert_alpha().
+Surfaces cujo formato final não bate com o do display são avisadas em stderr, porque
+cada blit delas paga uma conversão de pixel.
+
+Atlas: grupos de sprites pequenos (frames dos jogadores, chefes, animação do disparo) são
+descritos com atlas_spec(...) e carregados como um atlas.Atlas — uma surface só, com cada
+frame entregue como subsurface. O atlas inteiro é normalizado de uma vez e vai para o
+cache em disco como um único arquivo.
+"""
+
+SCOPE_STAGE = "stage"
+SCOPE_CAMPAIGN = "campaign"
+SCOPE_SESSION = "session"
+
+# ordem de "duração" dos escopos (maior = vive mais)
+_SCOPE_RANK = {SCOPE_STAGE: 0, SCOPE_CAMPAIGN: 1, SCOPE_SESSION: 2}
+
+
+def image_spec(path, size=None, keep_aspect=False, height=None, mode='auto', smooth=True, scope=SCOPE_STAGE):
+    """
+    Descreve uma imagem para um manifesto de assets (mesmos parâmetros de AssetRegistry.image).
+    smooth=True é só o pedido: se o nível de qualidade não permitir (quality.QUALITY,
+    'smooth_scale'), a escala usa scale na hora da decodificação — a chave não muda.
+
+    Retorna:
+        - dict com 'kind': 'image' e os parâmetros.
+    """
+    return {'kind': 'image', 'path': path, 'size': size, 'keep_aspect': keep_aspect,
+            'height': height, 'mode': mode, 'smooth': bool(smooth), 'scope': scope}
+
+
+def sound_spec(path, volume=None, scope=SCOPE_STAGE):
+    """
+    Descreve um efeito sonoro para um manifesto de assets (mesmos parâmetros de AssetRegistry.sound).
+
+    Retorna:
+        - dict com 'kind': 'sound' e os parâmetros.
+    """
+    return {'kind': 'sound', 'path': path, 'volume': volume, 'scope': scope}
+
+
+def atlas_spec(name, sprites, scope=SCOPE_STAGE):
+    """
+    Descreve um atlas de sprites para um manifesto de assets (ver atlas.py).
+
+    Recebe:
+        - name: nome do atlas (str; aparece no nome do arquivo de cache e nos avisos).
+        - sprites: dict nome do sprite -> lista de image_spec(...) (os frames, em ordem).
+                   O escopo e o modo de cada frame são ignorados: valem os do atlas.
+        - scope: escopo de vida do atlas inteiro.
+    Retorna:
+        - dict com 'kind': 'atlas' e os parâmetros.
+    """
+    return {'kind': 'atlas', 'name': name, 'sprites': {k: list(v) for k, v in sprites.items()}, 'scope': scope}
+
+
+class AssetRegistry:
+    """
+    Cache de imagens/sons com deduplicação e escopos de vida.
+
+    Métodos:
+        - image(path, size=None, keep_aspect=False, height=None, mode='auto', smooth=True, scope=SCOPE_STAGE)
+            Retorna pygame.Surface (compartilhada — não modifique) ou None se o arquivo não existir.
+        - sound(path, volume=None, scope=SCOPE_STAGE)
+            Retorna pygame.mixer.Sound compartilhado ou None (arquivo ausente / mixer indisponível).
+        - request(spec) / load(manifest, parallel=True)
+            Carrega um spec (image_spec/sound_spec/atlas_spec) ou um manifesto inteiro (dict nome -> spec).
+        - prefetch(manifest) / poll(max_items=1)
+            Agenda a decodificação do manifesto no pool de threads sem bloquear /
+            finaliza na thread principal os prefetches que já terminaram.
+        - ready(manifest)
+            True se o manifesto pode ser carregado sem esperar decodificação.
+        - busy()
+            True se ainda há prefetch em andamento ou esperando poll().
+        - contains(spec) / evict(spec)
+            Consulta / descarta um único asset (streaming).
+        - release_scope(scope)
+            Descarta todas as entradas daquele escopo.
+        - clear()
+            Descarta tudo.
+        - memory_bytes()
+            Memória ocupada pelas imagens e atlas carregados.
+
+    Construtor:
+        AssetRegistry(workers=ASSET_LOADER_WORKERS) — threads usadas por prefetch/load.
+
+    Atributos:
+        - stats: dict com contadores 'hits', 'misses' e 'released'.
+    """
+
+    def __init__(self, workers=ASSET_LOADER_WORKERS):
+        # threads do pool de decodificação (criado sob demanda no primeiro prefetch)
+        self.workers = max(1, int(workers))
+        self._pool = None
+        # chave -> {'value': objeto carregado (ou None), 'scope': str}
+        self._entries = {}
+        # chave -> (Future, spec) de um prefetch ainda não finalizado
+        self._pending = {}
+        self.stats = {'hits': 0, 'misses': 0, 'released': 0}
+
+    # ------------------------ API pública ------------------------
+
+    def image(self, path, size=None, keep_aspect=False, height=None, mode='auto', smooth=True, scope=SCOPE_STAGE):
+        """
+        Carrega (uma única vez) uma imagem já convertida e escalada.
+
+        Recebe:
+            - path: caminho do arquivo (str).
+            - size: (w, h) destino para smoothscale, ou None para manter o tamanho.
+            - keep_aspect: se True e size for dado, escala para caber em size preservando proporção.
+            - height: altura destino (int) — escala preservando proporção via rotozoom
+                      (mesmo resultado que o código antigo dos jogadores/chefes). Ignora size.
+            - mode: 'auto' (escolhe pelo conteúdo — ver normalize_surface), 'alpha' (convert_alpha),
+                    'opaque' (convert) ou None (sem conversão).
+            - smooth: True usa smoothscale; False usa scale (mais rápido, sem filtragem).
+            - scope: escopo de vida (SCOPE_STAGE, SCOPE_CAMPAIGN ou SCOPE_SESSION).
+
+        Retorna:
+            - pygame.Surface ou None se o arquivo não existir.
+        """
+        return self.request(image_spec(path, size, keep_aspect, height, mode, smooth, scope))
+
+    def sound(self, path, volume=None, scope=SCOPE_STAGE):
+        """
+        Carrega (uma única vez) um efeito sonoro.
+
+        Recebe:
+            - path: caminho do arquivo de áudio (str).
+            - volume: volume inicial (0.0..1.0) ou None; faz parte da chave para que
+                      quem pede volumes diferentes não interfira entre si.
+            - scope: escopo de vida.
+
+        Retorna:
+            - pygame.mixer.Sound ou None se o arquivo não existir ou o mixer falhar.
+        """
+        return self.request(sound_spec(path, volume, scope))
+
+    def request(self, spec):
+        """
+        Carrega um asset descrito por image_spec(...), sound_spec(...) ou atlas_spec(...).
+        Se o asset estiver sendo decodificado em segundo plano (prefetch), espera o
+        resultado e faz apenas a conversão final aqui, na thread principal.
+
+        Retorna:
+            - pygame.Surface / pygame.mixer.Sound / atlas.Atlas / None.
+        """
+        key = _spec_key(spec)
+        scope = spec['scope']
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.stats['hits'] += 1
+            # promove o escopo se o novo pedido precisa que o asset viva mais
+            if _SCOPE_RANK[scope] > _SCOPE_RANK[entry['scope']]:
+                entry['scope'] = scope
+            return entry['value']
+        self.stats['misses'] += 1
+        pending = self._pending.pop(key, None)
+        prepared = pending[0].result() if pending is not None else _prepare(spec)
+        value = _finish(spec, prepared)
+        self._entries[key] = {'value': value, 'scope': scope}
+        return value
+
+    def prefetch(self, manifest):
+        """
+        Agenda a decodificação/escala dos assets de um manifesto no pool de threads
+        (pygame libera o GIL ao decodificar PNG/MP3 e em smoothscale). Não bloqueia:
+        a conversão final para o formato do display acontece no próximo request/load.
+
+        Recebe:
+            - manifest: dict nome -> spec.
+        Retorna:
+            - list de concurrent.futures.Future agendados (vazia se tudo já estava carregado).
+        """
+        futures = []
+        for spec in manifest.values():
+            key = _spec_key(spec)
+            if key in self._entries or key in self._pending:
+                continue
+            future = self._executor().submit(_prepare, spec)
+            self._pending[key] = (future, spec)
+            futures.append(future)
+        return futures
+
+    def poll(self, max_items=1):
+        """
+        Finaliza (conversão na thread principal) até max_items prefetches que já terminaram
+        em segundo plano. Chamado a cada frame por telas "ociosas" (quadrinhos) para que,
+        quando a fase começar, os assets já estejam prontos no registro.
+
+        Retorna:
+            - int: quantos assets foram finalizados.
+        """
+        # prefetches que falharam ficam pendentes: o erro aparece quando a fase pedir o asset
+        done = [k for k, (f, _spec) in self._pending.items() if f.done() and f.exception() is None][:max_items]
+        for key in done:
+            self.request(self._pending[key][1])
+        return len(done)
+
+    def busy(self):
+        """
+        True enquanto houver prefetch decodificando ou pronto para poll(). Telas ociosas
+        usam isso para saber se ainda precisam acordar a cada frame (ver render.IdleScreen).
+        """
+        return any(not f.done() or f.exception() is None for f, _spec in self._pending.values())
+
+    def ready(self, manifest):
+        """
+        Diz se todos os assets do manifesto já estão disponíveis sem esperar decodificação:
+        carregados no registro ou com o prefetch em segundo plano já concluído.
+
+        Retorna:
+            - bool.
+        """
+        for spec in manifest.values():
+            key = _spec_key(spec)
+            if key in self._entries:
+                continue
+            pending = self._pending.get(key)
+            if pending is None or not pending[0].done():
+                return False
+        return True
+
+    def load(self, manifest, parallel=True):
+        """
+        Carrega todos os assets de um manifesto.
+
+        Recebe:
+            - manifest: dict nome -> spec (image_spec/sound_spec).
+            - parallel: se True (e workers > 1) decodifica em paralelo
+                        no pool de threads; False força o carregamento serial.
+        Retorna:
+            - dict nome -> asset carregado (ou None para arquivos ausentes).
+        """
+        if parallel and self.workers > 1:
+            self.prefetch(manifest)
+        return {name: self.request(spec) for name, spec in manifest.items()}
+
+    def contains(self, spec):
+        """True se o asset do spec já está carregado no registro."""
+        return _spec_key(spec) in self._entries
+
+    def evict(self, spec):
+        """
+        Descarta um único asset (ou seu prefetch pendente), independente do escopo.
+        Usado por quem faz streaming (ex.: quadrinhos já exibidos).
+        """
+        key = _spec_key(spec)
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.stats['released'] += 1
+            _forget_derived(entry['value'])
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            pending[0].cancel()
+
+    def release_scope(self, scope):
+        """
+        Remove do registro todas as entradas com o escopo informado (inclusive prefetches
+        pendentes). As surfaces/sons só são liberados de fato quando ninguém mais os referencia.
+        """
+        dead = [k for k, e in self._entries.items() if e['scope'] == scope]
+        for k in dead:
+            # as derivadas (espelhadas, rotacionadas...) saem junto com a original
+            _forget_derived(self._entries.pop(k)['value'])
+        self.stats['released'] += len(dead)
+        for k in [k for k, (_f, spec) in self._pending.items() if spec['scope'] == scope]:
+            self._pending.pop(k)[0].cancel()
+
+    def clear(self):
+        """Remove todas as entradas (qualquer escopo) e descarta prefetches pendentes."""
+        self.stats['released'] += len(self._entries)
+        for e in self._entries.values():
+            _forget_derived(e['value'])
+        self._entries.clear()
+        for future, _spec in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def memory_bytes(self):
+        """Memória ocupada pelos pixels das imagens e atlas carregados (bytes; sons não entram)."""
+        total = 0
+        for e in self._entries.values():
+            value = e['value']
+            if isinstance(value, Atlas):
+                # as views são janelas sobre o atlas: só a surface dele ocupa memória
+                value = value.surface
+            if isinstance(value, pygame.Surface):
+                total += surface_bytes(value)
+        return total
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='assets')
+        return self._pool
+
+
+# ---------------------- carregamento (internos) ----------------------
+
+
+def _spec_key(spec):
+    """Chave de deduplicação de um spec: (tipo, caminho, tamanho destino, modo...)."""
+    if spec['kind'] == 'image':
+        size = tuple(spec['size']) if spec['size'] is not None else None
+        return ('image', spec['path'], size, bool(spec['keep_aspect']), spec['height'],
+                spec['mode'], bool(spec['smooth']) and spec['height'] is None)
+    if spec['kind'] == 'sound':
+        return ('sound', spec['path'], spec['volume'])
+    if spec['kind'] == 'atlas':
+        return ('atlas', spec['name'], tuple((name, tuple(_spec_key(f) for f in frames))
+                                             for name, frames in sorted(spec['sprites'].items())))
+    raise ValueError(f"tipo de asset desconhecido: {spec['kind']!r}")
+
+
+def _smooth(spec, allowed):
+    """
+    Se a escala do spec usa smoothscale: o pedido do spec e o nível de qualidade do momento
+    da decodificação (allowed). Specs com height= sempre usam rotozoom e não dependem disso.
+    """
+    return bool(spec['smooth']) and bool(allowed) and spec['height'] is None and spec['size'] is not None
+
+
+def _recipe(spec, allowed):
+    return (f"size={spec['size'] and tuple(spec['size'])};aspect={bool(spec['keep_aspect'])};"
+            f"height={spec['height']};smooth={_smooth(spec, allowed)}")
+
+
+def _forget_derived(value):
+    """Descarta do cache de derivadas o que foi gerado a partir de um asset (ou das views de um atlas)."""
+    for surf in (value.views() if isinstance(value, Atlas) else [value]):
+        DERIVED.forget(surf)
+
+
+def _atlas_source(spec, allowed):
+    """
+    Arquivo que identifica o atlas no cache em disco (o primeiro frame existente) e a
+    receita com o hash e a escala de todos os frames: trocar qualquer PNG invalida o atlas.
+    """
+    paths = [f['path'] for frames in spec['sprites'].values() for f in frames]
+    first = next((p for p in paths if assetpack.exists(p)), None)
+    parts = [f"atlas={spec['name']}"]
+    for name, frames in sorted(spec['sprites'].items()):
+        for f in frames:
+            parts.append(f"{name}:{f['path']}:{bakecache.source_digest(f['path'])}:{_recipe(f, allowed)}")
+    return first, "|".join(parts)
+
+
+def _prepare(spec):
+    """
+    Parte do carregamento que pode rodar fora da thread principal: ler o cache em disco
+    ou decodificar + escalar a imagem; decodificar o som. Não usa o display.
+    O nível de qualidade (smoothscale ou não) é lido aqui, uma vez, e a receita do cache em
+    disco vai junto no resultado para _finish gravar exatamente o que foi decodificado.
+    """
+    allowed = QUALITY.get('smooth_scale')
+    if spec['kind'] == 'atlas':
+        return _prepare_atlas(spec, allowed)
+    path = spec['path']
+    if not assetpack.exists(path):
+        return None
+    if spec['kind'] == 'sound':
+        # efeitos sonoros ficam no banco da sessão: decodificados uma vez só (ver audio.py)
+        return BANK.get(path, spec['volume'])
+    recipe = _recipe(spec, allowed)
+    raw = bakecache.read(path, recipe, spec['mode'])
+    if raw is not None:
+        return {'surface': raw, 'baked': True, 'recipe': recipe}
+    img = pygame.image.load(assetpack.open_asset(path), path)
+    return {'surface': _scale(img, spec, allowed), 'baked': False, 'recipe': recipe}
+
+
+def _prepare_atlas(spec, allowed):
+    source, recipe = _atlas_source(spec, allowed)
+    if source is None:
+        return None
+    raw, layout = bakecache.read_meta(source, recipe, 'auto', label=f"atlas_{spec['name']}")
+    if raw is not None and layout is not None:
+        return {'surface': raw, 'layout': layout, 'baked': True, 'source': source, 'recipe': recipe}
+    # frames decodificados direto (sem passar cada um pelo cache em disco: só o atlas é gravado)
+    frames = {}
+    for name, specs in spec['sprites'].items():
+        frames[name] = [(f['path'], _atlas_frame(f, allowed)) for f in specs]
+    surf, layout = build_atlas(frames)
+    return {'surface': surf, 'layout': layout, 'baked': False, 'source': source, 'recipe': recipe}
+
+
+def _atlas_frame(spec, allowed):
+    """
+    Frame de um atlas decodificado e escalado, ou None se o arquivo faltar ou não puder ser
+    lido — o frame fica de fora do atlas (como o código antigo fazia) em vez de derrubar a fase.
+    """
+    path = spec['path']
+    if not assetpack.exists(path):
+        return None
+    try:
+        return _scale(pygame.image.load(assetpack.open_asset(path), path), spec, allowed)
+    except Exception as e:
+        print(f"frame ignorado no atlas: {path} ({e})", file=sys.stderr)
+        return None
+
+
+def _finish(spec, prepared):
+    """Parte final, na thread principal: gravação no cache e normalização para o formato do display."""
+    if spec['kind'] == 'sound' or prepared is None:
+        return prepared
+    if spec['kind'] == 'atlas':
+        if not prepared['baked']:
+            bakecache.store(prepared['source'], prepared['recipe'], 'auto', prepared['surface'], meta=prepared['layout'],
+                            label=f"atlas_{spec['name']}")
+        return Atlas(normalize_surface(prepared['surface'], 'auto', f"atlas {spec['name']}"), prepared['layout'])
+    img = prepared['surface']
+    if not prepared['baked']:
+        # grava antes de normalizar: a análise de opacidade é refeita ao carregar do cache
+        bakecache.store(spec['path'], prepared['recipe'], spec['mode'], img)
+    return normalize_surface(img, spec['mode'], spec['path'])
+
+
+# cor usada como colorkey de sprites com alpha binário (quase nunca aparece em arte)
+_COLORKEY = (255, 0, 255)
+
+
+def normalize_surface(img, mode='auto', name=None):
+    """
+    Converte uma surface recém-carregada para o formato de blit mais rápido.
+
+    Recebe:
+        - img: pygame.Surface (qualquer formato).
+        - mode: 'auto', 'alpha' (força convert_alpha), 'opaque' (força convert) ou None (sem conversão).
+        - name: nome usado no aviso de formato (opcional).
+    Retorna:
+        - pygame.Surface no formato do display.
+    """
+    if mode is None or pygame.display.get_surface() is None:
+        return img
+    if mode == 'opaque':
+        out = img.convert()
+    elif mode == 'alpha':
+        out = img.convert_alpha()
+    else:
+        out = _auto_convert(img)
+    check_display_format(out, name)
+    return out
+
+
+def _auto_convert(img):
+    if not img.get_flags() & pygame.SRCALPHA and img.get_colorkey() is None:
+        return img.convert()
+    w, h = img.get_size()
+    opaque = pygame.mask.from_surface(img, 254).count()
+    if opaque == w * h:
+        return img.convert()
+    visible = pygame.mask.from_surface(img, 0).count()
+    if visible == opaque:
+        # alpha binário: colorkey + RLE, desde que a cor-chave não apareça na arte
+        out = pygame.Surface((w, h)).convert()
+        out.fill(_COLORKEY)
+        out.blit(img, (0, 0))
+        keyed = pygame.mask.from_threshold(out, _COLORKEY, (1, 1, 1, 255)).count()
+        if keyed == w * h - opaque:
+            out.set_colorkey(_COLORKEY, pygame.RLEACCEL)
+            return out
+    return img.convert_alpha()
+
+
+def check_display_format(surf, name=None):
+    """
+    Avisa em stderr se a surface não está no formato de pixel do display (bits e máscaras
+    RGB), o que obriga o SDL a converter cada pixel a cada blit.
+
+    Retorna:
+        - bool: True se o formato bate (ou não há display).
+    """
+    screen = pygame.display.get_surface()
+    if screen is None or surf is None:
+        return True
+    if surf.get_bitsize() == screen.get_bitsize() and surf.get_masks()[:3] == screen.get_masks()[:3]:
+        return True
+    print(f"surface fora do formato do display: {name or surf} "
+          f"({surf.get_bitsize()} bits, tela {screen.get_bitsize()} bits)", file=sys.stderr)
+    return False
+
+
+def _scale(img, spec, allowed):
+    if spec['height'] is not None:
+        scale = spec['height'] / img.get_height()
+        return pygame.transform.rotozoom(img, 0, scale)
+    if spec['size'] is not None:
+        W, H = spec['size']
+        scaler = pygame.transform.smoothscale if _smooth(spec, allowed) else pygame.transform.scale
+        if spec['keep_aspect']:
+            iw, ih = img.get_size()
+            scale = min(W / iw, H / ih)
+            return scaler(img, (int(iw * scale), int(ih * scale)))
+        return scaler(img, (W, H))
+    return img
+
+
+# instância única usada pelo jogo inteiro
+REGISTRY = AssetRegistry()
@@ -0,0 +1,128 @@
+# atlas.py
+import pygame
+
+from config import ATLAS_MAX_WIDTH, ATLAS_PADDING
+
+"""
+Atlas de sprites: vários frames pequenos empacotados numa única surface.
+
+Os ciclos de caminhada dos jogadores (andar_0..3, andarv_0..3), a imagem parada do
+astronauta, os sprites dos chefes e a animação do disparo do duelo (efeito0..3) eram
+surfaces separadas: um arquivo aberto, um PNG decodificado e uma alocação por frame.
+Aqui os frames de um grupo (já escalados) são empacotados em prateleiras numa surface só
+e cada frame é entregue como subsurface — uma "janela" sobre os pixels do atlas, sem cópia.
+
+O registro de assets (assets.atlas_spec / AssetRegistry) monta o atlas na primeira vez e o
+guarda no cache em disco (bakecache) como um único arquivo, com o layout no cabeçalho:
+nas próximas execuções o grupo inteiro sai de uma leitura só.
+
+Uso:
+    atlas = REGISTRY.request(atlas_spec('jogadores', {'walk_p1': [...specs...]}))
+    frame = atlas.frame('walk_p1', 2)       # por nome + índice
+    frames = atlas.frames('walk_p1')        # lista de views
+    img = atlas.find(caminho_do_png)        # pelo arquivo de origem (ou None)
+"""
+
+
+def pack(sizes, max_width=ATLAS_MAX_WIDTH, padding=ATLAS_PADDING):
+    """
+    Empacota retângulos em prateleiras (shelf packing), do mais alto para o mais baixo.
+
+    Recebe:
+        - sizes: lista de (w, h).
+        - max_width: largura máxima do atlas (frames mais largos ganham a largura deles).
+        - padding: pixels livres entre frames (evita que um frame "vaze" no vizinho).
+    Retorna:
+        - (posições, (largura, altura)): lista de (x, y) na mesma ordem de sizes e o
+          tamanho do atlas.
+    """
+    if not sizes:
+        return [], (0, 0)
+    width = max(max(w for w, _h in sizes), min(max_width, sum(w + padding for w, _h in sizes)))
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions = [None] * len(sizes)
+    x = y = shelf_h = 0
+    for i in order:
+        w, h = sizes[i]
+        if x > 0 and x + w > width:
+            # prateleira cheia: abre outra abaixo da mais alta desta
+            y += shelf_h + padding
+            x = shelf_h = 0
+        positions[i] = (x, y)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+    return positions, (width, y + shelf_h)
+
+
+def build(frames):
+    """
+    Monta a surface do atlas a partir dos frames já escalados.
+
+    Recebe:
+        - frames: dict nome do sprite -> lista de (caminho, pygame.Surface ou None).
+    Retorna:
+        - (surface, layout): surface SRCALPHA com todos os frames (fundo transparente) e
+          layout dict nome -> lista de [caminho, x, y, w, h] (None para frame ausente).
+    """
+    flat = [(name, i, surf) for name, items in frames.items() for i, (_path, surf) in enumerate(items)
+            if surf is not None]
+    positions, size = pack([s.get_size() for _n, _i, s in flat])
+    atlas = pygame.Surface((max(1, size[0]), max(1, size[1])), pygame.SRCALPHA, 32)
+    atlas.fill((0, 0, 0, 0))
+    layout = {name: [None] * len(items) for name, items in frames.items()}
+    for (name, i, surf), (x, y) in zip(flat, positions):
+        # cópia exata dos pixels (inclusive alpha), sem mistura com o fundo transparente
+        atlas.blit(surf, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        layout[name][i] = [frames[name][i][0], x, y, surf.get_width(), surf.get_height()]
+    return atlas, layout
+
+
+class Atlas:
+    """
+    Atlas pronto para uso: surface única + views (subsurfaces) de cada frame.
+
+    Construtor:
+        Atlas(surface, layout) — layout como retornado por build(...).
+
+    Métodos:
+        - frames(name): lista de views do sprite (frames ausentes ficam de fora; [] se não existir).
+        - frame(name, index): view de um frame (IndexError/KeyError se não existir).
+        - find(path): view do frame que veio daquele arquivo, ou None.
+        - names(): nomes dos sprites.
+        - views(): todas as views (para quem precisa descartar derivadas delas).
+
+    Atributos:
+        - surface: a surface do atlas (compartilhada; não desenhe sobre ela).
+
+    As views compartilham os pixels (e colorkey/alpha) do atlas: nada é copiado.
+    """
+
+    def __init__(self, surface, layout):
+        self.surface = surface
+        self._frames = {}
+        self._by_path = {}
+        for name, items in layout.items():
+            views = []
+            for item in items:
+                if item is None:
+                    continue
+                path, x, y, w, h = item
+                view = surface.subsurface((x, y, w, h))
+                views.append(view)
+                self._by_path.setdefault(path, view)
+            self._frames[name] = views
+
+    def frames(self, name):
+        return self._frames.get(name, [])
+
+    def frame(self, name, index):
+        return self._frames[name][index]
+
+    def find(self, path):
+        return self._by_path.get(path)
+
+    def names(self):
+        return list(self._frames)
+
+    def views(self):
+        return [v for views in self._frames.values() for v in views]
@@ -0,0 +1,637 @@
+# audio.py
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+import pygame
+
+import assetpack
+import bakecache
+from concurrent.futures import ThreadPoolExecutor
+from config import (
+    PCM_CACHE_DIR,
+    PCM_CACHE_ENABLED,
+    VOICE_CHANNELS,
+    VOICE_MAX_PER_SOUND,
+    MUSIC_TRACKS,
+    MUSIC_CROSSFADE_MS,
+    MIXER_PROFILES,
+    MIXER_PROFILE,
+)
+
+"""
+Áudio do jogo: perfis do mixer, banco de efeitos sonoros decodificados (SoundBank),
+gerenciador de vozes/canais do mixer (VoiceManager) e trilhas com crossfade (MusicManager).
+
+Cada pygame.mixer.Sound(file=...) decodifica o MP3 inteiro para PCM na hora. Antes cada
+fase (e cada PlayerSimple) fazia isso de novo para os mesmos arquivos. O banco decodifica
+cada efeito uma única vez por sessão e entrega objetos Sound compartilhados; o PCM
+decodificado pode ainda ser gravado em disco (cache/pcm/), e nas próximas execuções o
+Sound é criado direto dos bytes crus (Sound(buffer=...)), sem passar pelo decodificador.
+
+Chave do cache em disco: hash (sha1) do arquivo de origem + formato do mixer
+(frequência, tamanho da amostra, canais) — mudar o formato do mixer gera outra entrada.
+
+Formato do arquivo (.pcm):
+    linha 1: b'PCM1'
+    linha 2: cabeçalho JSON {"freq": int, "size": int, "channels": int}
+    resto:   amostras cruas (Sound.get_raw())
+
+Vozes: em vez de Sound.play() pegar qualquer canal livre, cada categoria (música, efeitos
+dos jogadores, do chefe, interface) tem canais reservados (config.VOICE_CHANNELS). Assim
+o tiro rápido dos jogadores nunca ocupa o canal do rugido do chefe.
+
+Música: as trilhas (config.MUSIC_TRACKS) são decodificadas em segundo plano antes de
+serem necessárias e tocadas nos canais da categoria 'music'; a troca de trilha é um
+crossfade de volume avançado a cada frame por MUSIC.update(), sem chamadas bloqueantes
+de pygame.mixer.music (que abria o MP3 na hora e deixava um buraco entre as trilhas).
+O preço é memória: cada trilha fica inteira em PCM enquanto é usada (ver MusicManager).
+"""
+
+_MAGIC = b'PCM1'
+
+
+# ---------------------- perfis do mixer / latência ----------------------
+
+def apply_mixer_profile(name=None):
+    """
+    Configura o mixer (frequência, formato, canais, buffer) com um perfil de
+    config.MIXER_PROFILES. Deve ser chamado antes de pygame.init()/pygame.mixer.init().
+
+    Recebe:
+        - name: nome do perfil ('low-latency', 'balanced', 'power-saving'); None = MIXER_PROFILE
+                deste módulo (main.py troca com --audio-profile).
+    Retorna:
+        - dict com os parâmetros aplicados (perfil desconhecido cai para 'balanced').
+    """
+    name = name or MIXER_PROFILE
+    profile = MIXER_PROFILES.get(name)
+    if profile is None:
+        print(f"Perfil de áudio desconhecido: {name!r}, usando 'balanced'", file=sys.stderr)
+        profile = MIXER_PROFILES['balanced']
+    try:
+        pygame.mixer.pre_init(**profile)
+    except Exception:
+        pass
+    return dict(profile)
+
+
+def measure_output_latency(buffer_size, trials=30):
+    """
+    Mede o atraso entre Sound.play() e o callback de áudio que mistura o som.
+
+    Toca repetidamente um "clique" bem curto (menor que um bloco do buffer) num canal com
+    endevent: o evento de fim é postado pela thread de áudio no callback que consumiu o
+    clique, então (evento - play) é o tempo até o callback. Somando a duração de um
+    bloco (o que já estava na fila do dispositivo) temos a estimativa de latência de saída.
+    Só o evento de fim do clique é retirado da fila: teclas e outros eventos que chegarem
+    durante a medição continuam lá para quem chamou.
+
+    Recebe:
+        - buffer_size: tamanho do buffer do mixer em amostras (o mesmo passado ao pre_init).
+        - trials: quantidade de disparos.
+    Retorna:
+        - dict com 'buffer_ms', 'callback_ms' (mediana) e 'latency_ms' / 'latency_p95_ms'
+          (estimativas), ou None sem mixer. Requer o display inicializado (fila de eventos).
+    """
+    fmt = _mixer_format()
+    if fmt is None:
+        return None
+    freq, size, channels = fmt
+    # 64 quadros de silêncio quase total: bem menor que qualquer buffer dos perfis
+    click = pygame.mixer.Sound(buffer=bytes(64 * channels * (abs(size) // 8)))
+    ch = pygame.mixer.Channel(pygame.mixer.get_num_channels() - 1)
+    end_event = pygame.event.custom_type()
+    ch.set_endevent(end_event)
+    waits = []
+    try:
+        for i in range(trials):
+            # descarta só fins de clique atrasados de um disparo anterior
+            pygame.event.get(eventtype=end_event)
+            # desalinha os disparos do ritmo do callback
+            time.sleep(0.005 + 0.007 * (i % 5))
+            t0 = time.perf_counter()
+            ch.play(click)
+            deadline = t0 + 1.0
+            while time.perf_counter() < deadline:
+                if pygame.event.get(eventtype=end_event):
+                    waits.append((time.perf_counter() - t0) * 1000.0)
+                    break
+                time.sleep(0.0002)
+    finally:
+        ch.set_endevent()
+    if not waits:
+        return None
+    waits.sort()
+    buffer_ms = buffer_size * 1000.0 / freq
+    p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))]
+    return {
+        'buffer_ms': buffer_ms,
+        'callback_ms': waits[len(waits) // 2],
+        'latency_ms': waits[len(waits) // 2] + buffer_ms,
+        'latency_p95_ms': p95 + buffer_ms,
+    }
+
+
+def _mixer_format():
+    """(frequência, tamanho, canais) do mixer inicializado, ou None sem mixer."""
+    try:
+        return pygame.mixer.get_init()
+    except Exception:
+        return None
+
+
+class SoundBank:
+    """
+    Banco de efeitos sonoros decodificados, residente durante a sessão.
+
+    Métodos:
+        - get(path, volume=None)
+            Retorna um pygame.mixer.Sound compartilhado (um por (path, volume)) ou None
+            (arquivo ausente / mixer indisponível). O PCM de cada arquivo é decodificado
+            uma única vez, não importa quantos volumes sejam pedidos.
+        - clear()
+            Descarta tudo (ex.: depois de reiniciar o mixer com outro formato).
+
+    Atributos:
+        - stats: dict com contadores 'hits', 'decoded' (MP3 decodificado) e 'cached' (PCM lido do disco).
+
+    Observação:
+        - Pode ser usado das threads do carregador de assets (acesso protegido por lock).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # caminho -> bytes PCM no formato do mixer
+        self._pcm = {}
+        # (caminho, volume) -> Sound
+        self._sounds = {}
+        self.stats = {'hits': 0, 'decoded': 0, 'cached': 0}
+
+    def get(self, path, volume=None):
+        """
+        Recebe:
+            - path: caminho do arquivo de áudio (str).
+            - volume: volume (0.0..1.0) aplicado ao Sound entregue, ou None.
+        Retorna:
+            - pygame.mixer.Sound compartilhado ou None.
+        """
+        key = (path, volume)
+        with self._lock:
+            snd = self._sounds.get(key)
+            if snd is not None:
+                self.stats['hits'] += 1
+                return snd
+            pcm = self._pcm.get(path)
+        fmt = _mixer_format()
+        if fmt is None or not assetpack.exists(path):
+            return None
+        try:
+            if pcm is None:
+                pcm = self._load_pcm(path, fmt)
+            snd = pygame.mixer.Sound(buffer=pcm)
+            if volume is not None:
+                snd.set_volume(volume)
+        except Exception:
+            # mixer indisponível ou arquivo inválido: segue sem som
+            return None
+        with self._lock:
+            self._pcm.setdefault(path, pcm)
+            # outra thread pode ter criado o mesmo Sound enquanto isso: fica o primeiro
+            return self._sounds.setdefault(key, snd)
+
+    def clear(self):
+        with self._lock:
+            self._pcm.clear()
+            self._sounds.clear()
+
+    def _load_pcm(self, path, fmt):
+        pcm, from_cache = load_pcm(path, fmt)
+        with self._lock:
+            self.stats['cached' if from_cache else 'decoded'] += 1
+        return pcm
+
+
+# ---------------------- cache de PCM em disco ----------------------
+
+def load_pcm(path, fmt):
+    """
+    Amostras PCM de um arquivo de áudio no formato do mixer: do cache em disco se houver,
+    senão decodificando o arquivo (e gravando no cache).
+
+    Recebe:
+        - path: caminho do arquivo de áudio (str).
+        - fmt: formato do mixer (pygame.mixer.get_init()).
+    Retorna:
+        - tuple (bytes, veio_do_cache: bool). Lança exceção se o arquivo não puder ser decodificado.
+    """
+    entry = _pcm_entry_path(path, fmt)
+    pcm = _read_pcm(entry, fmt)
+    if pcm is not None:
+        return pcm, True
+    pcm = pygame.mixer.Sound(file=assetpack.open_asset(path)).get_raw()
+    _write_pcm(entry, fmt, pcm)
+    return pcm, False
+
+
+def decode_sound(path):
+    """
+    Cria um Sound novo (fora do banco — não fica residente) decodificando o arquivo inteiro.
+    Usado pelas trilhas de música. Não passa pelo cache de PCM em disco: uma trilha
+    decodificada ocupa cerca de 10 MB por minuto (44,1 kHz, 16 bits, estéreo), e gravá-la
+    trocaria ~1 MB de MP3 por ~12 MB de disco só para poupar uma decodificação que já
+    acontece em segundo plano.
+
+    Retorna:
+        - pygame.mixer.Sound ou None (arquivo ausente / mixer indisponível).
+    """
+    fmt = _mixer_format()
+    if fmt is None or not assetpack.exists(path):
+        return None
+    try:
+        return pygame.mixer.Sound(file=assetpack.open_asset(path))
+    except Exception:
+        return None
+
+
+def _pcm_entry_path(path, fmt):
+    if not PCM_CACHE_ENABLED:
+        return None
+    digest = bakecache.source_digest(path)
+    if digest is None:
+        return None
+    key = hashlib.sha1(f"{digest}|{fmt}".encode('utf-8')).hexdigest()
+    base = os.path.splitext(os.path.basename(path))[0].replace(' ', '_')
+    return os.path.join(PCM_CACHE_DIR, f"{base}-{key[:20]}.pcm")
+
+
+def _read_pcm(entry, fmt):
+    """Lê as amostras cruas de uma entrada do cache, ou None (ausente/incompatível)."""
+    if entry is None or not os.path.exists(entry):
+        return None
+    try:
+        with open(entry, 'rb') as f:
+            data = f.read()
+        magic_end = data.index(b'\n')
+        header_end = data.index(b'\n', magic_end + 1)
+        if data[:magic_end] != _MAGIC:
+            return None
+        header = json.loads(data[magic_end + 1:header_end])
+        if (header['freq'], header['size'], header['channels']) != tuple(fmt):
+            return None
+        return data[header_end + 1:]
+    except Exception:
+        return None
+
+
+def _write_pcm(entry, fmt, pcm):
+    """Grava as amostras no cache (escrita atômica; falhas são ignoradas)."""
+    if entry is None:
+        return
+    try:
+        os.makedirs(PCM_CACHE_DIR, exist_ok=True)
+        header = json.dumps({'freq': fmt[0], 'size': fmt[1], 'channels': fmt[2]}).encode('utf-8')
+        tmp = entry + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(_MAGIC + b'\n' + header + b'\n')
+            f.write(pcm)
+        os.replace(tmp, entry)
+    except Exception:
+        # disco cheio / somente leitura: o jogo segue decodificando
+        pass
+
+
+def clear_pcm_cache():
+    """Apaga os arquivos do cache de PCM. Retorna a quantidade removida."""
+    removed = 0
+    if not os.path.isdir(PCM_CACHE_DIR):
+        return removed
+    for name in os.listdir(PCM_CACHE_DIR):
+        if name.endswith('.pcm') or name.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(PCM_CACHE_DIR, name))
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+# ---------------------- vozes / canais ----------------------
+
+class VoiceManager:
+    """
+    Distribui os efeitos sonoros pelos canais do mixer, por categoria e prioridade.
+
+    Regras de play(sound, category, priority):
+        1. Se já houver max_instances vozes do mesmo Sound tocando, o pedido é descartado
+           (tiro em rajada não multiplica a mesma amostra indefinidamente).
+        2. Se houver canal livre na categoria, toca nele.
+        3. Senão "rouba" a voz de menor prioridade da categoria (empate: a mais antiga),
+           desde que ela não tenha prioridade maior que a do pedido; caso contrário descarta.
+
+    Construtor:
+        VoiceManager(channels=VOICE_CHANNELS, max_per_sound=VOICE_MAX_PER_SOUND)
+          - channels: dict categoria -> quantidade de canais reservados.
+          - max_per_sound: limite padrão de instâncias simultâneas do mesmo Sound.
+
+    Métodos:
+        - play(sound, category='player', priority=0, max_instances=None, loops=0, fade_ms=0)
+            Retorna o pygame.mixer.Channel usado, ou None (descartado / sem mixer).
+        - channels(category): lista de pygame.mixer.Channel da categoria.
+        - stop(category=None): para as vozes da categoria (ou todas).
+        - end_frame(): fecha os contadores do frame (chamar uma vez por frame).
+
+    Atributos:
+        - frame_stats: contadores do último frame fechado ('started', 'dropped', 'stolen').
+        - totals: mesmos contadores acumulados na sessão.
+
+    Sem mixer (ou se o mixer falhar) todas as chamadas viram no-op, sem exceções.
+    """
+
+    def __init__(self, channels=VOICE_CHANNELS, max_per_sound=VOICE_MAX_PER_SOUND):
+        self.layout = dict(channels)
+        self.max_per_sound = max_per_sound
+        # formato do mixer para o qual os canais foram reservados (None = ainda não configurado)
+        self._mixer = None
+        self._channels = {}
+        # índice do canal -> (Sound, prioridade, sequência de início)
+        self._voices = {}
+        self._seq = 0
+        self._frame = {'started': 0, 'dropped': 0, 'stolen': 0}
+        self.frame_stats = dict(self._frame)
+        self.totals = dict(self._frame)
+
+    def _setup(self):
+        """Reserva os canais de cada categoria (refeito se o mixer for reiniciado)."""
+        fmt = _mixer_format()
+        if fmt is None:
+            self._mixer = None
+            return False
+        if fmt == self._mixer:
+            return True
+        try:
+            total = sum(self.layout.values())
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total))
+            # canais reservados não são usados por Sound.play() direto
+            pygame.mixer.set_reserved(total)
+            self._channels = {}
+            idx = 0
+            for category, count in self.layout.items():
+                self._channels[category] = [(idx + i, pygame.mixer.Channel(idx + i)) for i in range(count)]
+                idx += count
+        except Exception as e:
+            print("Falha ao reservar canais de áudio:", e, file=sys.stderr)
+            return False
+        self._voices.clear()
+        self._mixer = fmt
+        return True
+
+    def channels(self, category):
+        if not self._setup():
+            return []
+        return [ch for _idx, ch in self._channels.get(category, [])]
+
+    def play(self, sound, category='player', priority=0, max_instances=None, loops=0, fade_ms=0):
+        """
+        Recebe:
+            - sound: pygame.mixer.Sound (None é ignorado).
+            - category: categoria de canais (chave de VOICE_CHANNELS).
+            - priority: int — vozes de prioridade maior não são roubadas por menores.
+            - max_instances: limite de cópias simultâneas deste Sound (None = max_per_sound, 0 = sem limite).
+            - loops, fade_ms: repassados para Channel.play.
+        Retorna:
+            - pygame.mixer.Channel ou None.
+        """
+        if sound is None or not self._setup():
+            return None
+        slots = self._channels.get(category)
+        if not slots:
+            return None
+        cap = self.max_per_sound if max_instances is None else max_instances
+        free = None
+        victim = None
+        playing = 0
+        for idx, ch in slots:
+            voice = self._voices.get(idx)
+            if voice is None or not ch.get_busy():
+                if free is None:
+                    free = (idx, ch)
+                continue
+            if voice[0] is sound:
+                playing += 1
+            # menor prioridade primeiro; empate -> a voz mais antiga
+            if voice[1] <= priority and (victim is None or (voice[1], voice[2]) < victim[2]):
+                victim = (idx, ch, (voice[1], voice[2]))
+        if cap and playing >= cap:
+            self._count('dropped')
+            return None
+        if free is None:
+            if victim is None:
+                self._count('dropped')
+                return None
+            free = victim[:2]
+            free[1].stop()
+            self._count('stolen')
+        idx, ch = free
+        try:
+            ch.play(sound, loops=loops, fade_ms=fade_ms)
+        except Exception:
+            # problemas com mixer são ignorados para não travar o jogo
+            return None
+        self._seq += 1
+        self._voices[idx] = (sound, priority, self._seq)
+        self._count('started')
+        return ch
+
+    def stop(self, category=None):
+        if self._mixer is None:
+            return
+        for cat, slots in self._channels.items():
+            if category is None or cat == category:
+                for idx, ch in slots:
+                    ch.stop()
+                    self._voices.pop(idx, None)
+
+    def end_frame(self):
+        """Publica os contadores do frame em frame_stats e zera para o próximo. Retorna frame_stats."""
+        self.frame_stats = self._frame
+        self._frame = {'started': 0, 'dropped': 0, 'stolen': 0}
+        return self.frame_stats
+
+    def _count(self, what):
+        self._frame[what] += 1
+        self.totals[what] += 1
+
+
+# ---------------------- música ----------------------
+
+class MusicManager:
+    """
+    Trilhas de música com pré-carregamento e crossfade não bloqueante.
+
+    Cada trilha (config.MUSIC_TRACKS) é decodificada numa thread própria — preload(nome)
+    pode ser chamado bem antes (ex.: durante os quadrinhos que antecedem a fase). play(nome)
+    nunca espera: se a trilha ainda não terminou de decodificar, a troca acontece no
+    primeiro update() depois que ela ficar pronta, e até lá a trilha anterior continua.
+
+    Memória: a trilha é decodificada inteira para PCM (não há streaming — o pygame só
+    decodifica MP3 em partes pelo pygame.mixer.music, que toca uma trilha por vez e não
+    faz crossfade). São cerca de 10 MB por minuto de música (44,1 kHz, 16 bits, estéreo;
+    a trilha do chefe 1, 1,1 MB de MP3, vira 12 MB). Ficam na memória a trilha atual, as
+    pré-carregadas ainda não tocadas e, durante um crossfade, também a que está saindo —
+    descartada quando o fade-out termina. As trilhas não vão para o cache de PCM em disco.
+
+    Construtor:
+        MusicManager(tracks=MUSIC_TRACKS, crossfade_ms=MUSIC_CROSSFADE_MS, voices=VOICES)
+
+    Métodos:
+        - preload(name): agenda a decodificação da trilha em segundo plano.
+        - play(name, fade_ms=None): troca para a trilha com crossfade (None = crossfade_ms).
+                                    Trilha inexistente equivale a stop(fade_ms).
+        - stop(fade_ms=None): encerra a música com fade-out.
+        - update(): avança os fades e inicia trilhas que acabaram de ficar prontas.
+                    Chamar uma vez por frame nos loops do jogo.
+        - busy(): True enquanto houver troca pendente ou fade em andamento (update() precisa
+                  ser chamado com frequência); com a música estável pode-se dormir à vontade.
+
+    Atributos:
+        - current: nome da trilha pedida por último (ou None).
+
+    Sem mixer todas as chamadas viram no-op silenciosamente.
+    """
+
+    def __init__(self, tracks=MUSIC_TRACKS, crossfade_ms=MUSIC_CROSSFADE_MS, voices=None):
+        self.tracks = dict(tracks)
+        self.crossfade_ms = crossfade_ms
+        self._voices = voices
+        self._pool = None
+        # nome -> Sound decodificado / Future da decodificação
+        self._sounds = {}
+        self._loading = {}
+        self.current = None
+        # trilha pedida esperando a decodificação terminar (nome, fade_ms) ou None
+        self._pending = None
+        # vozes tocando: {'name', 'channel', 'v0', 'v1', 't0', 'ms'}
+        self._playing = []
+
+    def preload(self, name):
+        if name not in self.tracks or name in self._sounds or name in self._loading:
+            return
+        path = self.tracks[name][0]
+        if _mixer_format() is None or not assetpack.exists(path):
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='music')
+        self._loading[name] = self._pool.submit(decode_sound, path)
+
+    def play(self, name, fade_ms=None):
+        if name == self.current:
+            return
+        self.current = name
+        self.preload(name)
+        self._pending = (name, self.crossfade_ms if fade_ms is None else fade_ms)
+        self._start_pending()
+
+    def stop(self, fade_ms=None):
+        self.current = None
+        self._pending = None
+        self._fade_out_all(self.crossfade_ms if fade_ms is None else fade_ms)
+
+    def update(self):
+        if self._pending is not None:
+            self._start_pending()
+        if not self._playing:
+            return
+        now = pygame.time.get_ticks()
+        for voice in list(self._playing):
+            k = 1.0 if voice['ms'] <= 0 else min(1.0, (now - voice['t0']) / voice['ms'])
+            try:
+                voice['channel'].set_volume(voice['v0'] + (voice['v1'] - voice['v0']) * k)
+                if k >= 1.0 and voice['v1'] <= 0.0:
+                    voice['channel'].stop()
+            except Exception:
+                pass
+            if k >= 1.0 and voice['v1'] <= 0.0:
+                self._playing.remove(voice)
+                self._forget(voice['name'])
+
+    def busy(self):
+        if self._pending is not None:
+            return True
+        now = pygame.time.get_ticks()
+        # voz em fade-out só sai de _playing no update() seguinte ao fim do fade
+        return any(now - v['t0'] < v['ms'] or v['v1'] <= 0.0 for v in self._playing)
+
+    # ------------------------ internos ------------------------
+
+    def _sound(self, name):
+        """Sound da trilha se já decodificado; 'loading' enquanto decodifica; None se não houver."""
+        if name in self._sounds:
+            return self._sounds[name]
+        future = self._loading.get(name)
+        if future is None:
+            return None
+        if not future.done():
+            return 'loading'
+        del self._loading[name]
+        try:
+            snd = future.result()
+        except Exception:
+            snd = None
+        if snd is not None:
+            self._sounds[name] = snd
+        return snd
+
+    def _start_pending(self):
+        name, fade_ms = self._pending
+        snd = self._sound(name)
+        if snd == 'loading':
+            # continua tocando a trilha anterior; tenta de novo no próximo update()
+            return
+        self._pending = None
+        self._fade_out_all(fade_ms)
+        channels = self._voices.channels('music') if self._voices is not None else []
+        if snd is None or not channels:
+            return
+        busy = [v['channel'] for v in self._playing]
+        free = [ch for ch in channels if ch not in busy]
+        if not free:
+            # todos os canais ocupados: corta a voz mais antiga (já em fade-out)
+            oldest = self._playing.pop(0)
+            oldest['channel'].stop()
+            self._forget(oldest['name'])
+            free = [oldest['channel']]
+        ch = free[0]
+        volume = self.tracks[name][1]
+        try:
+            ch.set_volume(0.0 if fade_ms > 0 else volume)
+            ch.play(snd, loops=-1)
+        except Exception:
+            # problemas com mixer são ignorados para não travar o jogo
+            return
+        self._playing.append({'name': name, 'channel': ch, 'v0': 0.0, 'v1': volume,
+                              't0': pygame.time.get_ticks(), 'ms': fade_ms})
+
+    def _fade_out_all(self, fade_ms):
+        now = pygame.time.get_ticks()
+        for voice in self._playing:
+            try:
+                vol = voice['channel'].get_volume()
+            except Exception:
+                vol = 0.0
+            voice.update({'v0': vol, 'v1': 0.0, 't0': now, 'ms': fade_ms})
+        if fade_ms <= 0:
+            self.update()
+
+    def _forget(self, name):
+        # só a trilha atual e as pré-carregadas ficam na memória
+        if name != self.current and not any(v['name'] == name for v in self._playing):
+            self._sounds.pop(name, None)
+
+
+# instâncias únicas usadas pelo jogo inteiro
+BANK = SoundBank()
+VOICES = VoiceManager()
+MUSIC = MusicManager(voices=VOICES)
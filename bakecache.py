@@ -0,0 +1,306 @@
+# bakecache.py
+import os
+import sys
+import json
+import hashlib
+import pygame
+
+import assetpack
+from config import BAKE_CACHE_DIR, BAKE_CACHE_ENABLED, BAKE_CACHE_MAX_MB, RENDER_LOGICAL_SIZE
+
+"""
+Cache em disco de surfaces já escaladas ("baked").
+
+Decodificar PNGs grandes (faroeste.png, inicio.png, quadrinhos) e reescalá-los para a
+resolução da tela custa caro a cada execução. Aqui guardamos o resultado da escala — pixels
+num layout de bytes igual ao do display, já no tamanho destino — e nas próximas execuções
+carregamos com pygame.image.frombuffer, que é basicamente uma cópia de memória. A
+normalização final (convert/colorkey/convert_alpha, ver assets.normalize_surface) é
+feita por quem carrega.
+
+Chave de cada entrada:
+    - hash (sha1) do conteúdo do arquivo de origem -> trocar o PNG invalida a entrada;
+    - "receita" de escala (tamanho destino, proporção, altura, filtro) -> mudar a
+      resolução do display gera outra entrada;
+    - modo de conversão e formato de pixel do display (bits + máscaras).
+
+Limpeza: ao gravar uma entrada, as outras da mesma origem com a mesma receita e modo (que só
+diferem pelo hash do PNG ou pelo formato do display, ou seja, não serão mais lidas) são
+apagadas. Além disso o diretório respeita config.BAKE_CACHE_MAX_MB: as entradas usadas há
+mais tempo (data de modificação, renovada a cada leitura) saem primeiro.
+
+Formato do arquivo (.bin):
+    linha 1: b'BAKE1'
+    linha 2: cabeçalho JSON {"w": int, "h": int, "fmt": str, "source": str, "recipe": str,
+             "mode": str, "meta": ...}
+             ("meta" opcional — ex.: layout de um atlas de sprites, ver atlas.py;
+             source/recipe/mode identificam a entrada na limpeza)
+    resto:   pixels crus (pygame.image.tobytes no formato fmt)
+
+Uso como script (passo de "bake" antecipado, para a resolução atual ou a informada):
+    python bakecache.py            -> gera o cache para a resolução lógica (ou nativa) do jogo
+    python bakecache.py 1920x1080  -> gera o cache para 1920x1080
+    python bakecache.py --clear    -> apaga o cache (inclusive o de áudio, ver audio.py)
+"""
+
+_MAGIC = b'BAKE1'
+
+# hash de conteúdo por (caminho, mtime, tamanho) — evita reler o mesmo arquivo na sessão
+_digest_memo = {}
+
+
+def source_digest(path):
+    """
+    Retorna o sha1 (hex) do conteúdo do arquivo de origem. Quando o asset vem do
+    pacote (assetpack.py) usa o hash gravado no índice, sem tocar no disco.
+
+    Recebe:
+        - path: caminho do arquivo (str).
+    Retorna:
+        - str com o hash, ou None se o arquivo não puder ser lido.
+    """
+    packed = assetpack.asset_digest(path)
+    if packed is not None:
+        return packed
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    memo_key = (path, st.st_mtime_ns, st.st_size)
+    digest = _digest_memo.get(memo_key)
+    if digest is None:
+        h = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _digest_memo[memo_key] = digest
+    return digest
+
+
+def _display_format_tag():
+    """Identifica o formato de pixel do display atual (bits + máscaras) ou None sem display."""
+    surf = pygame.display.get_surface()
+    if surf is None:
+        return None
+    return f"{surf.get_bitsize()}:{':'.join(str(m) for m in surf.get_masks())}"
+
+
+def _buffer_format():
+    """
+    Escolhe o formato de bytes mais próximo do formato do display para que a conversão
+    ao carregar seja uma cópia direta (em little-endian o display costuma ser BGRA).
+    """
+    surf = pygame.display.get_surface()
+    if surf is not None and sys.byteorder == 'little' and surf.get_masks()[:3] == (0xff0000, 0xff00, 0xff):
+        return 'BGRA'
+    return 'RGBA'
+
+
+def _entry_path(path, recipe, mode, label=None):
+    digest = source_digest(path)
+    fmt_tag = _display_format_tag()
+    if digest is None or fmt_tag is None:
+        return None
+    key = hashlib.sha1(f"{digest}|{recipe}|{mode}|{fmt_tag}".encode('utf-8')).hexdigest()
+    base = (label or os.path.splitext(os.path.basename(path))[0]).replace(' ', '_')
+    return os.path.join(BAKE_CACHE_DIR, f"{base}-{key[:20]}.bin")
+
+
+def read(path, recipe, mode):
+    """
+    Lê a surface "baked" do cache sem converter (pode rodar fora da thread principal).
+
+    Recebe:
+        - path: caminho do arquivo de origem (str).
+        - recipe: string descrevendo a escala aplicada (faz parte da chave).
+        - mode: 'auto', 'alpha' ou 'opaque' (conversão final; faz parte da chave).
+    Retorna:
+        - pygame.Surface apontando para os bytes lidos, ou None (cache desligado, ausente ou inválido).
+    """
+    surf, _meta = read_meta(path, recipe, mode)
+    return surf
+
+
+def read_meta(path, recipe, mode, label=None):
+    """
+    Como read(...), mas retorna também os metadados gravados com store(..., meta=...).
+    label: mesmo valor passado a store(...).
+
+    Retorna:
+        - (pygame.Surface, meta) ou (None, None).
+    """
+    if not BAKE_CACHE_ENABLED or mode not in ('auto', 'alpha', 'opaque'):
+        return None, None
+    entry = _entry_path(path, recipe, mode, label)
+    if entry is None or not os.path.exists(entry):
+        return None, None
+    try:
+        with open(entry, 'rb') as f:
+            data = f.read()
+        magic_end = data.index(b'\n')
+        header_end = data.index(b'\n', magic_end + 1)
+        if data[:magic_end] != _MAGIC:
+            return None, None
+        header = json.loads(data[magic_end + 1:header_end])
+        pixels = memoryview(data)[header_end + 1:]
+        # marca como usada agora (ordem de descarte do limite de tamanho)
+        os.utime(entry, None)
+        return pygame.image.frombuffer(pixels, (header['w'], header['h']), header['fmt']), header.get('meta')
+    except Exception:
+        # entrada corrompida/incompatível: ignora e deixa o chamador recriar
+        return None, None
+
+
+def store(path, recipe, mode, surf, meta=None, label=None):
+    """
+    Grava uma surface no cache (escrita atômica; falhas são ignoradas).
+
+    Recebe:
+        - path, recipe, mode: mesmos valores que serão passados a read(...) / read_meta(...).
+        - surf: pygame.Surface já escalada (antes da conversão final).
+        - meta: dados extras serializáveis em JSON, devolvidos por read_meta(...).
+        - label: nome do arquivo no cache no lugar do nome do arquivo de origem (ex.: atlas).
+    Retorna:
+        - None.
+    """
+    if not BAKE_CACHE_ENABLED or mode not in ('auto', 'alpha', 'opaque') or surf is None:
+        return
+    entry = _entry_path(path, recipe, mode, label)
+    if entry is None:
+        return
+    try:
+        os.makedirs(BAKE_CACHE_DIR, exist_ok=True)
+        fmt = _buffer_format()
+        header = {'w': surf.get_width(), 'h': surf.get_height(), 'fmt': fmt,
+                  'source': path, 'recipe': recipe, 'mode': mode}
+        if meta is not None:
+            header['meta'] = meta
+        header = json.dumps(header).encode('utf-8')
+        tmp = entry + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(_MAGIC + b'\n' + header + b'\n')
+            f.write(pygame.image.tobytes(surf, fmt))
+        os.replace(tmp, entry)
+    except Exception:
+        # disco cheio / somente leitura: o jogo segue sem cache
+        return
+    _prune(entry, path, recipe, mode)
+
+
+def _read_header(entry):
+    """Cabeçalho JSON de uma entrada (sem ler os pixels), ou None se inválida."""
+    try:
+        with open(entry, 'rb') as f:
+            if f.readline().rstrip(b'\n') != _MAGIC:
+                return None
+            return json.loads(f.readline())
+    except Exception:
+        return None
+
+
+def _prune(entry, path, recipe, mode):
+    """
+    Apaga as entradas que a gravação de `entry` tornou inúteis (mesma origem, receita e
+    modo) e, se o diretório passar de BAKE_CACHE_MAX_MB, as usadas há mais tempo.
+    """
+    prefix = os.path.basename(entry).rsplit('-', 1)[0] + '-'
+    files = []
+    try:
+        names = os.listdir(BAKE_CACHE_DIR)
+    except OSError:
+        return
+    for name in names:
+        if not name.endswith('.bin'):
+            continue
+        full = os.path.join(BAKE_CACHE_DIR, name)
+        if full != entry and name.startswith(prefix):
+            header = _read_header(full)
+            if header is None or (header.get('source'), header.get('recipe'), header.get('mode')) in (
+                    (path, recipe, mode), (None, None, None)):
+                # versão antiga da mesma imagem (ou entrada sem identificação): não será mais lida
+                _remove(full)
+                continue
+        try:
+            st = os.stat(full)
+        except OSError:
+            continue
+        files.append((st.st_mtime, st.st_size, full))
+    total = sum(size for _mtime, size, _full in files)
+    limit = BAKE_CACHE_MAX_MB * 1024 * 1024
+    for _mtime, size, full in sorted(files):
+        if total <= limit:
+            break
+        if full != entry and _remove(full):
+            total -= size
+
+
+def _remove(full):
+    try:
+        os.remove(full)
+        return True
+    except OSError:
+        return False
+
+
+def clear():
+    """Apaga todos os arquivos do cache. Retorna a quantidade removida."""
+    removed = 0
+    if not os.path.isdir(BAKE_CACHE_DIR):
+        return removed
+    for name in os.listdir(BAKE_CACHE_DIR):
+        if name.endswith('.bin') or name.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(BAKE_CACHE_DIR, name))
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def bake(W, H):
+    """
+    Passo de bake: carrega todos os manifestos de assets do jogo para a resolução W x H,
+    o que grava no cache cada imagem que ainda não estiver lá.
+
+    Recebe:
+        - W, H: resolução alvo (int).
+    Retorna:
+        - int: quantidade de entradas de manifesto processadas.
+    """
+    # import tardio: os módulos das fases importam assets, que importa este módulo
+    from assets import REGISTRY
+    from campaign import campaign_manifests
+
+    count = 0
+    for manifest in campaign_manifests(W, H):
+        REGISTRY.load(manifest)
+        count += len(manifest)
+    REGISTRY.clear()
+    return count
+
+
+def main(argv):
+    if '--clear' in argv:
+        from audio import clear_pcm_cache
+        print(f"{clear()} arquivo(s) removido(s) de {BAKE_CACHE_DIR}")
+        print(f"{clear_pcm_cache()} arquivo(s) de áudio removido(s)")
+        return 0
+    pygame.init()
+    if argv:
+        W, H = (int(v) for v in argv[0].lower().split('x'))
+    elif RENDER_LOGICAL_SIZE:
+        W, H = RENDER_LOGICAL_SIZE
+    else:
+        info = pygame.display.Info()
+        W, H = info.current_w, info.current_h
+    # janela oculta só para ter o formato de pixel do display
+    pygame.display.set_mode((W, H), pygame.HIDDEN)
+    n = bake(W, H)
+    print(f"bake {W}x{H}: {n} asset(s) processados em {BAKE_CACHE_DIR}")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,876 @@
+# benchmark.py
+# Benchmarks de desempenho do jogo (carregamento de assets, renderização, áudio...).
+#
+# Uso:
+#     python benchmark.py <benchmark> [opções]
+#     python benchmark.py --list
+#
+# Em máquinas sem display/áudio (CI, SSH) rode com os drivers "dummy" do SDL:
+#     SDL_VIDEODRIVER=dummy SDL_AUDIODRIVER=dummy python benchmark.py loading
+#
+# Cada benchmark é uma função registrada com @benchmark(nome) que recebe os argumentos
+# restantes da linha de comando e imprime uma tabela com os resultados.
+
+import os
+import sys
+import time
+import argparse
+import pygame
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Decorador que registra uma função de benchmark com o nome dado."""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def init_display(W, H, flags=0):
+    """Inicializa pygame (mixer tolerante a falhas) e abre uma janela W x H."""
+    pygame.init()
+    try:
+        pygame.mixer.init()
+    except Exception:
+        pass
+    return pygame.display.set_mode((W, H), flags)
+
+
+def parse_resolution(text):
+    """Converte '1920x1080' em (1920, 1080)."""
+    w, h = text.lower().split('x')
+    return int(w), int(h)
+
+
+def print_table(headers, rows):
+    """Imprime uma tabela simples com colunas alinhadas."""
+    cols = [headers] + [[str(c) for c in r] for r in rows]
+    widths = [max(len(r[i]) for r in cols) for i in range(len(headers))]
+    for i, r in enumerate(cols):
+        print("  ".join(c.rjust(w) for c, w in zip(r, widths)))
+        if i == 0:
+            print("  ".join('-' * w for w in widths))
+
+
+# ---------------------- carregamento de assets ----------------------
+
+def _stage_manifests(W, H):
+    from config import INTRO_QUADRINHOS
+    from utils import quadrinhos_manifest
+    from menu import menu_manifest
+    from boss1 import boss1_manifest
+    from boss2 import boss2_manifest
+    from faroeste import faroeste_manifest
+    return [
+        ('menu', menu_manifest(W, H)),
+        ('intro', quadrinhos_manifest(W, H, INTRO_QUADRINHOS)),
+        ('boss1', boss1_manifest(W, H)),
+        ('boss2', boss2_manifest(W, H)),
+        ('faroeste', faroeste_manifest(W, H)),
+    ]
+
+
+@benchmark('loading')
+def bench_loading(argv):
+    """
+    Tempo de carregamento do manifesto de cada fase: serial x paralelo (pool de threads),
+    com e sem o cache em disco (bakecache).
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py loading')
+    ap.add_argument('--resolution', default='1920x1080', type=parse_resolution)
+    ap.add_argument('--repeat', default=3, type=int)
+    ap.add_argument('--workers', default=4, type=int, help='threads do modo paralelo')
+    args = ap.parse_args(argv)
+    W, H = args.resolution
+    init_display(W, H)
+
+    import bakecache
+    from assets import AssetRegistry
+
+    def measure(manifest, parallel, baked):
+        bakecache.BAKE_CACHE_ENABLED = baked
+        best = None
+        for _ in range(args.repeat):
+            reg = AssetRegistry(workers=args.workers if parallel else 1)
+            t = time.perf_counter()
+            reg.load(manifest, parallel=parallel)
+            dt = time.perf_counter() - t
+            best = dt if best is None else min(best, dt)
+        return best * 1000.0
+
+    rows = []
+    for name, manifest in _stage_manifests(W, H):
+        # garante que o cache em disco está populado para as colunas "baked"
+        bakecache.BAKE_CACHE_ENABLED = True
+        AssetRegistry().load(manifest, parallel=False)
+        rows.append((
+            name, len(manifest),
+            f"{measure(manifest, False, False):.1f}",
+            f"{measure(manifest, True, False):.1f}",
+            f"{measure(manifest, False, True):.1f}",
+            f"{measure(manifest, True, True):.1f}",
+        ))
+    print(f"resolução {W}x{H}, {args.workers} thread(s) no modo paralelo, melhor de {args.repeat} (ms)")
+    print_table(('fase', 'assets', 'serial', 'paralelo', 'serial+cache', 'paralelo+cache'), rows)
+
+
+# ---------------------- memória de surfaces ----------------------
+
+@benchmark('memory')
+def bench_memory(argv):
+    """
+    Memória de surfaces por fase: imagens do registro + cache de derivadas (surfcache),
+    e custo de espelhar os frames dos jogadores com e sem o cache.
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py memory')
+    ap.add_argument('--resolution', default='1920x1080', type=parse_resolution)
+    ap.add_argument('--frames', default=2000, type=int, help='frames desenhados olhando para a esquerda')
+    args = ap.parse_args(argv)
+    W, H = args.resolution
+    init_display(W, H)
+
+    from assets import AssetRegistry
+    from surfcache import SurfaceCache
+    from player import player_manifest
+
+    rows = []
+    for name, manifest in _stage_manifests(W, H):
+        reg = AssetRegistry()
+        reg.load(manifest)
+        rows.append((name, len(reg), f"{reg.memory_bytes() / (1024 * 1024):.1f}"))
+    print(f"resolução {W}x{H}")
+    print_table(('fase', 'imagens', 'MB'), rows)
+    print()
+
+    sprites = AssetRegistry().load(player_manifest(H))['sprites']
+    frames = [f for name in sprites.names() for f in sprites.frames(name)]
+    cache = SurfaceCache(64 * 1024 * 1024)
+    t = time.perf_counter()
+    for i in range(args.frames):
+        pygame.transform.flip(frames[i % len(frames)], True, False)
+    direct = (time.perf_counter() - t) * 1000.0
+    t = time.perf_counter()
+    for i in range(args.frames):
+        cache.flip(frames[i % len(frames)], True, False)
+    cached = (time.perf_counter() - t) * 1000.0
+    print_table(('flip', 'total ms', 'us/frame'), [
+        ('transform.flip', f"{direct:.1f}", f"{direct * 1000.0 / args.frames:.2f}"),
+        ('SurfaceCache.flip', f"{cached:.1f}", f"{cached * 1000.0 / args.frames:.2f}"),
+    ])
+    print(cache.report())
+
+
+@benchmark('sprites')
+def bench_sprites(argv):
+    """
+    Surfaces alocadas por frame ao desenhar os dois jogadores como em run_boss1/run_boss2
+    (andando e virando de lado): transform.flip a cada frame (antigo) x frame_sets prontos.
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py sprites')
+    ap.add_argument('--resolution', default='1920x1080', type=parse_resolution)
+    ap.add_argument('--frames', default=2000, type=int)
+    args = ap.parse_args(argv)
+    W, H = args.resolution
+    screen = init_display(W, H)
+
+    from player import PlayerSimple, PLAYER_IMAGE_PATH, WALK_FRAMES_P1, WALK_FRAMES_P2
+
+    players = [
+        PlayerSimple(W // 4, H, H, image_path=PLAYER_IMAGE_PATH, walk_frames_paths=WALK_FRAMES_P1),
+        PlayerSimple(3 * W // 4, H, H, image_path=PLAYER_IMAGE_PATH, walk_frames_paths=WALK_FRAMES_P2),
+    ]
+
+    from surfcache import surface_bytes
+
+    # conta as surfaces (e os bytes de pixels) criadas por pygame.transform durante o desenho
+    allocs = [0, 0]
+    originals = {}
+    for fname in ('flip', 'rotate', 'rotozoom', 'scale', 'smoothscale'):
+        fn = getattr(pygame.transform, fname)
+        originals[fname] = fn
+
+        def counted(*a, _fn=fn, **kw):
+            out = _fn(*a, **kw)
+            allocs[0] += 1
+            allocs[1] += surface_bytes(out)
+            return out
+        setattr(pygame.transform, fname, counted)
+
+    def legacy_draw(p, surface):
+        # caminho antigo de PlayerSimple.draw: espelha o frame toda vez que olha para a esquerda
+        frame = p.walk_frames[p.walk_frame_idx]
+        if not p.facing_right:
+            frame = pygame.transform.flip(frame, True, False)
+        return surface.blit(frame, p.rect.topleft)
+
+    def run(draw):
+        allocs[0] = allocs[1] = 0
+        for i in range(args.frames):
+            for p in players:
+                # alterna o lado a cada 60 frames e avança a animação de caminhada
+                p.facing_right = (i // 60) % 2 == 0
+                p.walk_frame_idx = (i // 6) % len(p.walk_frames)
+                draw(p, screen)
+        return allocs[0] / args.frames, allocs[1] / args.frames / 1024.0
+
+    try:
+        rows = []
+        for name, draw in (('transform.flip por frame', legacy_draw),
+                           ('frame_sets', lambda p, surface: p.draw(surface))):
+            per_frame, kb = run(draw)
+            rows.append((name, f"{per_frame:.2f}", f"{kb:.1f}"))
+    finally:
+        for fname, fn in originals.items():
+            setattr(pygame.transform, fname, fn)
+    print(f"resolução {W}x{H}, 2 jogadores, {args.frames} frames")
+    print_table(('desenho', 'surfaces/frame', 'KB/frame'), rows)
+
+
+@benchmark('bullets')
+def bench_bullets(argv):
+    """
+    Desenho de projéteis: draw.circle por projétil (antigo) x carimbo com blit por projétil
+    x fila de desenho (render.RenderQueue) com uma chamada Surface.blits por frame.
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py bullets')
+    ap.add_argument('--resolution', default='1920x1080', type=parse_resolution)
+    ap.add_argument('--counts', default='100,1000,5000', help='quantidades de projéteis (separadas por vírgula)')
+    ap.add_argument('--frames', default=60, type=int)
+    args = ap.parse_args(argv)
+    W, H = args.resolution
+    screen = init_display(W, H)
+
+    import random
+    from player import SimpleBullet
+    from render import RenderQueue
+
+    rng = random.Random(1)
+    colors = [((255, 105, 180), 6), ((0, 255, 60), 8)]
+
+    def circles(bullets):
+        for b in bullets:
+            pygame.draw.circle(screen, b.color, (int(b.x), int(b.y)), b.radius)
+        return len(bullets)
+
+    def stamps(bullets):
+        for b in bullets:
+            b.draw(screen)
+        return len(bullets)
+
+    queue = RenderQueue()
+
+    def queued(bullets):
+        for b in bullets:
+            b.submit(queue)
+        queue.flush(screen, rects=False)
+        return queue.frame_stats['calls']
+
+    rows = []
+    for n in [int(c) for c in args.counts.split(',')]:
+        bullets = []
+        for i in range(n):
+            color, radius = colors[i % len(colors)]
+            bullets.append(SimpleBullet(rng.uniform(0, W), rng.uniform(0, H), rng.uniform(-1, 1), rng.uniform(-1, 1),
+                                        color=color, radius=radius))
+        row = [n]
+        for draw in (circles, stamps, queued):
+            spent = 0.0
+            for _ in range(args.frames):
+                for b in bullets:
+                    b.update(1.0 / 60.0)
+                t = time.perf_counter()
+                calls = draw(bullets)
+                spent += time.perf_counter() - t
+            ms = spent * 1000.0 / args.frames
+            row += [f"{ms:.2f}", calls]
+        rows.append(row)
+    print(f"resolução {W}x{H}, {args.frames} frames (ms/frame só do desenho)")
+    print_table(('projéteis', 'circle ms', 'chamadas', 'carimbo ms', 'chamadas', 'fila ms', 'chamadas'), rows)
+
+
+# ---------------------- texto ----------------------
+
+
+@benchmark('text')
+def bench_text(argv):
+    """
+    Texto dinâmico: Font.render + blit a cada frame (antigo) x Font.render só quando o texto muda
+    (HUD do chefe 1) x atlas de glifos (glyphs.GlyphAtlas, placar e mensagens do duelo): glifos
+    com um Surface.blits quando o texto muda, a linha montada num blit quando não muda.
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py text')
+    ap.add_argument('--resolution', default='1920x1080', type=parse_resolution)
+    ap.add_argument('--frames', default=600, type=int)
+    args = ap.parse_args(argv)
+    W, H = args.resolution
+    screen = init_display(W, H)
+
+    import assetpack
+    from glyphs import GlyphAtlas
+
+    font1_path = os.path.join('assets', 'font', 'escrita1.ttf')
+    duel_font = pygame.font.Font(assetpack.open_asset(font1_path) if assetpack.exists(font1_path) else None, 56)
+    hud_font = pygame.font.Font(None, 24)
+    cases = [
+        # pior caso: o texto muda em todo frame
+        ('HUD (muda todo frame)', hud_font,
+         lambda i: f"P1 HP: {100 - i % 100}   P2 HP: {100 - i % 37}   Boss: {1000 - i % 1000}"),
+        # caso típico: a vida muda algumas vezes por segundo
+        ('HUD (muda a cada 10)', hud_font,
+         lambda i: f"P1 HP: {100 - i // 10 % 100}   P2 HP: 100   Boss: {1000 - i // 10 % 1000}"),
+        ('placar duelo', duel_font, lambda i: f"{i // 60 % 5}  x  {i // 90 % 3}"),
+        ('mensagem duelo', duel_font, lambda i: "JOGADOR 1 VENCEU A RODADA!"),
+    ]
+    rows = []
+    for name, font, text_for in cases:
+        color = (255, 255, 255)
+        t = time.perf_counter()
+        glyphs = GlyphAtlas(font, color)
+        build_ms = (time.perf_counter() - t) * 1000.0
+
+        t = time.perf_counter()
+        for i in range(args.frames):
+            screen.blit(font.render(text_for(i), True, color), (12, 12))
+        render_us = (time.perf_counter() - t) * 1e6 / args.frames
+
+        t = time.perf_counter()
+        last, surf = None, None
+        for i in range(args.frames):
+            text = text_for(i)
+            if text != last:
+                last, surf = text, font.render(text, True, color)
+            screen.blit(surf, (12, 12))
+        changed_us = (time.perf_counter() - t) * 1e6 / args.frames
+
+        t = time.perf_counter()
+        for i in range(args.frames):
+            glyphs.draw(screen, text_for(i), (12, 12))
+        glyph_us = (time.perf_counter() - t) * 1e6 / args.frames
+        rows.append([name, f"{render_us:.1f}", f"{changed_us:.1f}", f"{glyph_us:.1f}",
+                     f"{render_us / glyph_us:.1f}x", f"{build_ms:.1f}"])
+    print(f"resolução {W}x{H}, {args.frames} frames (us/frame por string)")
+    print_table(('texto', 'Font.render', 'render se muda', 'glifos', 'ganho glifos', 'montagem ms'), rows)
+
+
+@benchmark('fonts')
+def bench_fonts(argv):
+    """
+    Fontes e textos fixos: abrir fontes e renderizar rótulos a cada tela (antigo) x registro de
+    fontes + cache de textos (fonts.FONTS / fonts.TEXT), com a taxa de acerto das telas reais.
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py fonts')
+    ap.add_argument('--resolution', default='1920x1080', type=parse_resolution)
+    ap.add_argument('--repeat', default=20, type=int, help='vezes que cada tela é aberta')
+    args = ap.parse_args(argv)
+    W, H = args.resolution
+    screen = init_display(W, H)
+    clock = pygame.time.Clock()
+
+    import assetpack
+    from fonts import FONTS, TEXT
+    from menu import menu, menu_manifest
+    from ranking import show_ranking_screen
+    from utils import get_player_names
+    from assets import REGISTRY
+
+    font1_path = os.path.join('assets', 'font', 'escrita1.ttf')
+    font2_path = os.path.join('assets', 'font', 'escrita2.ttf')
+    # (caminho, tamanho, textos fixos) de cada tela
+    screens = [
+        ('menu', [(None, 52, ["JOGAR", "TUTORIAL", "RANKING"])]),
+        ('ranking', [(None, 64, ["RANKING - MELHORES TEMPOS"]),
+                     (None, 28, ["Pressione ESC/ENTER/Y/A para voltar"])]),
+        ('nomes', [(None, 64, ["Digite os nomes"]),
+                   (None, 40, ["Nome do Jogador 1:", "Nome do Jogador 2:",
+                               "Enter para confirmar cada nome. ESC para cancelar.", "Player1", "Player2"])]),
+        ('duelo (fontes)', [(font1_path, 56, []), (font2_path, 70, []), (font1_path, 36, [])]),
+    ]
+
+    def open_font(path, size):
+        return pygame.font.Font(assetpack.open_asset(path) if path and assetpack.exists(path) else None, size)
+
+    def before(specs):
+        for path, size, texts in specs:
+            font = open_font(path, size)
+            for text in texts:
+                font.render(text, True, (255, 255, 255))
+
+    def after(specs):
+        for path, size, texts in specs:
+            font = FONTS.get(path, size)
+            for text in texts:
+                TEXT.render(font, text, (255, 255, 255))
+
+    rows = []
+    for name, specs in screens:
+        row = [name]
+        for fn in (before, after):
+            t = time.perf_counter()
+            for _ in range(args.repeat):
+                fn(specs)
+            row.append(f"{(time.perf_counter() - t) * 1000.0 / args.repeat:.2f}")
+        rows.append(row)
+    print(f"{args.repeat} aberturas de cada tela (ms por abertura)")
+    print_table(('tela', 'antes', 'depois'), rows)
+
+    # telas de verdade abertas e fechadas várias vezes: contadores dos caches
+    FONTS.clear()
+    TEXT.clear()
+    FONTS.stats = {'hits': 0, 'opened': 0}
+    TEXT.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+    REGISTRY.load(menu_manifest(W, H))
+    for _ in range(args.repeat):
+        for key, run in ((pygame.K_RETURN, lambda: menu(screen, clock, W, H)),
+                         (pygame.K_ESCAPE, lambda: show_ranking_screen(screen, clock, W, H)),
+                         (pygame.K_ESCAPE, lambda: get_player_names(screen, clock, W, H))):
+            pygame.event.clear()
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode='', scancode=0))
+            run()
+    print()
+    print(FONTS.report())
+    print(TEXT.report())
+
+
+# ---------------------- desenho das arenas ----------------------
+
+
+@benchmark('quality')
+def bench_quality(argv):
+    """
+    Níveis de qualidade (config.QUALITY_PRESETS): custo de desenho de uma arena do Boss 2
+    lotada em cada nível e o governador 'auto' diante de uma carga que sobe, oscila e cai.
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py quality')
+    ap.add_argument('--resolution', default='1920x1080', type=parse_resolution)
+    ap.add_argument('--bullets', default=400, type=int, help='projéteis das mãos vivos')
+    ap.add_argument('--frames', default=120, type=int)
+    args = ap.parse_args(argv)
+    W, H = args.resolution
+    screen = init_display(W, H)
+
+    import random
+    from boss2 import Boss2, BOSS2_IMAGE_PATH, BOSS2_BULLET_IMAGE_PATH
+    from boss1 import SlimePatch
+    from player import SimpleBullet
+    from render import RenderQueue, LAYER_EFFECTS, rect_stamp
+    from quality import QUALITY, QualityGovernor
+
+    boss = Boss2(W // 2, 80, W, H, image_path=BOSS2_IMAGE_PATH, bullet_image_path=BOSS2_BULLET_IMAGE_PATH)
+    background = pygame.Surface((W, H)).convert()
+    background.fill((30, 20, 40))
+    queue = RenderQueue()
+    rows = []
+    for level in ('high', 'medium', 'low'):
+        QUALITY.configure(level)
+        rng = random.Random(1)
+        # mesmas escolhas do jogo: arte dos projéteis, lasers e slime conforme o nível
+        sprite = boss.bullet_sprite if QUALITY.get('bullet_sprites') else None
+        bullets = [SimpleBullet(rng.uniform(0, W), rng.uniform(0, H), rng.uniform(-1, 1), rng.uniform(-1, 1),
+                                color=(0, 255, 60), radius=8, sprite=sprite) for _ in range(args.bullets)]
+        laser_color = (255, 80, 80, 160) if QUALITY.get('translucent') else (190, 60, 60)
+        laser = rect_stamp((boss.laser_width, boss.laser_height), laser_color)
+        slime = [SlimePatch(rng.uniform(0, W - 200), H - 60, 200, 40) for _ in range(6)]
+        spent = 0.0
+        for _ in range(args.frames):
+            for b in bullets:
+                b.update(1.0 / 60.0)
+            t = time.perf_counter()
+            screen.blit(background, (0, 0))
+            for s in slime:
+                s.submit(queue)
+            queue.submit(laser, (W // 3, 300), LAYER_EFFECTS)
+            queue.submit(laser, (2 * W // 3, 300), LAYER_EFFECTS)
+            for b in bullets:
+                b.submit(queue)
+            queue.flush(screen, rects=False)
+            spent += time.perf_counter() - t
+        rows.append([level, f"{spent * 1000.0 / args.frames:.2f}"])
+    print(f"resolução {W}x{H}, {args.bullets} projéteis + 2 lasers + 6 poças, {args.frames} frames")
+    print_table(('nível', 'ms/frame'), rows)
+
+    # governador com tempos de frame sintéticos (orçamento de 16,7 ms a 60 FPS)
+    rng = random.Random(2)
+    phases = [
+        ('leve', 600, lambda: rng.uniform(4, 6)),
+        ('pesada', 600, lambda: rng.uniform(17, 22)),
+        ('na faixa', 1200, lambda: rng.uniform(9, 14.5)),
+        ('leve', 900, lambda: rng.uniform(4, 6)),
+    ]
+    gov = QualityGovernor('auto')
+    rows = []
+    for name, frames, sample in phases:
+        before = len(gov.changes)
+        for _ in range(frames):
+            gov.frame(sample())
+        rows.append([name, frames, len(gov.changes) - before, gov.level])
+    print()
+    print("governador 'auto' (mudanças de nível em cada fase da carga)")
+    print_table(('carga', 'frames', 'mudanças', 'nível no fim'), rows)
+    for frame, old, new, avg in gov.changes:
+        print(f"  frame {frame}: {old} -> {new} (média {avg:.1f} ms)")
+    QUALITY.configure('auto')
+
+
+class _FrameClock:
+    """
+    Substituto de pygame.time.Clock para os loops das fases: guarda o tempo de trabalho de
+    cada frame (do fim de um tick ao começo do seguinte, sem a espera do limite de FPS).
+    Com capped=False ignora o limite de FPS pedido pela fase (mede o FPS alcançado).
+    """
+
+    def __init__(self, capped=True):
+        self._clock = pygame.time.Clock()
+        self._after = None
+        self.capped = capped
+        self.work_ms = []
+
+    def tick(self, framerate=0):
+        now = time.perf_counter()
+        if self._after is not None:
+            self.work_ms.append((now - self._after) * 1000.0)
+        ms = self._clock.tick(framerate if self.capped else 0)
+        self._after = time.perf_counter()
+        return ms
+
+    def get_rawtime(self):
+        return self._clock.get_rawtime()
+
+    def get_fps(self):
+        return self._clock.get_fps()
+
+
+@benchmark('backend')
+def bench_backend(argv):
+    """
+    Tempo de frame de run_boss1/run_boss2 no backend de surfaces x backend de renderer SDL2
+    (texrender.py), em 1080p e 4K (cada resolução num processo: o modo SCALED não muda de tamanho).
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py backend')
+    ap.add_argument('--resolutions', default='1920x1080,3840x2160')
+    ap.add_argument('--seconds', default=5.0, type=float, help='tempo em cada fase/backend')
+    ap.add_argument('--stages', default='boss1,boss2')
+    ap.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    resolutions = args.resolutions.split(',')
+
+    if not args.child:
+        import subprocess
+        rows = []
+        for res in resolutions:
+            cmd = [sys.executable, os.path.abspath(__file__), 'backend', '--child', '--resolutions', res,
+                   '--seconds', str(args.seconds), '--stages', args.stages]
+            out = subprocess.run(cmd, capture_output=True, text=True)
+            lines = [l.split('\t')[1:] for l in out.stdout.splitlines() if l.startswith('ROW\t')]
+            if not lines:
+                print(f"{res}: falhou\n{out.stderr.strip()}", file=sys.stderr)
+            rows.extend(lines)
+        print(f"{args.seconds:.0f} s por fase/backend, jogadores parados, qualidade 'high' "
+              f"(ms de trabalho por frame, sem a espera do clock.tick)")
+        print_table(('resolução', 'fase', 'backend', 'frames', 'média ms', 'p95 ms'), rows)
+        return
+
+    W, H = parse_resolution(resolutions[0])
+    pygame.init()
+    try:
+        pygame.mixer.init()
+    except Exception:
+        pass
+    screen = pygame.display.set_mode((W, H), pygame.SCALED)
+
+    import render
+    from quality import QUALITY
+    from boss1 import run_boss1
+    from boss2 import run_boss2
+
+    stages = {'boss1': run_boss1, 'boss2': run_boss2}
+    QUALITY.configure('high')
+    escape = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, mod=0, unicode='', scancode=0)
+    for name in args.stages.split(','):
+        for backend in ('surface', 'renderer'):
+            render.RENDER_BACKEND = backend
+            clock = _FrameClock()
+            pygame.event.clear()
+            pygame.time.set_timer(escape, int(args.seconds * 1000), loops=1)
+            stages[name](screen, clock, W, H)
+            # os primeiros frames incluem o carregamento da fase e a criação das texturas
+            frames = sorted(clock.work_ms[30:]) or [0.0]
+            mean = sum(frames) / len(frames)
+            p95 = frames[int(len(frames) * 0.95) - 1] if len(frames) > 1 else frames[0]
+            print('\t'.join(['ROW', f"{W}x{H}", name, backend, str(len(frames)), f"{mean:.2f}", f"{p95:.2f}"]))
+            sys.stdout.flush()
+
+
+@benchmark('pipeline')
+def bench_pipeline(argv):
+    """
+    FPS alcançado por run_boss2 com muitos projéteis vivos no modo serial x pipelined
+    (pipeline.py), sem o limite de 60 FPS. Jogadores parados e imortais; o chefe dispara das
+    mãos a uma taxa fixa por segundo, então a carga é a mesma nos dois modos.
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py pipeline')
+    ap.add_argument('--resolution', default='1920x1080', type=parse_resolution)
+    ap.add_argument('--bullets', default=400, type=int, help='projéteis das mãos vivos (aprox.)')
+    ap.add_argument('--seconds', default=10.0, type=float,
+                    help='tempo em cada modo (os 4 s iniciais, enchendo a tela, não contam)')
+    ap.add_argument('--backend', default='surface', choices=('surface', 'renderer'))
+    args = ap.parse_args(argv)
+    W, H = args.resolution
+    screen = init_display(W, H, pygame.SCALED if args.backend == 'renderer' else 0)
+
+    import random
+    import boss2
+    import render
+    from player import PlayerSimple, SimpleBullet
+    from quality import QUALITY
+
+    # projéteis vivem 4 s (SimpleBullet.life): taxa para manter ~args.bullets na tela
+    rate = args.bullets / 4.0
+    rng = random.Random(4)
+    alive = []
+
+    class HeavyBoss2(boss2.Boss2):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, **kw)
+            self._owed = 0.0
+
+        def update(self, dt):
+            super().update(dt)
+            self._owed += rate * dt
+
+        def try_shoot_hands_at_players(self, player_centers):
+            n, self._owed = int(self._owed), self._owed - int(self._owed)
+            y = int(self.rect.y + getattr(self, '_y_offset', 0)) + self.h - 10
+            sprite = self.bullet_sprite if QUALITY.get('bullet_sprites') else None
+            out = [SimpleBullet(self.rect.x + self.hand_offsets[i % 2], y, rng.uniform(-1, 1), rng.uniform(0.2, 1),
+                                speed=rng.uniform(150, 300), color=(0, 255, 60), radius=8, sprite=sprite)
+                   for i in range(n)]
+            alive.extend(out)
+            return out
+
+    class ImmortalPlayer(PlayerSimple):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, **kw)
+            self.health = 1e9
+
+        def take_damage(self, amount):
+            return False
+
+    renderers = []
+
+    def capture(*a, **kw):
+        renderers.append(render.stage_renderer(*a, **kw))
+        return renderers[-1]
+
+    saved = (boss2.Boss2, boss2.PlayerSimple, boss2.stage_renderer)
+    boss2.Boss2, boss2.PlayerSimple, boss2.stage_renderer = HeavyBoss2, ImmortalPlayer, capture
+    QUALITY.configure('high')
+    render.RENDER_BACKEND = args.backend
+    escape = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, mod=0, unicode='', scancode=0)
+    rows = []
+    try:
+        # a primeira execução da fase paga carregamento e caches frios: aquecimento sem contar
+        for mode, seconds in (('warmup', 2.0), ('serial', args.seconds), ('pipelined', args.seconds)):
+            render.RENDER_PIPELINED = mode == 'pipelined'
+            del alive[:]
+            # (instante, projéteis vivos) no começo de cada frame
+            samples = []
+            clock = _FrameClock(capped=False)
+            tick = clock.tick
+
+            def counting_tick(framerate=0):
+                alive[:] = [b for b in alive if b.alive]
+                samples.append((time.perf_counter(), len(alive)))
+                return tick(framerate)
+            clock.tick = counting_tick
+
+            pygame.event.clear()
+            pygame.time.set_timer(escape, int(seconds * 1000), loops=1)
+            boss2.run_boss2(screen, clock, W, H)
+            if mode == 'warmup':
+                continue
+            # só o regime: depois de 4 s (vida de um projétil) a quantidade na tela estabiliza
+            start = samples[0][0] + 4.0
+            steady = [(t, n) for t, n in samples if t >= start]
+            if len(steady) < 2:
+                rows.append([mode, len(samples), '-', '-', '-', '-'])
+                continue
+            frames = len(steady) - 1
+            fps = frames / (steady[-1][0] - steady[0][0])
+            split = '-'
+            timing = getattr(renderers[-1], 'timing', None)
+            if timing and timing['frames']:
+                split = (f"{timing['render_ms'] / timing['frames']:.2f} / "
+                         f"{timing['wait_ms'] / timing['frames']:.2f}")
+            rows.append([mode, frames, f"{fps:.1f}", f"{1000.0 / fps:.2f}",
+                         f"{sum(n for _t, n in steady) / len(steady):.0f}", split])
+    finally:
+        boss2.Boss2, boss2.PlayerSimple, boss2.stage_renderer = saved
+        render.RENDER_PIPELINED = False
+        QUALITY.configure('auto')
+    print(f"resolução {W}x{H}, backend {args.backend}, {args.seconds:.0f} s por modo, "
+          f"{os.cpu_count()} CPU(s), sem limite de FPS (só o regime, depois de 4 s)")
+    print_table(('modo', 'frames', 'FPS', 'ms/frame', 'projéteis', 'apresentação / espera ms'), rows)
+
+
+# ---------------------- áudio ----------------------
+
+
+@benchmark('audio')
+def bench_audio(argv):
+    """
+    Efeitos sonoros: decodificar o MP3 x carregar o PCM do cache em disco x banco da sessão
+    (objeto Sound já pronto).
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py audio')
+    ap.add_argument('--repeat', default=5, type=int)
+    args = ap.parse_args(argv)
+    init_display(320, 240)
+    if pygame.mixer.get_init() is None:
+        print("mixer indisponível", file=sys.stderr)
+        return
+
+    import assetpack
+    import audio
+    from player import SHOT_SOUND_PATH
+    from boss1 import BOSS1_ROAR_PATH
+    from faroeste import FAROESTE_SHOT_SOUND_PATH
+
+    def best(fn):
+        times = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t)
+        return min(times) * 1000.0
+
+    rows = []
+    for path in (SHOT_SOUND_PATH, BOSS1_ROAR_PATH, FAROESTE_SHOT_SOUND_PATH):
+        if not assetpack.exists(path):
+            continue
+        fmt = pygame.mixer.get_init()
+        entry = audio._pcm_entry_path(path, fmt)
+        audio.SoundBank().get(path)     # garante a entrada no cache em disco
+        bank = audio.SoundBank()
+        bank.get(path)
+        decode = best(lambda: pygame.mixer.Sound(file=assetpack.open_asset(path)))
+        cached = best(lambda: pygame.mixer.Sound(buffer=audio._read_pcm(entry, fmt)))
+        hit = best(lambda: bank.get(path))
+        rows.append((os.path.basename(path), f"{decode:.2f}", f"{cached:.2f}", f"{hit:.4f}"))
+    print(f"mixer {pygame.mixer.get_init()}, melhor de {args.repeat} (ms)")
+    print_table(('efeito', 'mp3', 'pcm em disco', 'banco'), rows)
+
+
+@benchmark('latency')
+def bench_latency(argv):
+    """
+    Latência de saída de áudio de cada perfil do mixer (config.MIXER_PROFILES): tempo de
+    Sound.play() até o callback de áudio + duração de um bloco do buffer.
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py latency')
+    ap.add_argument('--profile', default='all', help="perfil a medir (padrão: todos)")
+    ap.add_argument('--trials', default=30, type=int)
+    args = ap.parse_args(argv)
+
+    from config import MIXER_PROFILES
+    from audio import measure_output_latency
+
+    pygame.init()
+    pygame.display.set_mode((320, 240))
+    names = list(MIXER_PROFILES) if args.profile == 'all' else [args.profile]
+    rows = []
+    for name in names:
+        profile = MIXER_PROFILES[name]
+        pygame.mixer.quit()
+        try:
+            pygame.mixer.init(**profile)
+        except Exception as e:
+            print(f"{name}: mixer indisponível ({e})", file=sys.stderr)
+            continue
+        r = measure_output_latency(profile['buffer'], args.trials)
+        if r is None:
+            print(f"{name}: sem medição", file=sys.stderr)
+            continue
+        rows.append((name, profile['buffer'], f"{r['buffer_ms']:.1f}", f"{r['callback_ms']:.1f}",
+                     f"{r['latency_ms']:.1f}", f"{r['latency_p95_ms']:.1f}"))
+    print(f"{args.trials} disparos por perfil (ms)")
+    print_table(('perfil', 'buffer', 'bloco', 'até callback', 'latência', 'p95'), rows)
+
+
+# ---------------------- telas paradas ----------------------
+
+@benchmark('idle')
+def bench_idle(argv):
+    """
+    CPU das telas paradas (menu, ranking, nomes, quadrinhos) sem ninguém mexendo:
+    redesenho a cada frame (antigo) x redesenho sob demanda com event.wait (render.IdleScreen).
+    """
+    ap = argparse.ArgumentParser(prog='benchmark.py idle')
+    ap.add_argument('--resolution', default='1920x1080', type=parse_resolution)
+    ap.add_argument('--seconds', default=5.0, type=float, help='tempo parado em cada tela')
+    args = ap.parse_args(argv)
+    W, H = args.resolution
+    screen = init_display(W, H)
+    clock = pygame.time.Clock()
+
+    import render
+    from config import TUTORIAL_PATHS
+    from assets import REGISTRY, SCOPE_SESSION
+    from audio import MUSIC
+    from menu import menu, menu_manifest
+    from ranking import show_ranking_screen
+    from utils import get_player_names, show_quadrinhos_sequence, quadrinhos_manifest
+
+    # assets e música já carregados: mede só o custo de ficar parado
+    REGISTRY.load(menu_manifest(W, H))
+    REGISTRY.load(quadrinhos_manifest(W, H, TUTORIAL_PATHS[:1], scope=SCOPE_SESSION))
+    MUSIC.play('menu', fade_ms=0)
+    while MUSIC.busy():
+        MUSIC.update()
+        pygame.time.wait(10)
+
+    wait_ms = int(args.seconds * 1000)
+    screens = [
+        ('menu', pygame.K_RETURN, lambda: menu(screen, clock, W, H)),
+        ('ranking', pygame.K_ESCAPE, lambda: show_ranking_screen(screen, clock, W, H)),
+        ('nomes', pygame.K_ESCAPE, lambda: get_player_names(screen, clock, W, H)),
+        ('quadrinhos', pygame.K_ESCAPE, lambda: show_quadrinhos_sequence(
+            screen, clock, W, H, TUTORIAL_PATHS[:1], duration_ms=wait_ms * 10, scope=SCOPE_SESSION)),
+    ]
+    rows = []
+    for name, key, run in screens:
+        row = [name]
+        for enabled in (False, True):
+            render.IDLE_EVENT_WAIT = enabled
+            pygame.event.clear()
+            # a tecla que fecha a tela chega sozinha depois do tempo parado
+            pygame.time.set_timer(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode='', scancode=0),
+                                  wait_ms, loops=1)
+            cpu, wall = time.process_time(), time.perf_counter()
+            run()
+            cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+            row.append(f"{100.0 * cpu / wall:.1f}")
+        rows.append(row)
+    render.IDLE_EVENT_WAIT = True
+    print(f"resolução {W}x{H}, {args.seconds:.0f} s parado em cada tela (% de um núcleo)")
+    print_table(('tela', 'CPU antes', 'CPU depois'), rows)
+
+
+def main(argv):
+    if not argv or argv[0] in ('-h', '--help', '--list'):
+        print("benchmarks disponíveis:")
+        for name, fn in BENCHMARKS.items():
+            doc = (fn.__doc__ or '').strip().splitlines()
+            print(f"  {name:<12} {doc[0] if doc else ''}")
+        return 0
+    fn = BENCHMARKS.get(argv[0])
+    if fn is None:
+        print(f"benchmark desconhecido: {argv[0]}", file=sys.stderr)
+        return 1
+    fn(argv[1:])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -4,13 +4,18 @@ import sys
 import math
 import pygame
 
-from player import PlayerSimple, SimpleBullet
+from player import PlayerSimple, SimpleBullet, PLAYER_IMAGE_PATH, WALK_FRAMES_P1, WALK_FRAMES_P2, player_manifest
 from utils import show_quadrinhos_sequence
+from audio import VOICES, MUSIC
+from render import stage_renderer, RenderQueue, LAYER_GROUND, rect_stamp
+from fonts import FONTS
+from quality import QUALITY
+from timestep import FixedTimestep, lerp
+from assets import REGISTRY, SCOPE_STAGE, SCOPE_SESSION, image_spec, sound_spec, atlas_spec
 from config import (
-    POST_BOSS1_QUADRINHO,
     TUTORIAL_PATHS,
-    QUADRINHO_DURATION_MS,
     JOYSTICK_TUTORIAL_BUTTON_B,
+    ARENA_FPS,
 )
 
 
@@ -24,7 +29,8 @@ class SlimePatch:
       - duration: float, duração em segundos que a poça permanece ativa
       - time: float, tempo acumulado desde a criação (usado para expirar)
       - alive: bool, se a poça ainda está ativa
-      - surface: Surface semi-transparente usada para desenhar a poça
+      - surface: Surface semi-transparente usada para desenhar a poça (render.rect_stamp,
+                 compartilhada entre poças do mesmo tamanho)
 
     Métodos:
       - update(dt)
@@ -45,7 +51,10 @@ class SlimePatch:
           Desenha a superfície do slime na tela.
           Parâmetros:
             surface: pygame.Surface onde desenhar.
-          Retorno: None
+          Retorno: pygame.Rect da área desenhada
+
+      - submit(queue)
+          Envia o desenho da poça para a fila do frame (render.RenderQueue, camada LAYER_GROUND).
     """
     def __init__(self, x, y, width, height, dps=6.0, duration=8.0):
         self.rect = pygame.Rect(int(x), int(y), int(width), int(height))
@@ -53,8 +62,10 @@ class SlimePatch:
         self.duration = float(duration)
         self.time = 0.0
         self.alive = True
-        self.surface = pygame.Surface((self.rect.w, self.rect.h), pygame.SRCALPHA)
-        self.surface.fill((20, 200, 40, 130))
+        # cor chapada translúcida: alpha da surface inteira (mais barato que alpha por pixel);
+        # em qualidade reduzida, cor opaca (cópia simples, sem mistura com o fundo)
+        color = (20, 200, 40, 130) if QUALITY.get('translucent') else (20, 120, 30)
+        self.surface = rect_stamp((self.rect.w, self.rect.h), color)
 
     def update(self, dt):
         """
@@ -90,9 +101,12 @@ class SlimePatch:
 
         Parâmetros:
           surface: pygame.Surface onde desenhar.
-        Retorno: None
+        Retorno: pygame.Rect da área desenhada
         """
-        surface.blit(self.surface, (self.rect.x, self.rect.y))
+        return surface.blit(self.surface, (self.rect.x, self.rect.y))
+
+    def submit(self, queue):
+        queue.submit(self.surface, (self.rect.x, self.rect.y), LAYER_GROUND)
 
 
 class Boss1:
@@ -111,6 +125,7 @@ class Boss1:
 
     Atributos principais:
       - rect: pygame.Rect representando a posição e tamanho do chefe
+      - x: posição horizontal em float (rect.x é a versão arredondada, usada nas colisões)
       - speed: float velocidade horizontal
       - direction: int, 1 ou -1
       - patrol_min_x / patrol_max_x: limites de deslocamento no eixo x
@@ -131,26 +146,36 @@ class Boss1:
           Retorno:
             SlimePatch | None -> novo objeto SlimePatch se spawnar, caso contrário None
 
-      - draw(surface)
-          Desenha o chefe (imagem se disponível) e a barra de vida.
+      - position(alpha=1.0)
+          Canto superior esquerdo do desenho, interpolado entre os dois últimos passos.
+
+      - draw(surface, alpha=1.0)
+          Desenha o chefe (imagem se disponível) e a barra de vida na posição interpolada.
           Parâmetros:
             surface: pygame.Surface onde desenhar.
-          Retorno: None
+            alpha (float): fração entre o passo anterior e o atual (ver timestep.py).
+          Retorno: pygame.Rect com a área desenhada
     """
     def __init__(self, x, y, screen_w, screen_h, image_path=None):
         self.screen_w = screen_w
         self.screen_h = screen_h
         self.image = None
 
-        if image_path and os.path.exists(image_path):
-            img = pygame.image.load(image_path).convert_alpha()
-            target_h = int(screen_h * 0.35)
-            scale = target_h / img.get_height()
-            self.image = pygame.transform.rotozoom(img, 0, scale)
+        if image_path:
+            # sprite escalado para ~35% da altura da tela: view do atlas da fase
+            # (boss1_atlas_spec); outros caminhos viram imagens avulsas no registro
+            sprites = REGISTRY.request(boss1_atlas_spec(screen_h))
+            self.image = sprites.find(image_path) if sprites is not None else None
+            if self.image is None:
+                self.image = REGISTRY.image(image_path, height=int(screen_h * 0.35), scope=SCOPE_STAGE)
 
         self.w = self.image.get_width() if self.image else 200
         self.h = self.image.get_height() if self.image else 150
         self.rect = pygame.Rect(x, y, self.w, self.h)
+        self.x = float(x)
+        self._y_offset = 0.0
+        # (x, _y_offset) do passo anterior, para a interpolação do desenho
+        self._prev = (self.x, self._y_offset)
 
         self.speed = 140.0
         self.direction = 1
@@ -182,16 +207,18 @@ class Boss1:
 
         Retorno: None
         """
+        self._prev = (self.x, self._y_offset)
         self._time += dt
         self._time_since_last_slime += dt
-        self.rect.x += int(self.direction * self.speed * dt)
+        self.x += self.direction * self.speed * dt
 
-        if self.rect.x < self.patrol_min_x:
-            self.rect.x = self.patrol_min_x
+        if self.x < self.patrol_min_x:
+            self.x = float(self.patrol_min_x)
             self.direction = 1
-        elif self.rect.x > self.patrol_max_x:
-            self.rect.x = self.patrol_max_x
+        elif self.x > self.patrol_max_x:
+            self.x = float(self.patrol_max_x)
             self.direction = -1
+        self.rect.x = round(self.x)
 
         self._y_offset = math.sin(2 * math.pi * self.bob_frequency * self._time) * self.bob_amplitude
 
@@ -217,22 +244,73 @@ class Boss1:
         self._time_since_last_slime = 0.0
         return patch
 
-    def draw(self, surface):
+    def position(self, alpha=1.0):
+        """
+        Canto superior esquerdo da imagem do chefe (com o bob vertical), interpolado entre o
+        passo de simulação anterior (alpha 0.0) e o atual (alpha 1.0) — ver timestep.py.
+
+        Retorno: tupla (x, y) em pixels inteiros.
+        """
+        x = lerp(self._prev[0], self.x, alpha)
+        y_offset = lerp(self._prev[1], self._y_offset, alpha)
+        return round(x), int(self.rect.y + y_offset)
+
+    def draw(self, surface, alpha=1.0):
         """
         Desenha o chefe (imagem se existir) e sua barra de vida.
 
         Parâmetros:
           surface: pygame.Surface onde desenhar.
+          alpha (float): fração entre o passo anterior e o atual (ver position).
 
-        Retorno: None
+        Retorno: pygame.Rect com a área desenhada (imagem + barra de vida).
         """
-        draw_y = int(self.rect.y + getattr(self, '_y_offset', 0))
+        x, draw_y = self.position(alpha)
+        drawn = pygame.Rect(x, draw_y - 12, self.w, 8)
         if self.image:
-            surface.blit(self.image, (self.rect.x, draw_y))
+            drawn.union_ip(surface.blit(self.image, (x, draw_y)))
         # desenha barra de vida acima do chefe
-        pygame.draw.rect(surface, (40, 40, 40), (self.rect.x, draw_y - 12, self.w, 8))
+        surface.fill((40, 40, 40), (x, draw_y - 12, self.w, 8))
         hp_ratio = max(0.0, self.health / self.max_health)
-        pygame.draw.rect(surface, (200, 20, 20), (self.rect.x, draw_y - 12, int(self.w * hp_ratio), 8))
+        surface.fill((200, 20, 20), (x, draw_y - 12, int(self.w * hp_ratio), 8))
+        return drawn
+
+
+BOSS1_BACKGROUND_PATH = os.path.join('assets', 'img', 'fundo2.png')
+BOSS1_IMAGE_PATH = os.path.join('assets', 'img', 'boss2.png')
+BOSS1_ROAR_PATH = os.path.join('assets', 'sounds', 'som11.mp3')
+
+
+def boss1_atlas_spec(H):
+    """
+    Atlas de sprites do estágio Boss1 (ver atlas.py): 'boss' escalado para ~35% da altura da tela.
+
+    Parâmetros:
+      H (int): altura da tela.
+
+    Retorno:
+      spec (ver assets.atlas_spec).
+    """
+    return atlas_spec('boss1', {'boss': [image_spec(BOSS1_IMAGE_PATH, height=int(H * 0.35))]})
+
+
+def boss1_manifest(W, H):
+    """
+    Manifesto de assets do estágio Boss1 (fundo, sprite do chefe, rugido e assets dos jogadores).
+
+    Parâmetros:
+      W (int), H (int): dimensões da tela — definem os tamanhos destino das imagens.
+
+    Retorno:
+      dict nome -> spec (ver assets.image_spec / assets.sound_spec / assets.atlas_spec).
+    """
+    manifest = {
+        'fundo': image_spec(BOSS1_BACKGROUND_PATH, size=(W, H), mode='opaque'),
+        'boss': boss1_atlas_spec(H),
+        'roar': sound_spec(BOSS1_ROAR_PATH, volume=0.55),
+    }
+    manifest.update(player_manifest(H))
+    return manifest
 
 
 def run_boss1(screen, clock, W, H):
@@ -258,58 +336,43 @@ def run_boss1(screen, clock, W, H):
         True  -> chefe derrotado (fase vencida)
         False -> fase abortada (ESC) ou ambos os jogadores mortos
     """
-    fundo_path = os.path.join('assets', 'img', 'fundo2.png')
-    fundo_image = None
-    if os.path.exists(fundo_path):
-        fundo_image = pygame.image.load(fundo_path).convert()
-        fundo_image = pygame.transform.smoothscale(fundo_image, (W, H))
+    assets = REGISTRY.load(boss1_manifest(W, H))
+    fundo_image = assets['fundo']
+    # apresentação com retângulos sujos ou pelo renderer SDL2, conforme config.RENDER_BACKEND
+    # (ver render.stage_renderer); sem imagem, o fundo é a cor sólida. Tudo é desenhado em canvas.
+    renderer = stage_renderer(screen, fundo_image or (10, 10, 12))
+    canvas = renderer.target
+    # poças e projéteis vão para a fila e são desenhados numa única chamada Surface.blits
+    queue = RenderQueue()
 
-    # carregar sprites dos jogadores (sequências de caminhada, se existirem)
-    walk_frames_p1 = [os.path.join('assets', 'img', f'andar_{i}.png') for i in range(4)]
-    walk_frames_p2 = [os.path.join('assets', 'img', f'andarv_{i}.png') for i in range(4)]
+    # sprites dos jogadores (sequências de caminhada, se existirem) — já carregados pelo manifesto
 
     player1 = PlayerSimple(
         W // 4, H, H,
-        image_path=os.path.join('assets', 'img', 'astronauta1.png'),
-        walk_frames_paths=walk_frames_p1,
+        image_path=PLAYER_IMAGE_PATH,
+        walk_frames_paths=WALK_FRAMES_P1,
         walk_frame_interval=0.10
     )
     player2 = PlayerSimple(
         3 * W // 4, H, H,
-        image_path=os.path.join('assets', 'img', 'astronauta1.png'),
-        walk_frames_paths=walk_frames_p2,
+        image_path=PLAYER_IMAGE_PATH,
+        walk_frames_paths=WALK_FRAMES_P2,
         walk_frame_interval=0.10
     )
 
-    boss = Boss1(W // 2 - 200, 60, W, H, image_path=os.path.join('assets', 'img', 'boss2.png'))
+    boss = Boss1(W // 2 - 200, 60, W, H, image_path=BOSS1_IMAGE_PATH)
 
     bullets = []
     boss_bullets = []
     slime_patches = []
 
     # som do rugido (opcional)
-    roar_path = os.path.join('assets', 'sounds', 'som11.mp3')
-    roar_sound = None
-    if os.path.exists(roar_path):
-        try:
-            roar_sound = pygame.mixer.Sound(roar_path)
-            roar_sound.set_volume(0.55)
-        except Exception:
-            pass
+    roar_sound = assets['roar']
     ROAR_INTERVAL = 10.0
     _roar_timer = 0.0
 
-    # música de fundo do estágio (opcional)
-    boss1_music_path = os.path.join('assets', 'sounds', 'som10.mp3')
-    if os.path.exists(boss1_music_path):
-        try:
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.fadeout(400)
-            pygame.mixer.music.load(boss1_music_path)
-            pygame.mixer.music.set_volume(0.18)
-            pygame.mixer.music.play(-1)
-        except Exception:
-            pass
+    # música de fundo do estágio (crossfade com a anterior; pré-carregada pela campanha)
+    MUSIC.play('boss1')
 
     # configurar joysticks presentes (se houver)
     joysticks = []
@@ -321,11 +384,120 @@ def run_boss1(screen, clock, W, H):
     trigger_prev = [False] * len(joysticks)
     TRIGGER_THRESHOLD = 0.5
 
-    font = pygame.font.Font(None, 24)
+    # texto do HUD refeito a cada QUALITY.get('hud_interval') frames e renderizado de novo só
+    # quando muda (a vida muda poucas vezes por segundo; com a fonte padrão Font.render sai
+    # mais barato que montar o texto glifo a glifo — ver `python benchmark.py text`)
+    hud_font = FONTS.get(None, 24)
+    hud_msg = None
+    hud_surf = None
+    hud_age = 0
+
+    # lógica em passos fixos de timestep.dt; o desenho interpola entre os dois últimos passos
+    timestep = FixedTimestep()
+
+    def simulate(dt):
+        """
+        Um passo fixo da simulação: atualiza as entidades e aplica colisões e dano.
+        Retorna True/False se o estágio terminou (ver acima), senão None.
+        """
+        nonlocal bullets, boss_bullets, slime_patches, _roar_timer
+        # atualizações de lógica
+        player1.update(dt, W)
+        player2.update(dt, W)
+        boss.update(dt)
+
+        # som de rugido periódico
+        _roar_timer += dt
+        if _roar_timer >= ROAR_INTERVAL and roar_sound and boss.health > 0:
+            VOICES.play(roar_sound, 'boss', priority=2)
+            _roar_timer = 0.0
+
+        # boss tenta soltar poça de slime
+        patch = boss.try_drop_slime()
+        if patch:
+            slime_patches.append(patch)
+
+        # filtrar listas por entidades vivas
+        bullets = [b for b in bullets if b.alive]
+        boss_bullets = [b for b in boss_bullets if b.alive]
+        slime_patches = [s for s in slime_patches if s.alive]
+
+        # atualizar projéteis dos jogadores e checar colisão com o chefe
+        for b in bullets:
+            b.update(dt)
+            if b.collides_rect(boss.rect):
+                boss.health -= 1
+                b.alive = False
+
+        # atualizar poças e aplicar dano contínuo a jogadores que estiverem em contato
+        for s in slime_patches:
+            s.update(dt)
+            for p in (player1, player2):
+                if p.health > 0 and s.collides_player(p):
+                    dmg = s.dps * dt
+                    p.health = max(0.0, p.health - dmg)
+                    if p.health <= 0:
+                        p.dead = True
+
+        # verificar condições de término:
+        # - chefe derrotado -> retornar True
+        if boss.health <= 0:
+            # a música segue nos quadrinhos e faz crossfade com a da próxima fase
+            return True
+
+        # - todos os jogadores mortos -> retornar False
+        if not any((not p.dead and p.health > 0) for p in (player1, player2)):
+            MUSIC.stop(600)
+            return False
 
+    def draw_scene(alpha):
+        """Desenha a cena e o HUD em canvas, com as posições interpoladas por alpha (ver timestep.py)."""
+        nonlocal hud_msg, hud_surf, hud_age
+        # o renderer restaura o fundo só onde houve desenho no frame anterior
+        renderer.begin()
+        renderer.add(boss.draw(canvas, alpha))
+        for s in slime_patches:
+            s.submit(queue)
+        for b in bullets:
+            b.submit(queue, alpha)
+        for b in boss_bullets:
+            b.submit(queue, alpha)
+        renderer.add(queue.flush(canvas))
+
+        renderer.add(player1.draw(canvas, alpha))
+        renderer.add(player2.draw(canvas, alpha))
+
+        hud_age += 1
+        if hud_msg is None or hud_age >= QUALITY.get('hud_interval'):
+            msg = f"P1 HP: {int(player1.health)}   P2 HP: {int(player2.health)}   Boss: {int(boss.health)}"
+            if msg != hud_msg:
+                hud_msg = msg
+                hud_surf = hud_font.render(msg, True, (255, 255, 255))
+            hud_age = 0
+        renderer.add(canvas.blit(hud_surf, (12, 12)))
+        renderer.present()
+
+    def step(frame_dt):
+        """
+        Um frame da arena depois dos eventos: os passos fixos que couberem em frame_dt e o
+        desenho da cena. Retorna True/False se o estágio terminou, senão None.
+        Roda na thread de simulação no modo pipelined (ver pipeline.py).
+        """
+        for _ in range(timestep.advance(frame_dt)):
+            outcome = simulate(timestep.dt)
+            if outcome is not None:
+                return outcome
+        draw_scene(timestep.alpha)
+
+    # média de tempo de frame só desta arena (ver quality.QualityGovernor)
+    QUALITY.begin()
+    # começa a simulação do zero: o primeiro dt não inclui o tempo de carregamento
+    timestep.reset()
+    clock.tick()
     # loop principal do chefe
     while True:
-        dt = clock.tick(60) / 1000.0
+        dt = clock.tick(ARENA_FPS) / 1000.0
+        QUALITY.frame(clock.get_rawtime())
 
         # eventos do Pygame (teclado, mouse, joystick)
         for ev in pygame.event.get():
@@ -336,7 +508,7 @@ def run_boss1(screen, clock, W, H):
             if ev.type == pygame.KEYDOWN:
                 # ESC cancela o estágio e retorna False
                 if ev.key == pygame.K_ESCAPE:
-                    pygame.mixer.music.fadeout(400)
+                    MUSIC.stop(400)
                     return False
                 # comandos de salto e tiro para teclado
                 if ev.key in (pygame.K_w, pygame.K_UP, pygame.K_SPACE):
@@ -367,7 +539,14 @@ def run_boss1(screen, clock, W, H):
                         player2.try_jump()
                 # botão B abre tutorial (mostra quadrinhos)
                 if ev.button == JOYSTICK_TUTORIAL_BUTTON_B:
-                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000)
+                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000, scope=SCOPE_SESSION)
+                    renderer.invalidate()
+                    # o tempo parado no tutorial não é tempo de frame: recomeça a medição do
+                    # relógio e a janela do governador (senão uma amostra de segundos rebaixa a qualidade)
+                    clock.tick()
+                    QUALITY.begin()
+                    # e a simulação continua de onde parou, sem passos de recuperação
+                    timestep.reset()
 
         # leitura contínua dos joysticks para movimento, mira e gatilho (rising edge)
         for i, j in enumerate(joysticks):
@@ -406,76 +585,9 @@ def run_boss1(screen, clock, W, H):
 
             trigger_prev[i] = pressed_now
 
-        # atualizações de lógica
-        player1.update(dt, W)
-        player2.update(dt, W)
-        boss.update(dt)
-
-        # som de rugido periódico
-        _roar_timer += dt
-        if _roar_timer >= ROAR_INTERVAL and roar_sound and boss.health > 0:
-            roar_sound.play()
-            _roar_timer = 0.0
-
-        # boss tenta soltar poça de slime
-        patch = boss.try_drop_slime()
-        if patch:
-            slime_patches.append(patch)
-
-        # filtrar listas por entidades vivas
-        bullets = [b for b in bullets if b.alive]
-        boss_bullets = [b for b in boss_bullets if b.alive]
-        slime_patches = [s for s in slime_patches if s.alive]
-
-        # atualizar projéteis dos jogadores e checar colisão com o chefe
-        for b in bullets:
-            b.update(dt)
-            if b.collides_rect(boss.rect):
-                boss.health -= 1
-                b.alive = False
-
-        # atualizar poças e aplicar dano contínuo a jogadores que estiverem em contato
-        for s in slime_patches:
-            s.update(dt)
-            for p in (player1, player2):
-                if p.health > 0 and s.collides_player(p):
-                    dmg = s.dps * dt
-                    p.health = max(0.0, p.health - dmg)
-                    if p.health <= 0:
-                        p.dead = True
-
-        # verificar condições de término:
-        # - chefe derrotado -> retornar True
-        if boss.health <= 0:
-            pygame.mixer.music.fadeout(600)
-            show_quadrinhos_sequence(screen, clock, W, H, [POST_BOSS1_QUADRINHO], duration_ms=QUADRINHO_DURATION_MS)
-            return True
-
-        # - todos os jogadores mortos -> retornar False
-        if not any((not p.dead and p.health > 0) for p in (player1, player2)):
-            pygame.mixer.music.fadeout(600)
-            return False
-
-        # desenhar cena
-        if fundo_image:
-            screen.blit(fundo_image, (0, 0))
-        else:
-            screen.fill((10, 10, 12))
-
-        boss.draw(screen)
-        for s in slime_patches:
-            s.draw(screen)
-        for b in bullets:
-            b.draw(screen)
-        for b in boss_bullets:
-            b.draw(screen)
-
-        player1.draw(screen)
-        player2.draw(screen)
-
-        hud = font.render(
-            f"P1 HP: {int(player1.health)}   P2 HP: {int(player2.health)}   Boss: {int(boss.health)}",
-            True, (255, 255, 255)
-        )
-        screen.blit(hud, (12, 12))
-        pygame.display.flip()
+        # simulação e desenho do frame (no modo pipelined, enquanto o frame anterior é apresentado)
+        outcome = renderer.run(step, dt)
+        if outcome is not None:
+            return outcome
+        VOICES.end_frame()
+        MUSIC.update()
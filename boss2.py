@@ -4,14 +4,18 @@ import sys
 import math
 import pygame
 
-from player import PlayerSimple, SimpleBullet
+from player import PlayerSimple, SimpleBullet, PLAYER_IMAGE_PATH, WALK_FRAMES_P1, WALK_FRAMES_P2, player_manifest
 from utils import show_quadrinhos_sequence
+from audio import VOICES, MUSIC
+from render import stage_renderer, RenderQueue, RotationSet, LAYER_EFFECTS, rect_stamp
+from assets import REGISTRY, SCOPE_STAGE, SCOPE_SESSION, image_spec, atlas_spec
+from quality import QUALITY
+from timestep import FixedTimestep, lerp
 from config import (
-    POST_BOSS2_QUADRINHOS,
     TUTORIAL_PATHS,
-    QUADRINHO_DURATION_MS,
     JOYSTICK_TUTORIAL_BUTTON_B,
     BOSS_HAND_BULLET_SPEED,
+    ARENA_FPS,
 )
 
 
@@ -28,15 +32,19 @@ class Boss2:
       - screen_w (int): largura da tela/arena (usado para limites de patrulha).
       - screen_h (int): altura da tela/arena (usado para tamanho dos lasers).
       - image_path (str|None): caminho para a imagem do chefe (opcional).
-      - bullet_image_path (str|None): caminho para imagem de bala (não obrigatório; mantido para compatibilidade).
+      - bullet_image_path (str|None): caminho para a arte dos projéteis das mãos (opcional). A arte
+          aponta para a direita e é pré-rotacionada no carregamento (render.RotationSet); sem ela
+          os projéteis são círculos verdes.
 
     Atributos principais (resumido):
-      - rect (pygame.Rect): posição e tamanho do chefe.
+      - rect (pygame.Rect): posição e tamanho do chefe (usado nas colisões).
+      - x (float): posição horizontal sub-pixel (rect.x é a versão arredondada).
       - hand_offsets (list[int]): offsets em x para as "mãos".
       - hand_bullet_cooldowns / _time_since_last_bullet: controle de cadência de tiro das mãos.
       - hand_laser_cooldowns / _time_since_last_laser: controle de cadência de lasers.
       - laser_width, laser_height, laser_duration, laser_damage_per_second: parâmetros do laser.
       - max_health / health: vida do chefe.
+      - bullet_sprite (render.RotationSet|None): rotações da arte dos projéteis das mãos.
 
     Métodos públicos:
       - update(dt)
@@ -60,25 +68,47 @@ class Boss2:
                          {'offset': int, 'w': int, 'h': int, 'time': float}
                          (o tempo inicial é 0.0; quem chamou gerencia incremento/remoção).
 
-      - draw(surface)
-          Desenha a imagem do chefe (se existir) e a barra de vida.
+      - position(alpha=1.0)
+          Canto superior esquerdo do desenho, interpolado entre os dois últimos passos.
+
+      - draw(surface, alpha=1.0)
+          Desenha a imagem do chefe (se existir) e a barra de vida na posição interpolada.
           Parâmetros:
             surface (pygame.Surface): superfície onde desenhar.
-          Retorno: None
+            alpha (float): fração entre o passo anterior e o atual (ver timestep.py).
+          Retorno: pygame.Rect com a área desenhada
     """
     def __init__(self, x, y, screen_w, screen_h, image_path=None, bullet_image_path=None):
         self.screen_w = screen_w
         self.screen_h = screen_h
         self.image = None
-        if image_path and os.path.exists(image_path):
-            img = pygame.image.load(image_path).convert_alpha()
-            target_h = int(screen_h * 0.35)
-            scale = target_h / img.get_height()
-            self.image = pygame.transform.rotozoom(img, 0, scale)
+        if image_path:
+            # sprite escalado para ~35% da altura da tela: view do atlas da fase
+            # (boss2_atlas_spec); outros caminhos viram imagens avulsas no registro
+            sprites = REGISTRY.request(boss2_atlas_spec(screen_h))
+            self.image = sprites.find(image_path) if sprites is not None else None
+            if self.image is None:
+                self.image = REGISTRY.image(image_path, height=int(screen_h * 0.35), scope=SCOPE_STAGE)
+
+        # arte dos projéteis das mãos, já girada em ROTATION_BUCKETS ângulos: cada tiro só
+        # escolhe a rotação mais próxima da direção do jogador mirado
+        self.bullet_sprite = None
+        if bullet_image_path:
+            sprites = REGISTRY.request(boss2_atlas_spec(screen_h))
+            bullet_image = sprites.find(bullet_image_path) if sprites is not None else None
+            if bullet_image is None:
+                bullet_image = REGISTRY.image(bullet_image_path, size=_bullet_size(screen_h), keep_aspect=True,
+                                              scope=SCOPE_STAGE)
+            if bullet_image is not None:
+                self.bullet_sprite = RotationSet(bullet_image)
 
         self.w = self.image.get_width() if self.image else 200
         self.h = self.image.get_height() if self.image else 150
         self.rect = pygame.Rect(x, y, self.w, self.h)
+        self.x = float(x)
+        self._y_offset = 0.0
+        # (x, _y_offset) do passo anterior, para a interpolação do desenho
+        self._prev = (self.x, self._y_offset)
 
         self.speed = 140.0
         self.direction = 1
@@ -118,19 +148,21 @@ class Boss2:
 
         Retorno: None
         """
+        self._prev = (self.x, self._y_offset)
         self._time += dt
         for i in range(len(self._time_since_last_bullet)):
             self._time_since_last_bullet[i] += dt
         for i in range(len(self._time_since_last_laser)):
             self._time_since_last_laser[i] += dt
 
-        self.rect.x += int(self.direction * self.speed * dt)
-        if self.rect.x < self.patrol_min_x:
-            self.rect.x = self.patrol_min_x
+        self.x += self.direction * self.speed * dt
+        if self.x < self.patrol_min_x:
+            self.x = float(self.patrol_min_x)
             self.direction = 1
-        elif self.rect.x > self.patrol_max_x:
-            self.rect.x = self.patrol_max_x
+        elif self.x > self.patrol_max_x:
+            self.x = float(self.patrol_max_x)
             self.direction = -1
+        self.rect.x = round(self.x)
 
         self._y_offset = math.sin(2 * math.pi * self.bob_frequency * self._time) * self.bob_amplitude
 
@@ -176,7 +208,8 @@ class Boss2:
             dx, dy = best
             l = math.hypot(dx, dy) or 1.0
             # usar velocidade configurável via BOSS_HAND_BULLET_SPEED
-            b = SimpleBullet(spawn_x, spawn_y, dx / l, dy / l, speed=BOSS_HAND_BULLET_SPEED, color=(0, 255, 60), radius=8)
+            b = SimpleBullet(spawn_x, spawn_y, dx / l, dy / l, speed=BOSS_HAND_BULLET_SPEED, color=(0, 255, 60), radius=8,
+                             sprite=self.bullet_sprite if QUALITY.get('bullet_sprites') else None)
             bullets.append(b)
             self._time_since_last_bullet[i] = 0.0
         return bullets
@@ -208,21 +241,82 @@ class Boss2:
             self._time_since_last_laser[i] = 0.0
         return lasers
 
-    def draw(self, surface):
+    def position(self, alpha=1.0):
+        """
+        Canto superior esquerdo da imagem do chefe (com o bob vertical), interpolado entre o
+        passo de simulação anterior (alpha 0.0) e o atual (alpha 1.0) — ver timestep.py.
+        Os lasers saem da base dessa posição.
+
+        Retorno: tupla (x, y) em pixels inteiros.
+        """
+        x = lerp(self._prev[0], self.x, alpha)
+        y_offset = lerp(self._prev[1], self._y_offset, alpha)
+        return round(x), int(self.rect.y + y_offset)
+
+    def draw(self, surface, alpha=1.0):
         """
         Desenha o chefe (imagem se disponível) e sua barra de vida.
 
         Parâmetros:
           - surface (pygame.Surface): superfície onde desenhar.
+          - alpha (float): fração entre o passo anterior e o atual (ver position).
 
-        Retorno: None
+        Retorno: pygame.Rect com a área desenhada (imagem + barra de vida).
         """
-        draw_y = int(self.rect.y + getattr(self, '_y_offset', 0))
+        x, draw_y = self.position(alpha)
+        drawn = pygame.Rect(x, draw_y - 12, self.w, 8)
         if self.image:
-            surface.blit(self.image, (self.rect.x, draw_y))
-        pygame.draw.rect(surface, (80, 80, 80), (self.rect.x, draw_y - 12, self.w, 8))
+            drawn.union_ip(surface.blit(self.image, (x, draw_y)))
+        surface.fill((80, 80, 80), (x, draw_y - 12, self.w, 8))
         hp_ratio = max(0.0, self.health / self.max_health)
-        pygame.draw.rect(surface, (200, 20, 20), (self.rect.x, draw_y - 12, int(self.w * hp_ratio), 8))
+        surface.fill((200, 20, 20), (x, draw_y - 12, int(self.w * hp_ratio), 8))
+        return drawn
+
+
+BOSS2_BACKGROUND_PATH = os.path.join('assets', 'img', 'fundo_boss.png')
+BOSS2_IMAGE_PATH = os.path.join('assets', 'img', 'nave boss.png')
+BOSS2_BULLET_IMAGE_PATH = os.path.join('assets', 'img', 'tiro1.png')
+
+
+def _bullet_size(H):
+    # caixa em que a arte do projétil é encaixada (mantendo a proporção): ~6% da altura da tela
+    side = int(H * 0.06)
+    return (side, side)
+
+
+def boss2_atlas_spec(H):
+    """
+    Atlas de sprites do estágio Boss2 (ver atlas.py): 'boss' escalado para ~35% da altura da tela
+    e 'bala' (arte dos projéteis das mãos).
+
+    Parâmetros:
+      H (int): altura da tela.
+
+    Retorno:
+      spec (ver assets.atlas_spec).
+    """
+    return atlas_spec('boss2', {
+        'boss': [image_spec(BOSS2_IMAGE_PATH, height=int(H * 0.35))],
+        'bala': [image_spec(BOSS2_BULLET_IMAGE_PATH, size=_bullet_size(H), keep_aspect=True)],
+    })
+
+
+def boss2_manifest(W, H):
+    """
+    Manifesto de assets do estágio Boss2 (fundo, sprite da nave e assets dos jogadores).
+
+    Parâmetros:
+      - W (int), H (int): dimensões da tela — definem os tamanhos destino das imagens.
+
+    Retorno:
+      - dict nome -> spec (ver assets.image_spec / assets.sound_spec / assets.atlas_spec).
+    """
+    manifest = {
+        'fundo': image_spec(BOSS2_BACKGROUND_PATH, size=(W, H), mode='opaque'),
+        'boss': boss2_atlas_spec(H),
+    }
+    manifest.update(player_manifest(H))
+    return manifest
 
 
 def run_boss2(screen, clock, W, H):
@@ -252,43 +346,35 @@ def run_boss2(screen, clock, W, H):
           True  -> chefe derrotado (fase vencida)
           False -> fase abortada (ESC) ou ambos os jogadores mortos
     """
-    fundo_path = os.path.join('assets', 'img', 'fundo_boss.png')
-    fundo_image = None
-    if os.path.exists(fundo_path):
-        fundo_image = pygame.image.load(fundo_path).convert()
-        fundo_image = pygame.transform.smoothscale(fundo_image, (W, H))
-
-    # música do chefe (opcional)
-    boss2_music_path = os.path.join('assets', 'sounds', 'som4.mp3')
-    if os.path.exists(boss2_music_path):
-        try:
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.fadeout(400)
-            pygame.mixer.music.load(boss2_music_path)
-            pygame.mixer.music.set_volume(0.18)
-            pygame.mixer.music.play(-1)
-        except Exception:
-            pass
-
-    # carregar frames de caminhada (se existirem)
-    walk_frames_p1 = [os.path.join('assets', 'img', f'andar_{i}.png') for i in range(4)]
-    walk_frames_p2 = [os.path.join('assets', 'img', f'andarv_{i}.png') for i in range(4)]
+    assets = REGISTRY.load(boss2_manifest(W, H))
+    fundo_image = assets['fundo']
+    # apresentação com retângulos sujos ou pelo renderer SDL2, conforme config.RENDER_BACKEND
+    # (ver render.stage_renderer); sem imagem, o fundo é a cor sólida. Tudo é desenhado em canvas.
+    renderer = stage_renderer(screen, fundo_image or (0, 0, 0))
+    canvas = renderer.target
+    # lasers e projéteis vão para a fila e são desenhados numa única chamada Surface.blits
+    queue = RenderQueue()
+
+    # música do chefe (crossfade com a anterior; sem o arquivo, a anterior sai em fade-out)
+    MUSIC.play('boss2')
+
+    # frames de caminhada (se existirem) — já carregados pelo manifesto
 
     player1 = PlayerSimple(
         W // 4, H, H,
-        image_path=os.path.join('assets', 'img', 'astronauta1.png'),
-        walk_frames_paths=walk_frames_p1,
+        image_path=PLAYER_IMAGE_PATH,
+        walk_frames_paths=WALK_FRAMES_P1,
         walk_frame_interval=0.10
     )
     player2 = PlayerSimple(
         3 * W // 4, H, H,
-        image_path=os.path.join('assets', 'img', 'astronauta1.png'),
-        walk_frames_paths=walk_frames_p2,
+        image_path=PLAYER_IMAGE_PATH,
+        walk_frames_paths=WALK_FRAMES_P2,
         walk_frame_interval=0.10
     )
 
-    boss = Boss2(W // 4, 80, W, H, image_path=os.path.join('assets', 'img', 'nave boss.png'),
-                 bullet_image_path=os.path.join('assets', 'img', 'bala.png'))
+    boss = Boss2(W // 4, 80, W, H, image_path=BOSS2_IMAGE_PATH,
+                 bullet_image_path=BOSS2_BULLET_IMAGE_PATH)
 
     bullets = []       # projéteis disparados pelos jogadores
     boss_bullets = []  # projéteis disparados pelas mãos do chefe
@@ -304,8 +390,135 @@ def run_boss2(screen, clock, W, H):
     trigger_prev = [False] * len(joysticks)
     TRIGGER_THRESHOLD = 0.5
 
+    # lógica em passos fixos de timestep.dt; o desenho interpola entre os dois últimos passos
+    timestep = FixedTimestep()
+
+    def simulate(dt):
+        """
+        Um passo fixo da simulação: atualiza as entidades e aplica colisões e dano.
+        Retorna True/False se o estágio terminou (ver acima), senão None.
+        """
+        nonlocal bullets, boss_bullets
+        # atualizações das entidades
+        player1.update(dt, W)
+        player2.update(dt, W)
+        boss.update(dt)
+
+        # boss mira e dispara das mãos (projéteis direcionados)
+        player_centers = [p.rect.center for p in (player1, player2) if p.health > 0]
+        if player_centers:
+            new_bullets = boss.try_shoot_hands_at_players(player_centers)
+            if new_bullets:
+                boss_bullets.extend(new_bullets)
+
+        # lasers (o método só inicia; aqui setamos tempo inicial e adicionamos à lista)
+        new_lasers = boss.try_fire_lasers()
+        for l in new_lasers:
+            l['time'] = 0.0
+            boss_lasers.append(l)
+
+        # atualizar listas e movimento dos projéteis
+        bullets = [b for b in bullets if b.alive]
+        boss_bullets = [b for b in boss_bullets if b.alive]
+
+        for b in bullets:
+            b.update(dt)
+
+        for b in boss_bullets:
+            b.update(dt)
+
+        # atualizar tempo dos lasers e remover os expirados
+        for l in boss_lasers[:]:
+            l['time'] += dt
+            if l['time'] >= boss.laser_duration:
+                boss_lasers.remove(l)
+
+        # colisões: balas dos jogadores atingindo o chefe
+        for b in bullets[:]:
+            if b.collides_rect(boss.rect):
+                boss.health -= 1
+                b.alive = False
+                if b in bullets:
+                    bullets.remove(b)
+
+        # colisões: balas do chefe atingindo jogadores
+        for b in boss_bullets[:]:
+            for p in (player1, player2):
+                if p.health > 0 and b.collides_rect(p.rect):
+                    if p.take_damage(1):
+                        b.alive = False
+                        if b in boss_bullets:
+                            boss_bullets.remove(b)
+                        break
+
+        # lasers: dano contínuo por segundo enquanto o jogador estiver dentro do retângulo do laser
+        for l in boss_lasers:
+            draw_y = int(boss.rect.y + getattr(boss, '_y_offset', 0))
+            x = int(boss.rect.x + l['offset'])
+            y = draw_y + boss.h
+            laser_rect = pygame.Rect(x, y, l['w'], l['h'])
+            for p in (player1, player2):
+                if p.health > 0 and laser_rect.colliderect(p.rect):
+                    dmg = boss.laser_damage_per_second * dt
+                    p.health = max(0.0, p.health - dmg)
+                    if p.health <= 0:
+                        p.dead = True
+
+        # verificar condições de término do estágio
+        if boss.health <= 0:
+            # a música segue nos quadrinhos e faz crossfade com a da próxima fase
+            return True
+
+        if not any((not p.dead and p.health > 0) for p in (player1, player2)):
+            MUSIC.stop(600)
+            return False
+
+    def draw_scene(alpha):
+        """Desenha a cena em canvas, com as posições interpoladas por alpha (ver timestep.py)."""
+        # o renderer restaura o fundo só onde houve desenho no frame anterior
+        renderer.begin()
+        renderer.add(boss.draw(canvas, alpha))
+
+        # desenhar lasers (overlay semi-transparente; a surface de cada tamanho é criada uma vez)
+        boss_x, boss_y = boss.position(alpha)
+        for l in boss_lasers:
+            x = boss_x + l['offset']
+            y = boss_y + boss.h
+            color = (255, 80, 80, 160) if QUALITY.get('translucent') else (190, 60, 60)
+            queue.submit(rect_stamp((l['w'], l['h']), color), (x, y), LAYER_EFFECTS)
+
+        # desenhar projéteis e jogadores
+        for b in bullets:
+            b.submit(queue, alpha)
+        for b in boss_bullets:
+            b.submit(queue, alpha)
+        renderer.add(queue.flush(canvas))
+
+        renderer.add(player1.draw(canvas, alpha))
+        renderer.add(player2.draw(canvas, alpha))
+
+        renderer.present()
+
+    def step(frame_dt):
+        """
+        Um frame da arena depois dos eventos: os passos fixos que couberem em frame_dt e o
+        desenho da cena. Retorna True/False se o estágio terminou, senão None.
+        Roda na thread de simulação no modo pipelined (ver pipeline.py).
+        """
+        for _ in range(timestep.advance(frame_dt)):
+            outcome = simulate(timestep.dt)
+            if outcome is not None:
+                return outcome
+        draw_scene(timestep.alpha)
+
+    # média de tempo de frame só desta arena (ver quality.QualityGovernor)
+    QUALITY.begin()
+    # começa a simulação do zero: o primeiro dt não inclui o tempo de carregamento
+    timestep.reset()
+    clock.tick()
     while True:
-        dt = clock.tick(60) / 1000.0
+        dt = clock.tick(ARENA_FPS) / 1000.0
+        QUALITY.frame(clock.get_rawtime())
 
         for ev in pygame.event.get():
             if ev.type == pygame.QUIT:
@@ -314,7 +527,7 @@ def run_boss2(screen, clock, W, H):
             if ev.type == pygame.KEYDOWN:
                 # ESC cancela e retorna False
                 if ev.key == pygame.K_ESCAPE:
-                    pygame.mixer.music.fadeout(400)
+                    MUSIC.stop(400)
                     return False
                 # salto teclado
                 if ev.key == pygame.K_w:
@@ -349,7 +562,14 @@ def run_boss2(screen, clock, W, H):
                         player2.try_jump()
                 # B para tutorial (mostra quadrinhos)
                 if ev.button == JOYSTICK_TUTORIAL_BUTTON_B:
-                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000)
+                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000, scope=SCOPE_SESSION)
+                    renderer.invalidate()
+                    # o tempo parado no tutorial não é tempo de frame: recomeça a medição do
+                    # relógio e a janela do governador (senão uma amostra de segundos rebaixa a qualidade)
+                    clock.tick()
+                    QUALITY.begin()
+                    # e a simulação continua de onde parou, sem passos de recuperação
+                    timestep.reset()
 
         # leitura contínua dos joysticks: movimento, mira e gatilho (rising-edge)
         for i, j in enumerate(joysticks):
@@ -399,105 +619,9 @@ def run_boss2(screen, clock, W, H):
 
             trigger_prev[i] = pressed_now
 
-        # atualizações das entidades
-        player1.update(dt, W)
-        player2.update(dt, W)
-        boss.update(dt)
-
-        # boss mira e dispara das mãos (projéteis direcionados)
-        player_centers = [p.rect.center for p in (player1, player2) if p.health > 0]
-        if player_centers:
-            new_bullets = boss.try_shoot_hands_at_players(player_centers)
-            if new_bullets:
-                boss_bullets.extend(new_bullets)
-
-        # lasers (o método só inicia; aqui setamos tempo inicial e adicionamos à lista)
-        new_lasers = boss.try_fire_lasers()
-        for l in new_lasers:
-            l['time'] = 0.0
-            boss_lasers.append(l)
-
-        # atualizar listas e movimento dos projéteis
-        bullets = [b for b in bullets if b.alive]
-        boss_bullets = [b for b in boss_bullets if b.alive]
-
-        for b in bullets:
-            b.update(dt)
-
-        for b in boss_bullets:
-            b.update(dt)
-
-        # atualizar tempo dos lasers e remover os expirados
-        for l in boss_lasers[:]:
-            l['time'] += dt
-            if l['time'] >= boss.laser_duration:
-                boss_lasers.remove(l)
-
-        # colisões: balas dos jogadores atingindo o chefe
-        for b in bullets[:]:
-            if b.collides_rect(boss.rect):
-                boss.health -= 1
-                b.alive = False
-                if b in bullets:
-                    bullets.remove(b)
-
-        # colisões: balas do chefe atingindo jogadores
-        for b in boss_bullets[:]:
-            for p in (player1, player2):
-                if p.health > 0 and b.collides_rect(p.rect):
-                    if p.take_damage(1):
-                        b.alive = False
-                        if b in boss_bullets:
-                            boss_bullets.remove(b)
-                        break
-
-        # lasers: dano contínuo por segundo enquanto o jogador estiver dentro do retângulo do laser
-        for l in boss_lasers:
-            draw_y = int(boss.rect.y + getattr(boss, '_y_offset', 0))
-            x = int(boss.rect.x + l['offset'])
-            y = draw_y + boss.h
-            laser_rect = pygame.Rect(x, y, l['w'], l['h'])
-            for p in (player1, player2):
-                if p.health > 0 and laser_rect.colliderect(p.rect):
-                    dmg = boss.laser_damage_per_second * dt
-                    p.health = max(0.0, p.health - dmg)
-                    if p.health <= 0:
-                        p.dead = True
-
-        # verificar condições de término do estágio
-        if boss.health <= 0:
-            pygame.mixer.music.fadeout(600)
-            show_quadrinhos_sequence(screen, clock, W, H, POST_BOSS2_QUADRINHOS, duration_ms=QUADRINHO_DURATION_MS)
-            return True
-
-        if not any((not p.dead and p.health > 0) for p in (player1, player2)):
-            pygame.mixer.music.fadeout(600)
-            return False
-
-        # desenho da cena
-        if fundo_image:
-            screen.blit(fundo_image, (0, 0))
-        else:
-            screen.fill((0, 0, 0))
-
-        boss.draw(screen)
-
-        # desenhar lasers (overlay semi-transparente)
-        for l in boss_lasers:
-            draw_y = int(boss.rect.y + getattr(boss, '_y_offset', 0))
-            x = int(boss.rect.x + l['offset'])
-            y = draw_y + boss.h
-            surf = pygame.Surface((l['w'], l['h']), pygame.SRCALPHA)
-            surf.fill((255, 80, 80, 160))
-            screen.blit(surf, (x, y))
-
-        # desenhar projéteis e jogadores
-        for b in bullets:
-            b.draw(screen)
-        for b in boss_bullets:
-            b.draw(screen)
-
-        player1.draw(screen)
-        player2.draw(screen)
-
-        pygame.display.flip()
+        # simulação e desenho do frame (no modo pipelined, enquanto o frame anterior é apresentado)
+        outcome = renderer.run(step, dt)
+        if outcome is not None:
+            return outcome
+        VOICES.end_frame()
+        MUSIC.update()
@@ -1,21 +1,88 @@
 # campaign.py
+import sys
+import time
 import pygame
 
-from utils import show_quadrinhos_sequence
-from config import INTRO_QUADRINHOS, QUADRINHO_DURATION_MS
-from boss1 import run_boss1
-from boss2 import run_boss2
-from faroeste import run_faroeste
+from utils import show_quadrinhos_sequence, quadrinhos_manifest
+from config import (
+    INTRO_QUADRINHOS,
+    POST_BOSS1_QUADRINHO,
+    POST_BOSS2_QUADRINHOS,
+    TUTORIAL_PATHS,
+    QUADRINHO_DURATION_MS,
+)
+from boss1 import run_boss1, boss1_manifest
+from boss2 import run_boss2, boss2_manifest
+from faroeste import run_faroeste, faroeste_manifest
+from menu import menu_manifest
+from assets import REGISTRY, SCOPE_STAGE, SCOPE_CAMPAIGN, SCOPE_SESSION
+from audio import MUSIC
 
 
-def campaign(screen, clock, W, H, player_names):
+def campaign_stages(W, H):
+    """
+    Pipeline de fases da campanha. Cada fase declara de antemão o seu manifesto de assets
+    e a sequência de quadrinhos exibida antes dela — é durante esses quadrinhos que a
+    campanha pré-carrega (em segundo plano) o manifesto da fase.
+
+    Retorno:
+      list[dict] -> uma entrada por fase, na ordem de execução:
+        - 'name': nome da fase (str), usado no relatório de prefetch;
+        - 'cutscene': lista de quadrinhos exibidos antes da fase;
+        - 'esc_aborts': True se ESC nos quadrinhos cancela a campanha (só na introdução);
+        - 'manifest': dict nome -> spec (ver assets.image_spec / assets.sound_spec);
+        - 'music': trilha da fase (chave de config.MUSIC_TRACKS), decodificada junto;
+        - 'run': função run_xxx(screen, clock, W, H) da fase.
+    """
+    return [
+        {'name': 'boss1', 'cutscene': INTRO_QUADRINHOS, 'esc_aborts': True,
+         'manifest': boss1_manifest(W, H), 'music': 'boss1', 'run': run_boss1},
+        {'name': 'boss2', 'cutscene': [POST_BOSS1_QUADRINHO], 'esc_aborts': False,
+         'manifest': boss2_manifest(W, H), 'music': 'boss2', 'run': run_boss2},
+        {'name': 'faroeste', 'cutscene': POST_BOSS2_QUADRINHOS, 'esc_aborts': False,
+         'manifest': faroeste_manifest(W, H), 'music': 'faroeste', 'run': run_faroeste},
+    ]
+
+
+def campaign_manifests(W, H):
+    """
+    Lista todos os manifestos de assets do jogo para a resolução W x H, na ordem em que
+    são usados (menu, quadrinhos, fases). Usado pelo passo de bake (bakecache.py).
+
+    Retorno:
+      list[dict] -> manifestos (dict nome -> spec).
+    """
+    manifests = [
+        menu_manifest(W, H),
+        quadrinhos_manifest(W, H, TUTORIAL_PATHS, scope=SCOPE_SESSION),
+    ]
+    for stage in campaign_stages(W, H):
+        manifests.append(quadrinhos_manifest(W, H, stage['cutscene']))
+        manifests.append(stage['manifest'])
+    return manifests
+
+
+def report_prefetch(report):
+    """
+    Hook padrão de instrumentação do prefetch: avisa em stderr quando uma fase teve de
+    esperar pelos próprios assets (o prefetch não terminou durante os quadrinhos).
+
+    Parâmetros:
+      - report (dict): {'stage': str, 'assets': int, 'ready': bool, 'wait_ms': float}
+    """
+    if not report['ready']:
+        print(f"prefetch da fase {report['stage']} incompleto: "
+              f"{report['wait_ms']:.1f} ms de espera ({report['assets']} assets)", file=sys.stderr)
+
+
+def campaign(screen, clock, W, H, player_names, on_prefetch=report_prefetch):
     """
     Orquestra a sequência de fases da campanha do jogo.
 
     Fluxo:
       1. Exibe os quadrinhos/intro (INTRO_QUADRINHOS).
-      2. Executa o estágio Boss 1 (run_boss1).
-      3. Executa o estágio Boss 2 (run_boss2).
+      2. Executa o estágio Boss 1 (run_boss1) e exibe POST_BOSS1_QUADRINHO.
+      3. Executa o estágio Boss 2 (run_boss2) e exibe POST_BOSS2_QUADRINHOS.
       4. Executa o duelo final (run_faroeste).
       5. Mede o tempo total decorrido entre o início (após os quadrinhos) e o fim do duelo.
 
@@ -32,6 +99,12 @@ def campaign(screen, clock, W, H, player_names):
           Tupla/lista com os nomes dos jogadores, e.g. ("Nome1", "Nome2").
           Observação: neste módulo os nomes apenas são recebidos para compatibilidade/possível uso
           downstream — as funções individuais de fase não dependem diretamente deles aqui.
+      - on_prefetch (callable|None):
+          Hook chamado antes de cada fase com um relatório do prefetch:
+          {'stage': nome, 'assets': quantidade, 'ready': bool, 'wait_ms': float}.
+          'ready' é True quando o manifesto terminou de carregar durante os quadrinhos
+          (transição sem espera); 'wait_ms' é o tempo que a fase ainda esperou.
+          Padrão: report_prefetch (avisa em stderr quando houve espera). None desliga.
 
     Retorno:
       tuple (completed_bool, winner_id, elapsed_seconds)
@@ -56,42 +129,70 @@ def campaign(screen, clock, W, H, player_names):
       - Se o duelo final (run_faroeste) retornar None significa cancelamento durante o duelo;
         a função então retorna (False, None, elapsed_seconds) onde elapsed_seconds é o tempo
         acumulado até o cancelamento.
+      - Pipeline de fases (campaign_stages): enquanto os quadrinhos que antecedem uma fase
+        estão na tela, o manifesto dela é decodificado em segundo plano, então a fase
+        começa sem tela de carregamento.
+      - Tempo de vida dos assets: ao fim de cada fase os assets de escopo SCOPE_STAGE são
+        liberados do registro (assets.REGISTRY); os de SCOPE_CAMPAIGN (sprites dos jogadores,
+        som de tiro) ficam residentes entre as fases e são liberados quando a campanha termina.
+    """
+    try:
+        return _run_campaign(screen, clock, W, H, on_prefetch)
+    finally:
+        REGISTRY.release_scope(SCOPE_STAGE)
+        REGISTRY.release_scope(SCOPE_CAMPAIGN)
+
+
+def _run_campaign(screen, clock, W, H, on_prefetch):
     """
-    # Mostra os quadrinhos iniciais e permite pular/voltar com ESC.
-    ok = show_quadrinhos_sequence(screen, clock, W, H, INTRO_QUADRINHOS, duration_ms=QUADRINHO_DURATION_MS)
-    if not ok:
-        # jogador cancelou durante os quadrinhos
-        return (False, None, 0.0)
-
-    # marca início do tempo da campanha (após os quadrinhos)
-    start_ticks = pygame.time.get_ticks()
-
-    # Fase 1 - Boss 1
-    # run_boss1(screen, clock, W, H) -> bool (True se fase vencida, False se abortada/derrota)
-    res1 = run_boss1(screen, clock, W, H)
-    if not res1:
-        # abortado ou derrota na fase 1
-        return (False, None, 0.0)
-
-    # Fase 2 - Boss 2
-    # run_boss2(screen, clock, W, H) -> bool (True se fase vencida, False se abortada/derrota)
-    res2 = run_boss2(screen, clock, W, H)
-    if not res2:
-        # abortado ou derrota na fase 2
-        return (False, None, 0.0)
-
-    # Fase final - duelo faroeste
-    # run_faroeste(screen, clock, W, H) -> 1 | 2 | 0 | None
-    #   1 -> player1 venceu, 2 -> player2 venceu, 0 -> empate, None -> cancelado (ESC)
-    winner_final = run_faroeste(screen, clock, W, H)
-
-    # registra fim e calcula tempo decorrido (mesmo se winner_final for None -> cancelado durante duelo)
+    Executa as fases em sequência (ver campaign). Libera os assets de fase entre uma fase e
+    outra e pré-carrega a próxima durante os quadrinhos que a antecedem.
+    """
+    stages = campaign_stages(W, H)
+    start_ticks = None
+    result = None
+
+    for stage in stages:
+        # Quadrinhos antes da fase; o manifesto e a trilha da fase carregam em segundo plano enquanto isso.
+        MUSIC.preload(stage['music'])
+        ok = show_quadrinhos_sequence(screen, clock, W, H, stage['cutscene'], duration_ms=QUADRINHO_DURATION_MS,
+                                      prefetch=stage['manifest'])
+        if not ok and stage['esc_aborts']:
+            # jogador cancelou durante os quadrinhos iniciais
+            return (False, None, 0.0)
+
+        if start_ticks is None:
+            # marca início do tempo da campanha (após os quadrinhos iniciais)
+            start_ticks = pygame.time.get_ticks()
+
+        # Garante o manifesto completo antes de entrar na fase e mede quanto ainda faltava.
+        ready = REGISTRY.ready(stage['manifest'])
+        t0 = time.perf_counter()
+        REGISTRY.load(stage['manifest'])
+        if on_prefetch is not None:
+            on_prefetch({
+                'stage': stage['name'],
+                'assets': len(stage['manifest']),
+                'ready': ready,
+                'wait_ms': (time.perf_counter() - t0) * 1000.0,
+            })
+
+        # run_boss1 / run_boss2 -> bool (True se fase vencida, False se abortada/derrota)
+        # run_faroeste -> 1 | 2 | 0 | None
+        #   1 -> player1 venceu, 2 -> player2 venceu, 0 -> empate, None -> cancelado (ESC)
+        result = stage['run'](screen, clock, W, H)
+        REGISTRY.release_scope(SCOPE_STAGE)
+        if stage is not stages[-1] and not result:
+            # abortado ou derrota numa fase de chefe
+            return (False, None, 0.0)
+
+    # registra fim e calcula tempo decorrido (mesmo se o duelo foi cancelado)
     end_ticks = pygame.time.get_ticks()
     elapsed = (end_ticks - start_ticks) / 1000.0
 
-    if winner_final is None:
+    if result is None:
         # cancelado no duelo final: campanha não é considerada "completada"
         return (False, None, elapsed)
 
     # campanha completada com resultado do duelo final
-    return (True, winner_final, elapsed)
+    return (True, result, elapsed)
@@ -1,6 +1,6 @@
 # config.py
 import datetime
-from os import path
+from os import path, cpu_count
 
 """
 Arquivo de configuração global do jogo.
@@ -45,6 +45,10 @@ TUTORIAL_PATHS = [
 # Duração padrão de exibição de cada "quadrinho" (em milissegundos)
 QUADRINHO_DURATION_MS = 10000
 
+# Quantos quadrinhos à frente são decodificados em segundo plano enquanto o atual é exibido.
+# Cada quadrinho já exibido é descartado, então no máximo (lookahead + 1) ficam na memória.
+QUADRINHO_LOOKAHEAD = 1
+
 
 # ===============================
 # Controles de joystick e mouse
@@ -72,6 +76,191 @@ MAX_RANKING = 10               # quantidade máxima de registros armazenados
 # Velocidade das balas disparadas pelas mãos do Boss 2 (pode ser ajustada para balanceamento)
 BOSS_HAND_BULLET_SPEED = 500.0
 
+# Simulação das arenas em passo fixo (ver timestep.FixedTimestep): a lógica dos chefes,
+# jogadores e projéteis roda SIM_HZ vezes por segundo, não importa o FPS do desenho; o
+# desenho interpola as posições entre os dois últimos passos.
+SIM_HZ = 60
+
+# Máximo de passos de simulação por frame. Depois de um travamento (carregamento, janela
+# arrastada) o tempo além disso é descartado, em vez de a simulação tentar alcançá-lo e
+# deixar cada frame ainda mais lento ("espiral da morte").
+SIM_MAX_STEPS = 5
+
+# Limite de FPS do desenho nas arenas (0 = sem limite). Em monitores de 120/144 Hz use a
+# taxa do monitor: a simulação continua em SIM_HZ e o movimento sai suave pela interpolação.
+ARENA_FPS = 60
+
+
+# ===============================
+# Renderização
+# ===============================
+
+# Resolução lógica fixa: todas as telas desenham numa surface deste tamanho e o display
+# escala o quadro inteiro uma vez por frame (pygame.SCALED) para a tela real. Numa
+# monitor 4K isso evita preencher 4x mais pixels que em 1080p sem ganho visual.
+# As coordenadas do mouse chegam já convertidas para a resolução lógica.
+# None = desenhar direto na resolução nativa do monitor (comportamento antigo).
+RENDER_LOGICAL_SIZE = (1920, 1080)
+
+# Filtro da ampliação final: True = linear (suave), False = vizinho mais próximo (pixelado)
+RENDER_SMOOTH_UPSCALE = True
+
+# Backend de desenho das arenas dos chefes (ver render.stage_renderer):
+#   - 'surface':  blits de CPU na surface do display + retângulos sujos (render.DirtyRenderer);
+#   - 'renderer': sprites como texturas e cópias do renderer SDL2 (texrender.TextureRenderer).
+#                 Exige o modo de resolução lógica (RENDER_LOGICAL_SIZE); sem ele cai para 'surface'.
+# Também pode ser escolhido ao abrir o jogo: python main.py --backend renderer
+RENDER_BACKEND = 'surface'
+
+# Driver do renderer SDL (dica SDL_RENDER_DRIVER): None = o SDL escolhe; 'software' força o
+# renderer de software (máquinas sem GPU); 'opengl', 'opengles2'... conforme a plataforma
+RENDER_DRIVER = None
+
+# Arenas dos chefes em modo pipelined (ver pipeline.py): a simulação do próximo frame roda
+# numa thread enquanto o frame atual é apresentado, com um frame a mais de latência. Só
+# compensa com mais de um núcleo. Também pode ser ligado ao abrir o jogo: python main.py --pipelined
+RENDER_PIPELINED = False
+
+# Máximo de texturas guardadas pelo backend 'renderer' (uma por sprite/carimbo/linha de texto)
+TEXTURE_CACHE_MAX_ENTRIES = 512
+
+# Arenas dos chefes: redesenhar/enviar só as áreas que mudaram (retângulos sujos, ver
+# render.DirtyRenderer). False = fundo inteiro + display.flip() a cada frame.
+RENDER_DIRTY_RECTS = True
+
+# Acima desta fração da tela suja num frame, volta para o flip completo
+DIRTY_RECT_MAX_FRACTION = 0.5
+
+# ... ou acima desta quantidade de retângulos (muitos projéteis pequenos: juntar e enviar
+# cada um custa mais que o quadro inteiro)
+DIRTY_RECT_MAX_COUNT = 256
+
+# Projéteis com sprite: quantas rotações pré-renderizadas por imagem (ver render.RotationSet).
+# O projétil usa a mais próxima da sua direção: 64 = passos de 5,6 graus.
+ROTATION_BUCKETS = 64
+
+# Telas paradas (menu, ranking, nomes, quadrinhos): redesenhar só quando algo muda e
+# dormir em pygame.event.wait entre um evento e outro (ver render.IdleScreen).
+# False = redesenhar a tela inteira a cada frame (comportamento antigo).
+IDLE_EVENT_WAIT = True
+
+# Espera máxima (ms) sem nenhum evento antes de acordar para conferir música/timers
+IDLE_MAX_WAIT_MS = 500
+
+# Níveis de qualidade visual (ver quality.QualityGovernor), do mais barato ao mais caro:
+#   - smooth_scale:   assets escalados com smoothscale (False = scale, vizinho mais próximo);
+#                     vale para os assets carregados a partir da mudança de nível;
+#   - translucent:    lasers e poças de slime semi-transparentes (False = cor opaca);
+#   - hud_interval:   de quantos em quantos frames o texto do HUD é atualizado;
+#   - bullet_sprites: projéteis das mãos do Boss 2 com a arte rotacionada (False = círculo).
+QUALITY_PRESETS = {
+    'low': {'smooth_scale': False, 'translucent': False, 'hud_interval': 6, 'bullet_sprites': False},
+    'medium': {'smooth_scale': True, 'translucent': False, 'hud_interval': 3, 'bullet_sprites': True},
+    'high': {'smooth_scale': True, 'translucent': True, 'hud_interval': 1, 'bullet_sprites': True},
+}
+# 'low' / 'medium' / 'high' = nível fixo; 'auto' = começa em 'high' e o governador desce/sobe
+# conforme o tempo de frame das arenas. Também pode ser escolhido ao abrir o jogo:
+#     python main.py --quality low
+QUALITY_PRESET = 'auto'
+
+# Governador ('auto'): média móvel do tempo de trabalho de QUALITY_WINDOW frames comparada
+# com o orçamento do frame (1000 / fps). Acima de QUALITY_DOWN_AT do orçamento desce um
+# nível; abaixo de QUALITY_UP_AT sobe um. A faixa entre os dois e a espera mínima de
+# QUALITY_HOLD_FRAMES entre mudanças evitam que o nível fique oscilando.
+QUALITY_WINDOW = 60
+QUALITY_DOWN_AT = 0.9
+QUALITY_UP_AT = 0.5
+QUALITY_HOLD_FRAMES = 180
+
+
+# ===============================
+# Áudio
+# ===============================
+
+# Perfis do mixer aplicados com pygame.mixer.pre_init antes de pygame.init (ver
+# audio.apply_mixer_profile). O tamanho do buffer (em amostras) define o atraso entre
+# Sound.play() e o som sair: buffer / frequência por bloco de áudio.
+#   - 'low-latency':  buffer pequeno, menor atraso (mais acordadas da thread de áudio);
+#   - 'balanced':     meio-termo;
+#   - 'power-saving': buffer grande, menos CPU, atraso perceptível.
+# Meça na máquina alvo com: python benchmark.py latency
+MIXER_PROFILES = {
+    'low-latency': {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 256},
+    'balanced': {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 512},
+    'power-saving': {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 2048},
+}
+MIXER_PROFILE = 'balanced'
+
+# Canais do mixer reservados para cada categoria de som (ver audio.VoiceManager):
+# tiros em rajada dos jogadores não conseguem ocupar os canais do chefe ou da música.
+VOICE_CHANNELS = {
+    'music': 2,    # 2 para permitir crossfade entre faixas
+    'boss': 2,     # rugido / efeitos do chefe
+    'player': 4,   # tiros dos jogadores e do duelo
+    'ui': 1,       # sons de menu/interface
+}
+
+# Máximo de instâncias simultâneas do mesmo efeito (pedidos além disso são descartados)
+VOICE_MAX_PER_SOUND = 3
+
+# Trilhas de cada tela/fase: nome -> (arquivo, volume). Tocadas pelo audio.MusicManager.
+MUSIC_TRACKS = {
+    'menu': (path.join(BASE_ASSETS, 'sounds', 'som9.mp3'), 0.25),
+    'boss1': (path.join(BASE_ASSETS, 'sounds', 'som10.mp3'), 0.18),
+    'boss2': (path.join(BASE_ASSETS, 'sounds', 'som4.mp3'), 0.18),
+    'faroeste': (path.join(BASE_ASSETS, 'sounds', 'som1.mp3'), 0.6),
+}
+
+# Duração (ms) do crossfade entre uma trilha e a próxima
+MUSIC_CROSSFADE_MS = 1200
+
+
+# ===============================
+# Cache de assets em disco
+# ===============================
+
+# Pasta onde ficam as surfaces já escaladas e convertidas ("baked"), prontas para
+# serem carregadas com pygame.image.frombuffer sem decodificar PNG nem reescalar.
+# Cada arquivo é identificado pelo hash do PNG de origem, tamanho destino e formato
+# de pixel do display — trocar a imagem ou a resolução gera uma entrada nova.
+BAKE_CACHE_DIR = path.join('cache', 'baked')
+
+# Liga/desliga o uso do cache (desligar é útil para medir o custo sem cache)
+BAKE_CACHE_ENABLED = True
+
+# Tamanho máximo do cache de surfaces em disco (MB). Ao gravar, as entradas usadas há mais
+# tempo são apagadas até caber (os buffers são crus: ~8 MB por imagem de tela cheia em
+# 1080p, 4x isso em 4K). Entradas da mesma imagem que ficaram velhas (PNG editado, outro
+# formato de pixel) são apagadas na hora, independente do limite.
+BAKE_CACHE_MAX_MB = 512
+
+# Pasta do cache de áudio decodificado: o PCM de cada efeito sonoro (MP3 já
+# decodificado no formato do mixer) — as próximas execuções pulam a decodificação.
+# As trilhas de música não entram: são grandes demais (ver audio.MusicManager).
+PCM_CACHE_DIR = path.join('cache', 'pcm')
+PCM_CACHE_ENABLED = True
+
+# Pacote único de assets gerado por "python assetpack.py build". Quando o arquivo existe,
+# todos os carregamentos leem dele (um único open + mmap por sessão); sem ele, o jogo usa
+# os arquivos soltos de assets/ (modo de desenvolvimento).
+ASSET_PACK_PATH = 'assets.pak'
+ASSET_PACK_ENABLED = True
+
+# Threads usadas para decodificar/escalar os assets de uma fase em paralelo
+# (1 = carregamento serial na thread principal, como antes)
+ASSET_LOADER_WORKERS = max(1, min(4, cpu_count() or 1))
+
+# Atlas de sprites (ver atlas.py): largura máxima de cada atlas e espaço entre os frames
+ATLAS_MAX_WIDTH = 2048
+ATLAS_PADDING = 2
+
+# Orçamento de memória (MB) do cache de surfaces derivadas (espelhadas, rotacionadas,
+# escaladas...) — ver surfcache.py. Passando do limite, as menos usadas são descartadas.
+DERIVED_CACHE_BUDGET_MB = 64
+
+# Máximo de textos renderizados guardados (títulos, rótulos, instruções) — ver fonts.py
+TEXT_CACHE_MAX_ENTRIES = 256
+
 
 # ===============================
 # Utilitários diversos
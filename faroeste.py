@@ -4,6 +4,39 @@ import random
 import sys
 import pygame
 
+from audio import VOICES, MUSIC
+from assets import REGISTRY, image_spec, sound_spec, atlas_spec
+from glyphs import GlyphAtlas
+from fonts import FONTS
+
+FAROESTE_BACKGROUND_PATH = os.path.join('assets', 'img', 'faroeste.png')
+FAROESTE_SHOT_SOUND_PATH = os.path.join('assets', 'sounds', 'som2.mp3')
+FAROESTE_EFFECT_PATHS = [os.path.join('assets', 'img', f'efeito{i}.png') for i in range(4)]
+# resolução em que as posições da arte (armas, clarões) foram medidas
+FAROESTE_ART_SIZE = (1920, 1080)
+# caracteres das mensagens e do placar do duelo (glifos rasterizados uma vez, ver glyphs.py)
+FAROESTE_TEXT_CHARSET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .!x'
+
+
+def faroeste_atlas_spec():
+    """
+    Atlas de sprites do duelo (ver atlas.py): 'tiro' com os frames da animação do disparo.
+    Retorna spec (ver assets.atlas_spec).
+    """
+    return atlas_spec('duelo', {'tiro': [image_spec(fp, size=(32, 32), smooth=False) for fp in FAROESTE_EFFECT_PATHS]})
+
+
+def faroeste_manifest(W, H):
+    """
+    Manifesto de assets do duelo (fundo, atlas da animação do disparo e som do tiro).
+    Retorna dict nome -> spec (ver assets.image_spec / assets.sound_spec / assets.atlas_spec).
+    """
+    return {
+        'fundo': image_spec(FAROESTE_BACKGROUND_PATH, size=(W, H), mode='opaque'),
+        'som_tiro': sound_spec(FAROESTE_SHOT_SOUND_PATH, volume=0.6),
+        'sprites': faroeste_atlas_spec(),
+    }
+
 
 def run_faroeste(screen, clock, W, H):
     """
@@ -15,49 +48,30 @@ def run_faroeste(screen, clock, W, H):
         None -> Cancelado (ESC)
     """
 
-    fundo_path = os.path.join('assets', 'img', 'faroeste.png')
-    fundo = None
-    if os.path.exists(fundo_path):
-        fundo = pygame.image.load(fundo_path).convert_alpha()
-        fundo = pygame.transform.smoothscale(fundo, (W, H))
-
-    # carregar sprites de tiro
-    tiro_animacao = []
-    for i in range(4):
-        fp = os.path.join('assets', 'img', f'efeito{i}.png')
-        if os.path.exists(fp):
-            img = pygame.image.load(fp).convert_alpha()
-            img = pygame.transform.scale(img, (32, 32))
-            tiro_animacao.append(img)
+    loaded = REGISTRY.load(faroeste_manifest(W, H))
+    fundo = loaded['fundo']
+
+    # sprites de tiro (views do atlas do duelo; frames ausentes já ficam de fora)
+    tiro_animacao = loaded['sprites'].frames('tiro') if loaded['sprites'] else []
 
     asset = {'tiro_animacao': tiro_animacao}
 
-    # sons
-    sound_path_music = os.path.join('assets', 'sounds', 'som1.mp3')
-    sound_path_shot = os.path.join('assets', 'sounds', 'som2.mp3')
-
-    if os.path.exists(sound_path_music):
-        try:
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.fadeout(400)
-            pygame.mixer.music.load(sound_path_music)
-            pygame.mixer.music.set_volume(0.6)
-            pygame.mixer.music.play(-1)
-        except Exception:
-            pass
-
-    if os.path.exists(sound_path_shot):
-        try:
-            asset['som_tiro'] = pygame.mixer.Sound(sound_path_shot)
-            asset['som_tiro'].set_volume(0.6)
-        except Exception:
-            asset['som_tiro'] = None
-    else:
-        asset['som_tiro'] = None
-
-    # posições e constantes
-    GUN_TIP_POS_P1 = (420, 700)
-    GUN_TIP_POS_P2 = (1100, 700)
+    # música do duelo (crossfade com a anterior)
+    MUSIC.play('faroeste')
+
+    asset['som_tiro'] = loaded['som_tiro']
+
+    # posições e constantes (medidas na arte em FAROESTE_ART_SIZE e convertidas para W x H,
+    # já que o fundo é escalado para a tela inteira)
+    def art_pos(x, y):
+        return (int(x * W / FAROESTE_ART_SIZE[0]), int(y * H / FAROESTE_ART_SIZE[1]))
+
+    GUN_TIP_POS_P1 = art_pos(420, 700)
+    GUN_TIP_POS_P2 = art_pos(1100, 700)
+    SHOT_OFFSET_P1 = art_pos(250, -60)
+    SHOT_OFFSET_P2 = art_pos(125, -40)
+    FLASH_POS_P1 = art_pos(520, 750)
+    FLASH_POS_P2 = art_pos(1375, 775)
     KEY_P1 = pygame.K_a
     KEY_P2 = pygame.K_l
     BUTTON_A = 0
@@ -72,9 +86,20 @@ def run_faroeste(screen, clock, W, H):
     # fontes
     font1_path = os.path.join('assets', 'font', 'escrita1.ttf')
     font2_path = os.path.join('assets', 'font', 'escrita2.ttf')
-    font = pygame.font.Font(font1_path if os.path.exists(font1_path) else None, 56)
-    font2 = pygame.font.Font(font2_path if os.path.exists(font2_path) else None, 70)
-    small_font = pygame.font.Font(font1_path if os.path.exists(font1_path) else None, 36)
+    font = FONTS.get(font1_path, 56)
+    font2 = FONTS.get(font2_path, 70)
+    small_font = FONTS.get(font1_path, 36)
+    # um atlas de glifos por (fonte, cor) usada no loop
+    text_title = GlyphAtlas(font2, (255, 255, 255), FAROESTE_TEXT_CHARSET)
+    text_score = GlyphAtlas(font2, (0, 255, 0), FAROESTE_TEXT_CHARSET)
+    text_white = GlyphAtlas(font, (255, 255, 255), FAROESTE_TEXT_CHARSET)
+    text_red = GlyphAtlas(font, (255, 0, 0), FAROESTE_TEXT_CHARSET)
+    text_go = GlyphAtlas(font, (10, 255, 10), FAROESTE_TEXT_CHARSET)
+    text_hint = GlyphAtlas(small_font, (200, 200, 200), FAROESTE_TEXT_CHARSET)
+
+    def draw_centered(glyphs, text, y):
+        w, _h = glyphs.size(text)
+        glyphs.draw(screen, text, (W // 2 - w // 2, y))
 
     score_p1 = 0
     score_p2 = 0
@@ -170,7 +195,7 @@ def run_faroeste(screen, clock, W, H):
                 sys.exit(0)
             elif ev.type == pygame.KEYDOWN:
                 if ev.key == pygame.K_ESCAPE:
-                    pygame.mixer.music.fadeout(400)
+                    MUSIC.stop(400)
                     return None
 
         # leitura de joystick (para disparo)
@@ -182,12 +207,12 @@ def run_faroeste(screen, clock, W, H):
                     if state == "ja" and winner_this_round is None and b == BUTTON_A:
                         if player == 1:
                             last_shot_time_p1 = now
-                            tiros_group.add(Tiro(GUN_TIP_POS_P1, asset, offset=(+250, -60)))
+                            tiros_group.add(Tiro(GUN_TIP_POS_P1, asset, offset=SHOT_OFFSET_P1))
                         else:
                             last_shot_time_p2 = now
-                            tiros_group.add(Tiro(GUN_TIP_POS_P2, asset, offset=(+125, -40)))
-                        if asset.get('som_tiro'):
-                            asset['som_tiro'].play()
+                            tiros_group.add(Tiro(GUN_TIP_POS_P2, asset, offset=SHOT_OFFSET_P2))
+                        # tiro do duelo: prioridade alta, nunca é descartado por outros efeitos
+                        VOICES.play(asset.get('som_tiro'), 'player', priority=2)
                         end_round(player)
                     elif state in ("preparar", "apontar") and winner_this_round is None and b == BUTTON_A:
                         end_round(2 if player == 1 else 1)
@@ -199,15 +224,15 @@ def run_faroeste(screen, clock, W, H):
             if state == "ja" and winner_this_round is None:
                 if keys[KEY_P1]:
                     last_shot_time_p1 = now
-                    tiros_group.add(Tiro(GUN_TIP_POS_P1, asset, offset=(+250, -60)))
-                    if asset.get('som_tiro'):
-                        asset['som_tiro'].play()
+                    tiros_group.add(Tiro(GUN_TIP_POS_P1, asset, offset=SHOT_OFFSET_P1))
+                    # tiro do duelo: prioridade alta, nunca é descartado por outros efeitos
+                    VOICES.play(asset.get('som_tiro'), 'player', priority=2)
                     end_round(1)
                 elif keys[KEY_P2]:
                     last_shot_time_p2 = now
-                    tiros_group.add(Tiro(GUN_TIP_POS_P2, asset, offset=(+125, -40)))
-                    if asset.get('som_tiro'):
-                        asset['som_tiro'].play()
+                    tiros_group.add(Tiro(GUN_TIP_POS_P2, asset, offset=SHOT_OFFSET_P2))
+                    # tiro do duelo: prioridade alta, nunca é descartado por outros efeitos
+                    VOICES.play(asset.get('som_tiro'), 'player', priority=2)
                     end_round(2)
             elif state in ("preparar", "apontar") and winner_this_round is None:
                 if keys[KEY_P1]:
@@ -242,8 +267,7 @@ def run_faroeste(screen, clock, W, H):
         else:
             screen.fill((0, 0, 0))
 
-        title = font2.render('DUELO', True, (255, 255, 255))
-        screen.blit(title, (W // 2 - title.get_width() // 2, 20))
+        draw_centered(text_title, 'DUELO', 20)
 
         if game_over:
             msg = "EMPATE!"
@@ -251,50 +275,45 @@ def run_faroeste(screen, clock, W, H):
                 msg = "JOGADOR 1 VENCEU O JOGO!"
             elif score_p2 > score_p1:
                 msg = "JOGADOR 2 VENCEU O JOGO!"
-            text = font.render(msg, True, (255, 0, 0))
-            screen.blit(text, (W // 2 - text.get_width() // 2, H // 2 - 50))
-            hint = small_font.render("PRESSIONE ESC PARA SAIR", True, (200, 200, 200))
-            screen.blit(hint, (W // 2 - hint.get_width() // 2, H // 2 + 30))
+            draw_centered(text_red, msg, H // 2 - 50)
+            draw_centered(text_hint, "PRESSIONE ESC PARA SAIR", H // 2 + 30)
         else:
             if state == "preparar":
-                s = font.render("PREPARAR...", True, (255, 255, 255))
-                screen.blit(s, (W // 2 - s.get_width() // 2, H // 2 - 80))
+                draw_centered(text_white, "PREPARAR...", H // 2 - 80)
             elif state == "apontar":
-                s = font.render("APONTAR...", True, (255, 255, 255))
-                screen.blit(s, (W // 2 - s.get_width() // 2, H // 2 - 80))
+                draw_centered(text_white, "APONTAR...", H // 2 - 80)
             elif state == "ja":
-                s = font.render("JA!", True, (10, 255, 10))
-                screen.blit(s, (W // 2 - s.get_width() // 2, H // 2 - 80))
+                draw_centered(text_go, "JA!", H // 2 - 80)
             elif state == "resultado":
                 round_msg = (
                     "EMPATE!"
                     if winner_this_round == 0
                     else ("JOGADOR 1 VENCEU A RODADA!" if winner_this_round == 1 else "JOGADOR 2 VENCEU A RODADA!")
                 )
-                tr = font.render(round_msg, True, (255, 255, 255))
-                screen.blit(tr, (W // 2 - tr.get_width() // 2, H // 2 - 100))
+                draw_centered(text_white, round_msg, H // 2 - 100)
                 score_msg = f"{score_p1}  x  {score_p2}"
-                ts = font2.render(score_msg, True, (0, 255, 0))
-                screen.blit(ts, (W // 2 - ts.get_width() // 2, H // 2))
+                draw_centered(text_score, score_msg, H // 2)
 
         # efeitos de tiro
         if now - last_shot_time_p1 <= FLASH_DURATION_MS:
             age = (now - last_shot_time_p1) / FLASH_DURATION_MS
             rad = int(20 * (1 - age) + 6)
-            pygame.draw.circle(screen, (255, 220, 80), (520, 750), rad)
+            pygame.draw.circle(screen, (255, 220, 80), FLASH_POS_P1, rad)
         if now - last_shot_time_p2 <= FLASH_DURATION_MS:
             age = (now - last_shot_time_p2) / FLASH_DURATION_MS
             rad = int(20 * (1 - age) + 6)
-            pygame.draw.circle(screen, (255, 220, 80), (1375, 775), rad)
+            pygame.draw.circle(screen, (255, 220, 80), FLASH_POS_P2, rad)
 
         tiros_group.update()
         tiros_group.draw(screen)
 
         pygame.display.flip()
+        VOICES.end_frame()
+        MUSIC.update()
 
         # fim do jogo
         if game_over:
-            pygame.mixer.music.fadeout(600)
+            MUSIC.stop(600)
             if score_p1 > score_p2:
                 return 1
             elif score_p2 > score_p1:
@@ -0,0 +1,135 @@
+# fonts.py
+from collections import OrderedDict
+import pygame
+
+import assetpack
+from config import TEXT_CACHE_MAX_ENTRIES
+
+"""
+Registro de fontes e cache de textos renderizados.
+
+Cada tela criava as próprias pygame.font.Font ao abrir (menu, ranking, nomes, duelo — que
+reabria os arquivos TTF do disco/pacote a cada duelo) e renderizava títulos, rótulos de
+botão e instruções de novo toda vez. Aqui:
+
+    - FONTS abre cada (arquivo de fonte, tamanho) uma única vez por sessão;
+    - TEXT guarda as surfaces de texto já renderizadas por (fonte, texto, cor, antialias),
+      com número máximo de entradas (config.TEXT_CACHE_MAX_ENTRIES, descarte LRU).
+
+Texto que muda durante a fase (HUD, placar) não deveria passar pelo TEXT, que guardaria cada
+valor: renderize de novo só quando o texto mudar, ou use glyphs.GlyphAtlas onde ele ganha
+(fontes TTF grandes, mensagens que ficam na tela — ver `python benchmark.py text`).
+
+Uso:
+    from fonts import FONTS, TEXT
+    font = FONTS.get(None, 52)                        # None = fonte padrão do pygame
+    label = TEXT.render(font, "JOGAR", (245, 245, 245))
+    print(TEXT.report())                              # taxa de acerto
+"""
+
+
+class FontRegistry:
+    """
+    Fontes abertas uma vez por sessão, por (caminho, tamanho).
+
+    Métodos:
+        - get(path=None, size=24): pygame.font.Font. path None = fonte padrão; arquivo
+          ausente (nem no pacote nem em assets/) também cai na fonte padrão.
+        - clear(): esquece as fontes abertas (ex.: depois de pygame.font.quit()).
+        - report(): string curta com contadores.
+
+    Atributos:
+        - stats: dict com contadores 'hits' e 'opened'.
+    """
+
+    def __init__(self):
+        self._fonts = {}
+        self.stats = {'hits': 0, 'opened': 0}
+
+    def __len__(self):
+        return len(self._fonts)
+
+    def get(self, path=None, size=24):
+        key = (path, int(size))
+        font = self._fonts.get(key)
+        if font is not None:
+            self.stats['hits'] += 1
+            return font
+        self.stats['opened'] += 1
+        source = assetpack.open_asset(path) if path is not None and assetpack.exists(path) else None
+        font = pygame.font.Font(source, int(size))
+        self._fonts[key] = font
+        return font
+
+    def clear(self):
+        self._fonts.clear()
+
+    def report(self):
+        s = self.stats
+        return f"fontes: {len(self._fonts)} aberta(s), hits={s['hits']} opened={s['opened']}"
+
+
+class TextCache:
+    """
+    Cache LRU de textos renderizados (Font.render) com número máximo de entradas.
+
+    Construtor:
+        TextCache(max_entries)
+
+    Métodos:
+        - render(font, text, color, antialias=True): mesma surface de font.render(...),
+          renderizada só na primeira vez.
+        - hit_rate(): fração das chamadas atendidas pelo cache (0.0 a 1.0).
+        - clear(): descarta tudo.
+        - report(): string curta com entradas, contadores e taxa de acerto.
+
+    Atributos:
+        - max_entries: limite de entradas.
+        - stats: dict com contadores 'hits', 'misses' e 'evictions'.
+
+    Observação:
+        - As surfaces retornadas são compartilhadas — não desenhe sobre elas.
+        - A fonte é identificada por id() e a entrada guarda uma referência a ela, então o id
+          não é reaproveitado enquanto a entrada existir (mesmo esquema de surfcache.py).
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = int(max_entries)
+        # chave -> (surface, fonte); ordem = uso mais antigo primeiro
+        self._entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def render(self, font, text, color, antialias=True):
+        key = (id(font), text, tuple(color), bool(antialias))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[0]
+        self.stats['misses'] += 1
+        surf = font.render(text, antialias, color)
+        self._entries[key] = (surf, font)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+        return surf
+
+    def hit_rate(self):
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+    def clear(self):
+        self._entries.clear()
+
+    def report(self):
+        s = self.stats
+        return (f"textos: {len(self._entries)}/{self.max_entries} surface(s), hits={s['hits']} "
+                f"misses={s['misses']} evictions={s['evictions']} acerto={100.0 * self.hit_rate():.0f}%")
+
+
+# instâncias únicas usadas pelo jogo inteiro
+FONTS = FontRegistry()
+TEXT = TextCache(TEXT_CACHE_MAX_ENTRIES)
@@ -0,0 +1,155 @@
+# glyphs.py
+import pygame
+
+from atlas import pack
+
+"""
+Atlas de glifos: placares e mensagens de estado sem rasterizar fonte a cada frame.
+
+font.render monta uma surface nova a cada chamada: rasteriza cada caractere com o FreeType,
+faz o antialiasing e aloca a imagem do texto inteiro. No duelo isso acontecia todo frame,
+mesmo com o texto igual (ou mudando só um número).
+
+Aqui cada caractere do conjunto é rasterizado uma única vez por (fonte, tamanho, cor),
+empacotado numa surface só (atlas.pack) e guardado como subsurface. Desenhar uma string vira
+uma chamada Surface.blits com uma view por caractere — nenhuma rasterização, nenhuma alocação.
+Se a mesma string aparece de novo no frame seguinte, ela é montada numa linha guardada (poucas
+entradas, por texto): enquanto o texto não muda, o frame custa um blit só.
+
+Onde ganha: fontes TTF grandes e textos que ficam vários frames na tela (placar e mensagens
+do duelo). Texto que muda em todo frame paga um blit por caractere e, com a fonte padrão
+pequena do HUD, sai mais caro que font.render — ali é melhor renderizar só quando o texto
+muda (ver boss1.py e `python benchmark.py text`).
+
+Limitações (aceitáveis para mensagens curtas): sem kerning entre pares de letras e uma
+linha só. Caracteres fora do conjunto são rasterizados na primeira vez que aparecem.
+
+Uso:
+    score = GlyphAtlas(font, (0, 255, 0))               # uma vez, fora do loop
+    rect = score.draw(screen, f"{p1}  x  {p2}", pos)    # a cada frame
+    w, h = hud.size(texto)                           # para centralizar
+"""
+
+# ASCII imprimível + acentos do português
+CHARSET = ''.join(chr(c) for c in range(32, 127)) + 'ÁÀÂÃÉÊÍÓÔÕÚÇáàâãéêíóôõúç'
+
+
+class GlyphAtlas:
+    """
+    Glifos de uma fonte numa cor, prontos para desenhar strings com Surface.blits.
+
+    Construtor:
+        GlyphAtlas(font, color, charset=CHARSET)
+        - font: pygame.font.Font (o tamanho já faz parte da fonte).
+        - color: cor do texto (antialiasing sempre ligado, fundo transparente).
+        - charset: caracteres rasterizados de antemão (ex.: só os das mensagens que a tela usa).
+
+    Métodos:
+        - draw(target, text, pos): desenha text com o canto superior esquerdo em pos;
+          retorna o pygame.Rect ocupado (para o DirtyRenderer). Texto novo sai dos glifos com
+          um Surface.blits; texto que se repete vira uma linha montada e guardada.
+        - size(text): (largura, altura) que draw ocuparia, como Font.size.
+
+    Atributos:
+        - surface: atlas com todos os glifos pré-rasterizados.
+        - height: altura da linha.
+    """
+
+    # linhas montadas guardadas (texto -> surface); placar e mensagens repetem a string por vários frames
+    LINE_CACHE = 16
+
+    def __init__(self, font, color, charset=CHARSET):
+        self.font = font
+        self.color = color
+        self._lines = {}
+        self._last_miss = None
+        # caractere -> (view ou None para glifo vazio, avanço horizontal, largura da view)
+        self._glyphs = {}
+
+        chars = sorted(set(charset))
+        images = [self._render(ch) for ch in chars]
+        # views com largura par (a coluna extra fica transparente), ver _compose
+        sizes = [(img.get_width() + (img.get_width() & 1), img.get_height()) for img in images]
+        positions, size = pack(sizes, padding=1)
+        self.surface = pygame.Surface((max(1, size[0]), max(1, size[1])), pygame.SRCALPHA, 32)
+        self.surface.fill((0, 0, 0, 0))
+        for img, (x, y) in zip(images, positions):
+            self.surface.blit(img, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+        self.height = max([font.get_height()] + [img.get_height() for img in images])
+
+        for ch, img, (x, y), (w, h) in zip(chars, images, positions, sizes):
+            view = self.surface.subsurface((x, y, w, h)) if w and not ch.isspace() else None
+            self._glyphs[ch] = (view, self._advance(ch, img), w)
+
+    def _render(self, ch):
+        try:
+            return self.font.render(ch, True, self.color)
+        except pygame.error:
+            return pygame.Surface((0, self.font.get_height()), pygame.SRCALPHA, 32)
+
+    def _advance(self, ch, img):
+        metrics = self.font.metrics(ch)
+        if metrics and metrics[0] is not None:
+            return metrics[0][4]
+        return img.get_width()
+
+    def _glyph(self, ch):
+        glyph = self._glyphs.get(ch)
+        if glyph is None:
+            # fora do conjunto: rasteriza avulso uma vez e guarda
+            img = self._render(ch)
+            if pygame.display.get_surface() is not None and img.get_width():
+                img = img.convert_alpha()
+            view = img if img.get_width() and not ch.isspace() else None
+            glyph = (view, self._advance(ch, img), img.get_width())
+            self._glyphs[ch] = glyph
+        return glyph
+
+    def size(self, text):
+        return sum(self._glyph(ch)[1] for ch in text), self.height
+
+    def _layout(self, text, x, y):
+        glyphs = self._glyphs
+        seq = []
+        right = x
+        for ch in text:
+            glyph = glyphs.get(ch) or self._glyph(ch)
+            if glyph[0] is not None:
+                seq.append((glyph[0], (x, y)))
+                if x + glyph[2] > right:
+                    right = x + glyph[2]
+            x += glyph[1]
+        return seq, max(x, right)
+
+    def _compose(self, text):
+        seq, width = self._layout(text, 0, 0)
+        # largura par: o blitter de alpha por pixel do SDL processa pares de pixels e cai num
+        # caminho quase 2x mais lento quando a linha tem largura ímpar
+        width = max(2, width + (width & 1))
+        line = pygame.Surface((width, self.height), pygame.SRCALPHA, 32)
+        line.fill((0, 0, 0, 0))
+        if seq:
+            # cópia exata dos pixels dos glifos (alpha inclusive) sobre o fundo transparente
+            line.blits([(view, dest, None, pygame.BLEND_RGBA_MAX) for view, dest in seq], doreturn=False)
+        return line
+
+    def draw(self, target, text, pos):
+        line = self._lines.get(text)
+        if line is not None:
+            return target.blit(line, pos)
+        if text != self._last_miss:
+            # texto visto pela primeira vez: glifos direto no destino, sem alocar nada
+            self._last_miss = text
+            seq, right = self._layout(text, pos[0], pos[1])
+            if seq:
+                target.blits(seq, doreturn=False)
+            return pygame.Rect(pos[0], pos[1], right - pos[0], self.height)
+        # repetiu no frame seguinte: vale montar a linha e guardar
+        line = self._compose(text)
+        if len(self._lines) >= self.LINE_CACHE:
+            # descarta a linha mais antiga (dict mantém a ordem de inserção)
+            del self._lines[next(iter(self._lines))]
+        self._lines[text] = line
+        return target.blit(line, pos)
@@ -8,13 +8,29 @@
 # Este arquivo importa as funções de interface (menu, campaign, ranking, utils) e
 # contém helpers para inicializar o pygame de forma tolerante a falhas.
 
+import os
 import sys
+import argparse
 import pygame
 
 from menu import menu
 from utils import get_player_names
 from campaign import campaign
 from ranking import save_ranking_entry, show_ranking_screen
+import audio
+from audio import apply_mixer_profile
+from fonts import FONTS, TEXT
+from quality import QUALITY
+import render
+from config import (
+    RENDER_LOGICAL_SIZE,
+    RENDER_SMOOTH_UPSCALE,
+    RENDER_DRIVER,
+    QUALITY_PRESETS,
+    QUALITY_PRESET,
+    MIXER_PROFILES,
+    MIXER_PROFILE,
+)
 
 
 def safe_init_pygame():
@@ -22,6 +38,8 @@ def safe_init_pygame():
     Inicializa pygame, o mixer de áudio e o sistema de joysticks com tolerância a falhas.
 
     O que faz:
+        - Aplica o perfil de áudio configurado (config.MIXER_PROFILE ou --audio-profile:
+          tamanho de buffer e formato do mixer) via pygame.mixer.pre_init.
         - Chama pygame.init() para inicializar os subsistemas básicos do Pygame.
         - Tenta inicializar pygame.mixer; se falhar (por exemplo, sem dispositivo de áudio),
           ignora o erro e continua — isso evita que a aplicação quebre em ambientes sem som.
@@ -34,6 +52,7 @@ def safe_init_pygame():
     Retorna:
         - None. (Efeitos colaterais: subsistemas do pygame inicializados quando possível.)
     """
+    apply_mixer_profile()
     pygame.init()
     try:
         pygame.mixer.init()
@@ -58,7 +77,12 @@ def create_screen():
     Cria a superfície de exibição (screen).
 
     O que faz:
-        - Tenta ativar o modo fullscreen nativo usando as resoluções atuais do display.
+        - Se config.RENDER_LOGICAL_SIZE estiver definido, abre o modo fullscreen com
+          pygame.SCALED: o jogo desenha numa surface do tamanho lógico e o SDL amplia o
+          quadro para a tela real uma vez por frame (eventos de mouse já chegam em
+          coordenadas lógicas).
+        - Caso contrário (ou se o modo escalado falhar), tenta o fullscreen nativo usando
+          as resoluções atuais do display.
         - Se a tentativa de fullscreen falhar (por exemplo, em ambientes sem suporte),
           faz fallback para uma janela de 1280x720.
 
@@ -68,9 +92,21 @@ def create_screen():
     Retorna:
         - Tupla (screen, W, H)
             - screen: pygame.Surface retornada por pygame.display.set_mode(...)
-            - W: largura escolhida (int)
+            - W: largura escolhida (int) — lógica, quando o modo escalado estiver ativo
             - H: altura escolhida (int)
     """
+    if RENDER_LOGICAL_SIZE:
+        W, H = RENDER_LOGICAL_SIZE
+        # filtro da ampliação (dica lida pelo SDL ao criar o renderer do modo SCALED)
+        os.environ['SDL_RENDER_SCALE_QUALITY'] = '1' if RENDER_SMOOTH_UPSCALE else '0'
+        # driver do renderer do modo SCALED (também usado pelo backend 'renderer' das arenas)
+        if RENDER_DRIVER:
+            os.environ['SDL_RENDER_DRIVER'] = RENDER_DRIVER
+        try:
+            screen = pygame.display.set_mode((W, H), pygame.SCALED | pygame.FULLSCREEN)
+            return screen, W, H
+        except Exception as e:
+            print("Modo de resolução lógica indisponível, usando resolução nativa:", e, file=sys.stderr)
     try:
         info = pygame.display.Info()
         W, H = info.current_w, info.current_h
@@ -158,8 +194,8 @@ def main():
 
             # mostrar tela simples de parabéns antes do ranking
             try:
-                font = pygame.font.Font(None, 56)
-                small = pygame.font.Font(None, 36)
+                font = FONTS.get(None, 56)
+                small = FONTS.get(None, 36)
                 showing = True
                 show_time_str = f"{int(elapsed)//60}:{int(elapsed)%60:02d}.{int((elapsed-int(elapsed))*1000):03d}"
                 message = f"Parabéns {winner_name}! Tempo: {show_time_str}"
@@ -171,9 +207,9 @@ def main():
                         if ev.type == pygame.KEYDOWN or ev.type == pygame.MOUSEBUTTONDOWN or (ev.type == pygame.JOYBUTTONDOWN and ev.button in (0,3)):
                             showing = False
                     screen.fill((8,8,12))
-                    tx = font.render(message, True, (220,220,120))
+                    tx = TEXT.render(font, message, (220,220,120))
                     screen.blit(tx, (W//2 - tx.get_width()//2, H//2 - 50))
-                    info = small.render("Pressione qualquer tecla ou Y/A para ver o ranking", True, (200,200,200))
+                    info = TEXT.render(small, "Pressione qualquer tecla ou Y/A para ver o ranking", (200,200,200))
                     screen.blit(info, (W//2 - info.get_width()//2, H//2 + 30))
                     pygame.display.flip()
                     clock.tick(30)
@@ -195,4 +231,22 @@ def main():
 
 
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(prog='main.py')
+    ap.add_argument('--quality', default=QUALITY_PRESET, choices=('auto',) + tuple(QUALITY_PRESETS),
+                    help="nível de qualidade visual (padrão: config.QUALITY_PRESET)")
+    ap.add_argument('--backend', default=render.RENDER_BACKEND, choices=('surface', 'renderer'),
+                    help="desenho das arenas: blits em surfaces ou texturas do renderer SDL2 "
+                         "(padrão: config.RENDER_BACKEND)")
+    ap.add_argument('--pipelined', action='store_true', default=render.RENDER_PIPELINED,
+                    help="arenas com a simulação numa thread separada do desenho, um frame de "
+                         "latência a mais (padrão: config.RENDER_PIPELINED)")
+    ap.add_argument('--audio-profile', default=MIXER_PROFILE, choices=tuple(MIXER_PROFILES),
+                    help="perfil do mixer: tamanho do buffer / latência do áudio "
+                         "(padrão: config.MIXER_PROFILE; meça com python benchmark.py latency)")
+    args = ap.parse_args()
+    # antes de main(): safe_init_pygame aplica o perfil antes de inicializar o mixer
+    audio.MIXER_PROFILE = args.audio_profile
+    QUALITY.configure(args.quality)
+    render.RENDER_BACKEND = args.backend
+    render.RENDER_PIPELINED = args.pipelined
     main()
@@ -3,7 +3,7 @@ import os
 import sys
 import pygame
 
-from utils import load_and_scale, show_quadrinhos_sequence
+from utils import show_quadrinhos_sequence
 from config import (
     JOYSTICK_SKIP_BUTTON_A,
     JOYSTICK_TUTORIAL_BUTTON_B,
@@ -11,6 +11,51 @@ from config import (
     TUTORIAL_PATHS,
 )
 from ranking import show_ranking_screen
+from assets import REGISTRY, SCOPE_SESSION, image_spec
+from audio import MUSIC
+from render import IdleScreen
+from fonts import FONTS, TEXT
+
+MENU_BG_PATH = os.path.join('assets', 'img', 'inicio.png')
+
+
+def menu_manifest(W, H):
+    """
+    Manifesto de assets do menu (background em tela cheia, escopo de sessão).
+    Retorna dict nome -> spec (ver assets.image_spec).
+    """
+    return {'bg': image_spec(MENU_BG_PATH, size=(W, H), scope=SCOPE_SESSION)}
+
+
+def _draw_button(surface, rect, text, font, hovered=False):
+    """
+    Desenha um botão estilizado.
+
+    O que faz:
+        - Renderiza um retângulo com background, borda e texto centralizado.
+        - Usa cores diferentes se estiver hovered (com o mouse).
+
+    Recebe:
+        - surface: pygame.Surface onde desenhar.
+        - rect: pygame.Rect definindo posição e tamanho.
+        - text: string do rótulo.
+        - font: pygame.font.Font para renderizar texto.
+        - hovered: bool indicando se o botão está em estado "hover".
+
+    Retorna:
+        - None (efeito colateral: desenha no surface).
+    """
+    BUTTON_BG = (120, 40, 40)
+    BUTTON_HOVER_BG = (70, 70, 120)
+    BUTTON_BORDER = (255, 255, 255)
+    BUTTON_TEXT = (245, 245, 245)
+    bgc = BUTTON_HOVER_BG if hovered else BUTTON_BG
+    pygame.draw.rect(surface, bgc, rect, border_radius=12)
+    pygame.draw.rect(surface, BUTTON_BORDER, rect, 2, border_radius=12)
+    txt = TEXT.render(font, text, BUTTON_TEXT)
+    tx = rect.x + (rect.w - txt.get_width()) // 2
+    ty = rect.y + (rect.h - txt.get_height()) // 2
+    surface.blit(txt, (tx, ty))
 
 
 def menu(screen, clock, W, H):
@@ -22,7 +67,7 @@ def menu(screen, clock, W, H):
         - Mostra três botões interativos: JOGAR, TUTORIAL e RANKING.
         - Aceita entrada de teclado, mouse e joystick para navegar/acionar as opções.
         - Permite iniciar o jogo, abrir o tutorial (sequência de quadrinhos) ou ver o ranking.
-        - Faz fadeout da música ao sair.
+        - Ao sair, a música continua e faz crossfade com a trilha da próxima tela (audio.MUSIC).
 
     Recebe:
         - screen: pygame.Surface onde tudo será desenhado.
@@ -36,38 +81,41 @@ def menu(screen, clock, W, H):
     """
     pygame.mouse.set_visible(True)
 
-    MENU_BG_PATH = os.path.join('assets', 'img', 'inicio.png')
-    MENU_MUSIC_PATH = os.path.join('assets', 'sounds', 'som9.mp3')
-
-    title_font = pygame.font.Font(None, 96)
-    btn_font = pygame.font.Font(None, 52)
+    btn_font = FONTS.get(None, 52)
 
     btn_w, btn_h = 420, 86
     btn_play = pygame.Rect((W // 2 - btn_w // 2, int(H * 0.5 - btn_h - 10), btn_w, btn_h))
     btn_tutorial = pygame.Rect((W // 2 - btn_w // 2, int(H * 0.5 + 10), btn_w, btn_h))
     btn_ranking = pygame.Rect((W // 2 - btn_w // 2, int(H * 0.5 + 110), btn_w, btn_h))
 
-    # start menu music (tenta tocar em loop; falhas são ignoradas para não crashar)
-    if os.path.exists(MENU_MUSIC_PATH):
-        try:
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.fadeout(400)
-            pygame.mixer.music.load(MENU_MUSIC_PATH)
-            pygame.mixer.music.set_volume(0.25)
-            pygame.mixer.music.play(-1)
-        except Exception:
-            # ignora falhas no mixer para evitar crash
-            pass
-
-    # tenta carregar e escalar background; load_and_scale vem de utils
-    bg = load_and_scale(MENU_BG_PATH, W, H, keep_aspect=False)
+    # música do menu (crossfade com a trilha anterior; sem mixer não faz nada)
+    MUSIC.play('menu')
+
+    # tenta carregar e escalar background pelo manifesto do menu
+    # (escopo de sessão: o menu é reaberto após cada campanha e não precisa recarregar)
+    bg = REGISTRY.load(menu_manifest(W, H))['bg']
+
+    # quadro base (background + botões sem hover) composto uma vez; o loop só redesenha
+    # quando o hover muda ou ao voltar do tutorial/ranking e dorme esperando eventos
+    # no resto do tempo (ver render.IdleScreen)
+    buttons = (btn_play, btn_tutorial, btn_ranking)
+    labels = ("JOGAR", "TUTORIAL", "RANKING")
+    base = pygame.Surface((W, H)).convert()
+    # desenho do background (se carregado usa imagem; senão preenche cor sólida)
+    if bg:
+        base.blit(bg, (0, 0))
+    else:
+        base.fill((18, 18, 40))
+    for rect, text in zip(buttons, labels):
+        _draw_button(base, rect, text, btn_font)
+    idle = IdleScreen(clock, fps=60)
+    last_hover = None
 
     running = True
     start_game = False
 
     while running:
-        mx, my = pygame.mouse.get_pos()
-        for ev in pygame.event.get():
+        for ev in idle.events():
             if ev.type == pygame.QUIT:
                 # fechar a janela encerra o jogo
                 pygame.quit()
@@ -80,10 +128,12 @@ def menu(screen, clock, W, H):
                     running = False
                 # tecla 't' -> mostrar tutorial (sequência de quadrinhos)
                 if ev.key == pygame.K_t:
-                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000)
+                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000, scope=SCOPE_SESSION)
+                    idle.invalidate()
                 # tecla 'r' -> mostrar ranking
                 if ev.key == pygame.K_r:
                     show_ranking_screen(screen, clock, W, H)
+                    idle.invalidate()
                 # ESC -> sair do jogo
                 if ev.key == pygame.K_ESCAPE:
                     pygame.quit()
@@ -95,9 +145,11 @@ def menu(screen, clock, W, H):
                     start_game = True
                     running = False
                 elif btn_tutorial.collidepoint(ev.pos):
-                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000)
+                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000, scope=SCOPE_SESSION)
+                    idle.invalidate()
                 elif btn_ranking.collidepoint(ev.pos):
                     show_ranking_screen(screen, clock, W, H)
+                    idle.invalidate()
 
             if ev.type == pygame.JOYBUTTONDOWN:
                 # entrada via joystick (mapeamentos vindos de config):
@@ -107,59 +159,28 @@ def menu(screen, clock, W, H):
                     running = False
                 # botão B -> tutorial
                 if ev.button == JOYSTICK_TUTORIAL_BUTTON_B:
-                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000)
+                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000, scope=SCOPE_SESSION)
+                    idle.invalidate()
                 # botão Y -> ranking
                 if ev.button == JOYSTICK_RANKING_BUTTON_Y:
                     show_ranking_screen(screen, clock, W, H)
+                    idle.invalidate()
 
-        # desenho do background (se carregado usa imagem; senão preenche cor sólida)
-        if bg:
-            screen.blit(bg, (0, 0))
-        else:
-            screen.fill((18, 18, 40))
-
-        def draw_button(surface, rect, text, font, hovered=False):
-            """
-            Desenha um botão estilizado.
-
-            O que faz:
-                - Renderiza um retângulo com background, borda e texto centralizado.
-                - Usa cores diferentes se estiver hovered (com o mouse).
-
-            Recebe:
-                - surface: pygame.Surface onde desenhar.
-                - rect: pygame.Rect definindo posição e tamanho.
-                - text: string do rótulo.
-                - font: pygame.font.Font para renderizar texto.
-                - hovered: bool indicando se o botão está em estado "hover".
-
-            Retorna:
-                - None (efeito colateral: desenha no surface).
-            """
-            BUTTON_BG = (120, 40, 40)
-            BUTTON_HOVER_BG = (70, 70, 120)
-            BUTTON_BORDER = (255, 255, 255)
-            BUTTON_TEXT = (245, 245, 245)
-            bgc = BUTTON_HOVER_BG if hovered else BUTTON_BG
-            pygame.draw.rect(surface, bgc, rect, border_radius=12)
-            pygame.draw.rect(surface, BUTTON_BORDER, rect, 2, border_radius=12)
-            txt = font.render(text, True, BUTTON_TEXT)
-            tx = rect.x + (rect.w - txt.get_width()) // 2
-            ty = rect.y + (rect.h - txt.get_height()) // 2
-            surface.blit(txt, (tx, ty))
-
-        # desenha os botões com detecção de hover usando a posição atual do mouse
-        draw_button(screen, btn_play, "JOGAR", btn_font, hovered=btn_play.collidepoint(mx, my))
-        draw_button(screen, btn_tutorial, "TUTORIAL", btn_font, hovered=btn_tutorial.collidepoint(mx, my))
-        draw_button(screen, btn_ranking, "RANKING", btn_font, hovered=btn_ranking.collidepoint(mx, my))
-
-        pygame.display.flip()
-        clock.tick(60)
-
-    # fade out music ao sair do menu (trato de exceção caso o mixer não esteja disponível)
-    try:
-        pygame.mixer.music.fadeout(500)
-    except Exception:
-        pass
-
+        # hover muda o botão destacado -> redesenha
+        mx, my = pygame.mouse.get_pos()
+        hover = (btn_play.collidepoint(mx, my), btn_tutorial.collidepoint(mx, my), btn_ranking.collidepoint(mx, my))
+        if hover != last_hover:
+            last_hover = hover
+            idle.invalidate()
+
+        if idle.dirty:
+            # quadro base pré-composto + só os botões em hover por cima
+            screen.blit(base, (0, 0))
+            for rect, text, hovered in zip(buttons, labels, hover):
+                if hovered:
+                    _draw_button(screen, rect, text, btn_font, hovered=True)
+            idle.present()
+        MUSIC.update()
+
+    # a música do menu continua na tela de nomes/quadrinhos e faz crossfade com a da fase
     return start_game
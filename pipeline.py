@@ -0,0 +1,242 @@
+# pipeline.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+"""
+Modo pipelined das arenas: a simulação do frame N+1 roda enquanto o frame N é apresentado.
+
+No modo serial cada frame faz eventos -> atualização -> colisões -> desenho -> present, tudo
+em sequência numa thread: o custo da lógica em Python e o dos blits se somam. Aqui a
+simulação (atualização, colisões e as chamadas draw(...) das entidades) roda numa thread de
+trabalho e, em vez de desenhar, grava um DisplayList — a "foto" imutável do frame: para cada
+blit a surface, a posição (copiada, nunca o Rect da entidade) e a área; para cada fill a cor e
+o retângulo. Enquanto a thread simula o frame seguinte, a thread principal reproduz a foto
+anterior no renderer de verdade e chama present.
+
+    - Os comandos de vídeo do SDL (blit no display, update/flip, texturas) e os eventos ficam
+      na thread principal, onde a janela foi criada.
+    - Surface.blit e as cópias do SDL soltam o GIL enquanto copiam pixels; é nesse tempo que
+      o Python da simulação avança. Surface.blits segura o GIL durante o lote inteiro, então a
+      reprodução manda os blits em lotes de REPLAY_CHUNK comandos: quase o custo de um lote
+      só, com pontos de troca de thread entre um lote e outro.
+    - Buffer duplo: no present a gravação do frame é entregue inteira à thread principal
+      (DisplayList.take) e o gravador recomeça em listas novas — a simulação grava o frame
+      N+1 enquanto a principal lê o N. As surfaces gravadas (sprites, carimbos, linhas de
+      texto) não mudam depois de criadas.
+    - O quadro mostrado fica um frame atrás da simulação (latência de um frame a mais).
+    - Os eventos e a leitura dos joysticks acontecem antes de a simulação começar, com a
+      thread de trabalho parada — não há acesso concorrente ao estado das entidades.
+
+Só compensa com mais de um núcleo livre: num núcleo só as duas threads dividem a CPU e o
+modo pipelined custa um pouco mais que o serial (ver `python benchmark.py pipeline`).
+
+Liga com config.RENDER_PIPELINED ou `python main.py --pipelined` (ver render.stage_renderer).
+
+Uso (nas arenas, igual para os dois modos):
+    renderer = stage_renderer(screen, fundo)
+    canvas = renderer.target
+    def step(dt):
+        ...atualiza, checa colisões...
+        renderer.begin(); renderer.add(boss.draw(canvas)); ...; renderer.present()
+    while True:
+        ...eventos...
+        outcome = renderer.run(step, dt)
+"""
+
+# blits por chamada Surface.blits na reprodução (o GIL fica preso durante cada chamada)
+REPLAY_CHUNK = 128
+
+# thread única da simulação, compartilhada pelas fases (criada no primeiro uso)
+_WORKER = None
+
+
+def _worker():
+    global _WORKER
+    if _WORKER is None:
+        _WORKER = ThreadPoolExecutor(max_workers=1, thread_name_prefix='simulation')
+    return _WORKER
+
+
+class DisplayList:
+    """
+    Gravação dos comandos de desenho de um frame, com a API de Surface usada pelas arenas.
+
+    Construtor:
+        DisplayList(size) — size: tamanho da tela (os Rects retornados são recortados nela).
+
+    Métodos (mesmos argumentos e retornos de pygame.Surface, só que gravam em vez de desenhar):
+        - blit(source, dest, area=None, special_flags=0) -> Rect
+        - blits(blit_sequence, doreturn=1) -> lista de Rects ou None
+        - fill(color, rect=None, special_flags=0) -> Rect
+        - get_size() / get_width() / get_height() / get_rect()
+        - replay(target): executa os comandos gravados em target (Surface ou TextureCanvas).
+        - take(): DisplayList com tudo o que foi gravado; esta recomeça vazia.
+        - reset(): esvazia a gravação (comandos e retângulos).
+
+    Atributos:
+        - commands: lista de (surface, (x, y)) para os blits simples, (surface, (x, y), área,
+          flags) para os com área/flags e (None, cor, Rect, flags) para os fills.
+        - rects: retângulos registrados com add(...) do renderer (para o DirtyRenderer).
+    """
+
+    def __init__(self, size):
+        self._rect = pygame.Rect((0, 0), size)
+        self.commands = []
+        self.rects = []
+
+    def get_size(self):
+        return self._rect.size
+
+    def get_width(self):
+        return self._rect.w
+
+    def get_height(self):
+        return self._rect.h
+
+    def get_rect(self, **kwargs):
+        rect = self._rect.copy()
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def reset(self):
+        self.commands = []
+        self.rects = []
+
+    def take(self):
+        frame = DisplayList(self._rect.size)
+        frame.commands, frame.rects = self.commands, self.rects
+        self.reset()
+        return frame
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        # cópia dos valores: a entidade pode mexer no próprio Rect durante o frame seguinte
+        pos = (int(dest[0]), int(dest[1]))
+        if area is None and not special_flags:
+            self.commands.append((source, pos))
+            return pygame.Rect(pos, source.get_size()).clip(self._rect)
+        if area is not None:
+            area = pygame.Rect(area)
+            size = area.clip(source.get_rect()).size
+        else:
+            size = source.get_size()
+        self.commands.append((source, pos, area, special_flags))
+        return pygame.Rect(pos, size).clip(self._rect)
+
+    def blits(self, blit_sequence, doreturn=1):
+        # caminho rápido para a fila do frame (RenderQueue.flush): pares (surface, posição)
+        append, clip, Rect = self.commands.append, self._rect.clip, pygame.Rect
+        rects = [] if doreturn else None
+        for item in blit_sequence:
+            if len(item) != 2:
+                rect = self.blit(*item)
+            else:
+                source, dest = item
+                pos = (int(dest[0]), int(dest[1]))
+                append((source, pos))
+                if rects is None:
+                    continue
+                rect = clip(Rect(pos, source.get_size()))
+            if rects is not None:
+                rects.append(rect)
+        return rects
+
+    def fill(self, color, rect=None, special_flags=0):
+        rect = self._rect.copy() if rect is None else pygame.Rect(rect).clip(self._rect)
+        self.commands.append((None, tuple(color), rect, special_flags))
+        return rect
+
+    def replay(self, target):
+        run = []
+        for cmd in self.commands:
+            if len(cmd) == 2:
+                run.append(cmd)
+                if len(run) >= REPLAY_CHUNK:
+                    target.blits(run, False)
+                    run = []
+                continue
+            if run:
+                target.blits(run, False)
+                run = []
+            if cmd[0] is None:
+                target.fill(cmd[1], cmd[2], cmd[3])
+            else:
+                target.blit(*cmd)
+        if run:
+            target.blits(run, False)
+
+
+class PipelinedRenderer:
+    """
+    Renderer das arenas no modo pipelined (mesma interface do render.DirtyRenderer).
+
+    Construtor:
+        PipelinedRenderer(inner) — inner: DirtyRenderer ou texrender.TextureRenderer que
+        apresenta os quadros na thread principal.
+
+    Métodos:
+        - run(step, *args): inicia step(*args) na thread de simulação, apresenta o frame gravado
+          anterior enquanto ela roda e retorna o resultado de step (exceções são repassadas).
+        - begin() / add(rect) / present(): chamados por step — gravam o frame em target;
+          present() separa a gravação e a deixa pronta para o próximo run.
+        - invalidate(): repassado ao renderer interno (só fora de run).
+
+    Atributos:
+        - target: DisplayList onde o frame é gravado (as entidades desenham nele; é sempre o
+          mesmo objeto, pode ser guardado como o canvas da fase).
+        - inner: o renderer que apresenta os quadros.
+        - pixels_pushed / stats: os do renderer interno.
+        - timing: dict com 'frames', 'render_ms' (reproduzir + present na thread principal) e
+          'wait_ms' (espera pela simulação depois disso) acumulados.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.target = DisplayList(inner.target.get_size())
+        # frame gravado e ainda não apresentado
+        self._ready = None
+        self.timing = {'frames': 0, 'render_ms': 0.0, 'wait_ms': 0.0}
+
+    @property
+    def pixels_pushed(self):
+        return self.inner.pixels_pushed
+
+    @property
+    def stats(self):
+        return self.inner.stats
+
+    def invalidate(self):
+        self.inner.invalidate()
+
+    def begin(self):
+        self.target.reset()
+
+    def add(self, rect):
+        if rect is None:
+            return
+        if isinstance(rect, pygame.Rect):
+            self.target.rects.append(rect)
+        else:
+            self.target.rects.extend(r for r in rect if r is not None)
+
+    def present(self):
+        self._ready = self.target.take()
+
+    def run(self, step, *args):
+        frame, self._ready = self._ready, None
+        future = _worker().submit(step, *args)
+        t0 = time.perf_counter()
+        if frame is not None:
+            inner = self.inner
+            inner.begin()
+            frame.replay(inner.target)
+            inner.add(frame.rects)
+            inner.present()
+        t1 = time.perf_counter()
+        outcome = future.result()
+        t = self.timing
+        t['frames'] += 1
+        t['render_ms'] += (t1 - t0) * 1000.0
+        t['wait_ms'] += (time.perf_counter() - t1) * 1000.0
+        return outcome
@@ -3,6 +3,53 @@ import os
 import math
 import pygame
 
+from assets import REGISTRY, SCOPE_CAMPAIGN, image_spec, sound_spec, atlas_spec
+from surfcache import DERIVED
+from audio import VOICES
+from render import LAYER_BULLETS, circle_stamp, outline_rect
+from timestep import lerp
+
+# sprites e som padrão dos jogadores (usados pelas duas fases de chefe)
+PLAYER_IMAGE_PATH = os.path.join('assets', 'img', 'astronauta1.png')
+WALK_FRAMES_P1 = [os.path.join('assets', 'img', f'andar_{i}.png') for i in range(4)]
+WALK_FRAMES_P2 = [os.path.join('assets', 'img', f'andarv_{i}.png') for i in range(4)]
+SHOT_SOUND_PATH = os.path.join('assets', 'sounds', 'som6.mp3')
+
+
+def player_atlas_spec(screen_height, scope=SCOPE_CAMPAIGN):
+    """
+    Atlas com os sprites dos jogadores (ver atlas.py): 'walk_p1' e 'walk_p2' (ciclos de
+    caminhada) e 'player' (imagem parada), escalados para ~25% da altura da tela.
+
+    Recebe:
+        - screen_height: altura da tela (int).
+        - scope: escopo de vida no registro de assets.
+    Retorna:
+        - spec (ver assets.atlas_spec).
+    """
+    target_h = int(screen_height * 0.25)
+    return atlas_spec('jogadores', {
+        'walk_p1': [image_spec(p, height=target_h) for p in WALK_FRAMES_P1],
+        'walk_p2': [image_spec(p, height=target_h) for p in WALK_FRAMES_P2],
+        'player': [image_spec(PLAYER_IMAGE_PATH, height=target_h)],
+    }, scope=scope)
+
+
+def player_manifest(screen_height):
+    """
+    Manifesto dos assets usados por PlayerSimple (atlas com os frames dos dois jogadores e a
+    imagem estática, e som de tiro), com os mesmos parâmetros que o construtor pede ao registro.
+
+    Recebe:
+        - screen_height: altura da tela (int).
+    Retorna:
+        - dict nome -> spec (ver assets.atlas_spec / assets.sound_spec).
+    """
+    return {
+        'sprites': player_atlas_spec(screen_height),
+        'shot_sound': sound_spec(SHOT_SOUND_PATH, volume=0.2, scope=SCOPE_CAMPAIGN),
+    }
+
 
 class SimpleBullet:
     """
@@ -12,32 +59,42 @@ class SimpleBullet:
         - Mantém posição (x, y) e direção normalizada (dx, dy).
         - Move-se a uma velocidade constante multiplicada pelo delta time (dt).
         - Possui vida útil (life) em segundos; quando chega a 0 marca alive = False.
-        - Pode desenhar-se como um círculo e testar colisão circular contra um rect.
+        - Pode desenhar-se como um círculo (ou como sprite girado na direção do movimento)
+          e testar colisão circular contra um rect.
 
     Recebe (construtor __init__):
         - x, y: posição inicial (pixeis).
         - dir_x, dir_y: vetor de direção (não precisa ser normalizado).
         - speed: velocidade em pixels por segundo (float, padrão 300.0).
         - color: cor do projétil (tupla RGB, padrão (255, 100, 180)).
-        - radius: raio do projétil em pixels (int, padrão 6).
+        - radius: raio do projétil em pixels (int, padrão 6). Continua sendo o raio de colisão
+          quando há sprite.
+        - sprite: render.RotationSet com a arte do projétil, ou None (círculo de cor `color`).
+          A rotação é escolhida uma vez aqui, pela direção — nada é girado por frame.
 
     Atributos públicos importantes:
         - x, y: posição em float.
+        - prev_x, prev_y: posição no passo de simulação anterior (desenho interpolado, ver timestep.py).
         - dx, dy: direção unitária normalizada.
         - speed: velocidade em px/s.
         - color, radius: aparência.
+        - stamp: surface desenhada — círculo pré-renderizado (render.circle_stamp, compartilhado
+          por (raio, cor)) ou a rotação do sprite mais próxima da direção.
         - alive: bool indicando se o projétil deve ser mantido.
         - life: tempo restante em segundos.
 
     Métodos:
         - update(dt): atualiza posição e decrementa vida.
-        - draw(surf): desenha o projétil na surface passada.
+        - draw(surf, alpha=1.0): desenha o projétil (círculo ou sprite) na surface passada, na
+          posição interpolada entre o passo anterior (alpha 0) e o atual (alpha 1).
+        - submit(queue, alpha=1.0): envia o desenho para uma render.RenderQueue (desenho em lote).
         - collides_rect(rect): checa colisão do círculo com um pygame.Rect.
     """
 
-    def __init__(self, x, y, dir_x, dir_y, speed=300.0, color=(255, 100, 180), radius=6):
+    def __init__(self, x, y, dir_x, dir_y, speed=300.0, color=(255, 100, 180), radius=6, sprite=None):
         self.x = float(x)
         self.y = float(y)
+        self.prev_x, self.prev_y = self.x, self.y
         # normaliza o vetor de direção; evita divisão por zero
         l = math.hypot(dir_x, dir_y) or 1.0
         self.dx = dir_x / l
@@ -45,6 +102,12 @@ class SimpleBullet:
         self.speed = speed
         self.color = color
         self.radius = radius
+        if sprite is not None:
+            self.stamp = sprite.for_direction(self.dx, self.dy)
+        else:
+            self.stamp = circle_stamp(radius, color)
+        # deslocamento do canto do stamp até o centro do projétil
+        self._half = (self.stamp.get_width() // 2, self.stamp.get_height() // 2)
         self.alive = True
         # tempo de vida em segundos — após expirar o projétil morre (alive=False)
         self.life = 4.0  # segundos
@@ -62,23 +125,39 @@ class SimpleBullet:
         Retorna:
             - None (efeitos colaterais nos atributos).
         """
+        self.prev_x, self.prev_y = self.x, self.y
         self.x += self.dx * self.speed * dt
         self.y += self.dy * self.speed * dt
         self.life -= dt
         if self.life <= 0:
             self.alive = False
 
-    def draw(self, surf):
+    def draw(self, surf, alpha=1.0):
         """
-        Desenha o projétil como um círculo preenchido na surface fornecida.
+        Desenha o projétil (círculo preenchido ou sprite) na surface fornecida.
 
         Recebe:
             - surf: pygame.Surface onde desenhar.
+            - alpha: fração entre o passo anterior (0.0) e o atual (1.0), ver timestep.py.
 
         Retorna:
-            - None.
+            - pygame.Rect da área desenhada.
         """
-        pygame.draw.circle(surf, self.color, (int(self.x), int(self.y)), self.radius)
+        # lerp escrita por extenso: roda para cada projétil em todo frame
+        px, py = self.prev_x, self.prev_y
+        half = self._half
+        return surf.blit(self.stamp, (int(px + (self.x - px) * alpha) - half[0],
+                                      int(py + (self.y - py) * alpha) - half[1]))
+
+    def submit(self, queue, alpha=1.0):
+        """
+        Envia o desenho do projétil para a fila do frame (render.RenderQueue, camada LAYER_BULLETS),
+        na posição interpolada com alpha (ver draw).
+        """
+        px, py = self.prev_x, self.prev_y
+        half = self._half
+        queue.submit(self.stamp, (int(px + (self.x - px) * alpha) - half[0],
+                                  int(py + (self.y - py) * alpha) - half[1]), LAYER_BULLETS)
 
     def collides_rect(self, rect):
         """
@@ -115,9 +194,12 @@ class PlayerSimple:
         - image_path: caminho para imagem estática (str) — usado se não houver frames.
         - walk_frames_paths: lista de caminhos para frames de caminhada (list[str]) — opcional.
         - walk_frame_interval: intervalo entre frames de caminhada em segundos (float).
+        - asset_scope: escopo de vida dos sprites/som no registro de assets (padrão SCOPE_CAMPAIGN).
 
     Atributos públicos notáveis:
-        - rect: pygame.Rect representando caixa do jogador (posição e tamanho).
+        - rect: pygame.Rect representando caixa do jogador (posição e tamanho) — usado nas colisões.
+        - x, y: canto superior esquerdo em float (sub-pixel); rect é a versão arredondada.
+        - prev_x, prev_y: x, y no passo de simulação anterior (desenho interpolado, ver timestep.py).
         - vel_x, vel_y: velocidades em px/s (float).
         - SPEED: velocidade de corrida horizontal (px/s).
         - JUMP_VELOCITY: velocidade inicial do pulo (px/s negativa para subir).
@@ -133,9 +215,12 @@ class PlayerSimple:
         - aim: tupla (ax, ay) direção de mira normalizada por componente (-1..1).
         - facing_right: bool — orientação para flip do sprite.
         - use_walk, walk_frames, walk_frame_idx, walk_frame_time: controle de animação.
+        - frame_sets: dict {True: frames para a direita, False: frames espelhados para a esquerda},
+          montado uma vez no construtor (lista vazia se não houver sprite).
     """
 
-    def __init__(self, x, ground_y, screen_height, image_path=None, walk_frames_paths=None, walk_frame_interval=0.10):
+    def __init__(self, x, ground_y, screen_height, image_path=None, walk_frames_paths=None, walk_frame_interval=0.10,
+                 asset_scope=SCOPE_CAMPAIGN):
         # posição vertical do chão (y de onde o jogador "pisa")
         self.ground_y = ground_y
         self.image = None
@@ -145,35 +230,35 @@ class PlayerSimple:
         self.walk_frame_interval = walk_frame_interval
         self.use_walk = False
 
-        # carregar frames de caminhada se fornecidos (tenta abrir cada caminho)
+        # carregar frames de caminhada se fornecidos. Os frames (já escalados para ~25% da
+        # altura da tela) são views do atlas dos jogadores (player_atlas_spec), com escopo de
+        # campanha: os dois jogadores e as fases seguintes reaproveitam o mesmo atlas. Caminhos
+        # que não estão no atlas são carregados como imagens avulsas pelo registro.
+        target_h = int(screen_height * 0.25)
+        sprites = REGISTRY.request(player_atlas_spec(screen_height, asset_scope))
+
+        def sprite(path):
+            img = sprites.find(path) if sprites is not None else None
+            return img or REGISTRY.image(path, height=target_h, scope=asset_scope)
+
         if walk_frames_paths:
             frames = []
             for p in walk_frames_paths:
-                if os.path.exists(p):
-                    try:
-                        img = pygame.image.load(p).convert_alpha()
-                        frames.append(img)
-                    except Exception:
-                        # ignora frames que falharem ao carregar
-                        pass
+                try:
+                    img = sprite(p)
+                except Exception:
+                    # ignora frames que falharem ao carregar
+                    img = None
+                if img:
+                    frames.append(img)
             if frames:
-                # dimensiona os frames para ocupar ~25% da altura da tela
-                target_h = int(screen_height * 0.25)
-                scaled = []
-                for img in frames:
-                    # escala preservando proporção usando rotozoom (sem rotação)
-                    scale = target_h / img.get_height()
-                    scaled.append(pygame.transform.rotozoom(img, 0, scale))
-                self.walk_frames = scaled
+                self.walk_frames = frames
                 self.use_walk = True
 
         # se não há animação, tenta carregar imagem estática
-        if not self.use_walk and image_path and os.path.exists(image_path):
+        if not self.use_walk and image_path:
             try:
-                img = pygame.image.load(image_path).convert_alpha()
-                target_h = int(screen_height * 0.25)
-                scale = target_h / img.get_height()
-                self.image = pygame.transform.rotozoom(img, 0, scale)
+                self.image = sprite(image_path)
             except Exception:
                 self.image = None
 
@@ -186,8 +271,18 @@ class PlayerSimple:
             self.w = self.image.get_width() if self.image else 64
             self.h = self.image.get_height() if self.image else 128
 
+        # conjuntos de frames por orientação, montados uma vez aqui: o desenho só indexa
+        # (sem transform.flip nem consulta a cache por frame). Os espelhados vêm do cache de
+        # derivadas, então os dois jogadores e as fases seguintes compartilham as mesmas surfaces.
+        right = self.walk_frames if self.use_walk else ([self.image] if self.image else [])
+        self.frame_sets = {True: list(right), False: [DERIVED.flip(f, True, False) for f in right]}
+
         # rect posicionado de modo que bottom coincida com ground_y
         self.rect = pygame.Rect(x, ground_y - self.h, self.w, self.h)
+        # posição em float: deslocamentos menores que um pixel por passo se acumulam
+        self.x = float(self.rect.x)
+        self.y = float(self.rect.y)
+        self.prev_x, self.prev_y = self.x, self.y
         self.vel_x = 0.0
         self.vel_y = 0.0
         # constantes de movimento (px/s e px/s^2)
@@ -201,14 +296,8 @@ class PlayerSimple:
         self.gun_offset = (self.w // 2, self.h // 2)
 
         # som de tiro (opcional)
-        shot_path = os.path.join('assets', 'sounds', 'som6.mp3')
-        self.shot_sound = None
-        if os.path.exists(shot_path):
-            try:
-                self.shot_sound = pygame.mixer.Sound(shot_path)
-                self.shot_sound.set_volume(0.2)
-            except Exception:
-                self.shot_sound = None
+        # (compartilhado entre os jogadores pelo registro de assets)
+        self.shot_sound = REGISTRY.sound(SHOT_SOUND_PATH, volume=0.2, scope=asset_scope)
 
         # vida / invulnerabilidade
         self.max_health = 8
@@ -305,9 +394,11 @@ class PlayerSimple:
 
         Efeitos observáveis:
             - Atualiza temporizadores (tiro e invulnerabilidade).
-            - Move o rect horizontalmente segundo vel_x * dt e limita dentro da tela.
-            - Aplica gravidade incrementando vel_y por GRAVITY * dt e atualiza rect.y.
-            - Se o jogador atingir ground_y, ajusta rect.bottom e zera vel_y (fica grounded = True).
+            - Guarda a posição atual em prev_x, prev_y (interpolação do desenho).
+            - Move x segundo vel_x * dt e limita dentro da tela.
+            - Aplica gravidade incrementando vel_y por GRAVITY * dt e atualiza y.
+            - Se o jogador atingir ground_y, apoia os pés no chão e zera vel_y (fica grounded = True).
+            - Copia x, y arredondados para rect.
             - Atualiza animação de caminhada (walk_frames) quando se move no chão:
                 - walk_frame_time acumula dt; avança frames quando excede walk_frame_interval.
                 - Caso não se mova, reseta para frame 0.
@@ -315,6 +406,7 @@ class PlayerSimple:
         Retorna:
             - None (modifica atributos como rect, vel_y, walk_frame_idx, etc).
         """
+        self.prev_x, self.prev_y = self.x, self.y
         if self.dead:
             return
         # tempo desde o último tiro
@@ -326,21 +418,22 @@ class PlayerSimple:
                 self._invuln_timer = 0.0
 
         # movimento horizontal e clamp à tela
-        self.rect.x += int(self.vel_x * dt)
-        if self.rect.left < 0:
-            self.rect.left = 0
-        if self.rect.right > screen_width:
-            self.rect.right = screen_width
+        self.x += self.vel_x * dt
+        if self.x < 0.0:
+            self.x = 0.0
+        if self.x + self.w > screen_width:
+            self.x = float(screen_width - self.w)
 
         # gravidade / salto
         self.vel_y += self.GRAVITY * dt
-        self.rect.y += int(self.vel_y * dt)
-        if self.rect.bottom >= self.ground_y:
-            self.rect.bottom = self.ground_y
+        self.y += self.vel_y * dt
+        if self.y + self.h >= self.ground_y:
+            self.y = float(self.ground_y - self.h)
             self.vel_y = 0.0
             self.grounded = True
         else:
             self.grounded = False
+        self.rect.topleft = (round(self.x), round(self.y))
 
         # animação de caminhada (se configurada)
         if self.use_walk and self.walk_frames:
@@ -391,12 +484,8 @@ class PlayerSimple:
         if dx == 0 and dy == 0:
             dx = 1.0 if self.facing_right else -1.0
         b = SimpleBullet(spawn_x, spawn_y, dx, dy, speed=700.0, color=(255, 105, 180), radius=6)
-        if self.shot_sound:
-            try:
-                self.shot_sound.play()
-            except Exception:
-                # problemas com mixer são ignorados para não travar o jogo
-                pass
+        # canal da categoria dos jogadores (falhas/sem mixer são ignoradas pelo VoiceManager)
+        VOICES.play(self.shot_sound, 'player')
         return b
 
     def take_damage(self, amount):
@@ -425,7 +514,7 @@ class PlayerSimple:
 
     # ------------------------ DESENHO ------------------------
 
-    def draw(self, surface):
+    def draw(self, surface, alpha=1.0):
         """
         Desenha o jogador na surface passada:
             - Sprite animado (walk_frames) se disponível; ou imagem estática; ou retângulo fallback.
@@ -434,35 +523,33 @@ class PlayerSimple:
 
         Recebe:
             - surface: pygame.Surface onde desenhar.
+            - alpha: posição entre o passo anterior (0.0) e o atual (1.0), ver timestep.py.
 
         Retorna:
-            - None (desenha diretamente na surface).
+            - pygame.Rect com a área desenhada (sprite + barra de vida), ou None se morto.
         """
         if self.dead:
-            return
+            return None
 
-        # sprite animado ou imagem estática
-        if self.use_walk and self.walk_frames:
-            frame = self.walk_frames[self.walk_frame_idx]
-            if not self.facing_right:
-                frame = pygame.transform.flip(frame, True, False)
-            surface.blit(frame, (self.rect.x, self.rect.y))
-        elif self.image:
-            frame = self.image
-            if not self.facing_right:
-                frame = pygame.transform.flip(frame, True, False)
-            surface.blit(frame, (self.rect.x, self.rect.y))
+        x = round(lerp(self.prev_x, self.x, alpha))
+        y = round(lerp(self.prev_y, self.y, alpha))
+
+        # sprite animado ou imagem estática (frame já orientado, ver frame_sets)
+        frames = self.frame_sets[self.facing_right]
+        if frames:
+            frame = frames[self.walk_frame_idx if self.use_walk else 0]
+            drawn = surface.blit(frame, (x, y))
         else:
             # fallback: desenha um retângulo simples representando o jogador
-            pygame.draw.rect(surface, (200, 30, 30), self.rect)
+            drawn = surface.fill((200, 30, 30), (x, y, self.w, self.h))
 
         # barra de vida (background + preenchimento proporcional)
         bar_w = max(40, self.w)
         bar_h = 8
-        bar_x = self.rect.x
-        bar_y = self.rect.y - (bar_h + 6)
+        bar_x = x
+        bar_y = y - (bar_h + 6)
         bg_rect = pygame.Rect(bar_x, bar_y, bar_w, bar_h)
-        pygame.draw.rect(surface, (30, 30, 50), bg_rect)
+        surface.fill((30, 30, 50), bg_rect)
 
         # razão atual de HP (0.0 a 1.0)
         hp_ratio = max(0.0, min(1.0, float(self.health) / float(self.max_health)))
@@ -480,7 +567,8 @@ class PlayerSimple:
             fill_color = (40, 140, 255)
 
         if fill_w > 0:
-            pygame.draw.rect(surface, fill_color, fill_rect)
+            surface.fill(fill_color, fill_rect)
 
         # borda da barra
-        pygame.draw.rect(surface, (200, 200, 220), bg_rect, 1)
+        outline_rect(surface, (200, 200, 220), bg_rect)
+        return drawn.union(bg_rect)
@@ -0,0 +1,123 @@
+# quality.py
+import sys
+from collections import deque
+
+from config import (
+    QUALITY_PRESETS,
+    QUALITY_PRESET,
+    QUALITY_WINDOW,
+    QUALITY_DOWN_AT,
+    QUALITY_UP_AT,
+    QUALITY_HOLD_FRAMES,
+)
+
+"""
+Governador de qualidade visual: troca detalhe visual por tempo de frame.
+
+Com muitos projéteis e lasers vivos o frame do Boss 2 estoura o orçamento de 16,7 ms e não
+havia como abrir mão de nada. Os níveis de config.QUALITY_PRESETS ('low', 'medium', 'high')
+dizem o que cada parte do jogo pode gastar (smoothscale, transparência dos lasers/slime,
+frequência do HUD, arte dos projéteis); o código consulta o nível atual com QUALITY.get(...).
+
+Em 'auto' as arenas informam o tempo de trabalho de cada frame (clock.get_rawtime(), sem a
+espera do clock.tick) e o governador compara a média móvel com o orçamento: acima de
+QUALITY_DOWN_AT desce um nível, abaixo de QUALITY_UP_AT sobe um. A faixa entre os dois
+limiares e a espera mínima entre mudanças (histerese) evitam a oscilação alto/baixo/alto.
+
+Uso:
+    from quality import QUALITY
+    QUALITY.begin()                           # início da fase (carregamento não conta)
+    ...
+    dt = clock.tick(60) / 1000.0
+    QUALITY.frame(clock.get_rawtime())        # a cada frame
+    color = LASER_COLOR if QUALITY.get('translucent') else LASER_COLOR_OPAQUE
+"""
+
+# do mais barato ao mais caro
+LEVELS = ('low', 'medium', 'high')
+
+
+class QualityGovernor:
+    """
+    Nível de qualidade atual (fixo ou adaptativo) e as opções do preset correspondente.
+
+    Construtor:
+        QualityGovernor(preset=QUALITY_PRESET, fps=60)
+
+    Métodos:
+        - configure(preset): 'low' / 'medium' / 'high' fixa o nível; 'auto' liga o governador
+          (começando em 'high'). Nome desconhecido cai para 'auto'. Retorna o nível.
+        - begin(): zera a média móvel (chamar no início de cada fase).
+        - frame(work_ms): registra o tempo de trabalho de um frame e, em 'auto', ajusta o
+          nível. Retorna o nível atual.
+        - get(key): opção do preset atual (ex.: 'translucent', 'hud_interval').
+        - average_ms(): média móvel do tempo de trabalho (ms; 0.0 sem amostras).
+        - report(): string curta com nível, média e contadores.
+
+    Atributos (instrumentação):
+        - level: nome do nível atual.
+        - adaptive: True em 'auto'.
+        - stats: dict com contadores 'downgrades' e 'upgrades'.
+        - changes: lista de (frame, nível antigo, nível novo, média em ms) de cada mudança.
+    """
+
+    def __init__(self, preset=QUALITY_PRESET, fps=60):
+        self.fps = fps
+        self._times = deque(maxlen=QUALITY_WINDOW)
+        self._since_change = 0
+        self._frames = 0
+        self.stats = {'downgrades': 0, 'upgrades': 0}
+        self.changes = []
+        self.configure(preset)
+
+    def configure(self, preset):
+        if preset != 'auto' and preset not in QUALITY_PRESETS:
+            print(f"Nível de qualidade desconhecido: {preset!r}, usando 'auto'", file=sys.stderr)
+            preset = 'auto'
+        self.adaptive = preset == 'auto'
+        self.level = 'high' if self.adaptive else preset
+        self.begin()
+        return self.level
+
+    def begin(self):
+        self._times.clear()
+        self._since_change = 0
+
+    def frame(self, work_ms):
+        self._times.append(work_ms)
+        self._since_change += 1
+        self._frames += 1
+        if not self.adaptive or len(self._times) < self._times.maxlen or self._since_change < QUALITY_HOLD_FRAMES:
+            return self.level
+        budget = 1000.0 / self.fps
+        avg = self.average_ms()
+        index = LEVELS.index(self.level)
+        if avg > budget * QUALITY_DOWN_AT and index > 0:
+            self._change(LEVELS[index - 1], avg)
+            self.stats['downgrades'] += 1
+        elif avg < budget * QUALITY_UP_AT and index < len(LEVELS) - 1:
+            self._change(LEVELS[index + 1], avg)
+            self.stats['upgrades'] += 1
+        return self.level
+
+    def _change(self, level, avg):
+        self.changes.append((self._frames, self.level, level, avg))
+        self.level = level
+        # as amostras antigas são do nível anterior: a próxima decisão espera uma janela nova
+        self.begin()
+
+    def get(self, key):
+        return QUALITY_PRESETS[self.level][key]
+
+    def average_ms(self):
+        return sum(self._times) / len(self._times) if self._times else 0.0
+
+    def report(self):
+        s = self.stats
+        mode = 'auto' if self.adaptive else 'fixo'
+        return (f"qualidade: {self.level} ({mode}), média {self.average_ms():.1f} ms, "
+                f"downgrades={s['downgrades']} upgrades={s['upgrades']}")
+
+
+# instância única usada pelo jogo inteiro
+QUALITY = QualityGovernor()
@@ -1,10 +1,14 @@
 # ranking.py
 import os
+import sys
 import json
 import datetime
 import pygame
 
 from config import RANKING_FILE, MAX_RANKING, JOYSTICK_SKIP_BUTTON_A, JOYSTICK_RANKING_BUTTON_Y
+from audio import MUSIC
+from render import IdleScreen
+from fonts import FONTS, TEXT
 
 def load_ranking():
     """
@@ -50,15 +54,20 @@ def show_ranking_screen(screen, clock, W, H):
     Fecha com ESC / ENTER / SPACE / clique do mouse / botão A ou Y do joystick.
     """
     # fontes
-    title_font = pygame.font.Font(None, 64)
-    item_font = pygame.font.Font(None, 36)
-    hint_font = pygame.font.Font(None, 28)
+    title_font = FONTS.get(None, 64)
+    item_font = FONTS.get(None, 36)
+    hint_font = FONTS.get(None, 28)
 
     ranking = load_ranking()
     showing = True
 
+    # a tela é estática: compõe o quadro uma vez e só o reapresenta quando a janela
+    # precisa ser redesenhada; no resto do tempo dorme esperando eventos (render.IdleScreen)
+    frame = _compose_ranking(W, H, ranking, title_font, item_font, hint_font)
+    idle = IdleScreen(clock, fps=30)
+
     while showing:
-        for ev in pygame.event.get():
+        for ev in idle.events():
             if ev.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
             if ev.type == pygame.KEYDOWN:
@@ -69,36 +78,46 @@ def show_ranking_screen(screen, clock, W, H):
             if ev.type == pygame.JOYBUTTONDOWN and ev.button in (JOYSTICK_SKIP_BUTTON_A, JOYSTICK_RANKING_BUTTON_Y):
                 showing = False
 
-        # background
-        screen.fill((10, 10, 20))
+        if idle.dirty:
+            screen.blit(frame, (0, 0))
+            idle.present()
+        MUSIC.update()
+
+
+def _compose_ranking(W, H, ranking, title_font, item_font, hint_font):
+    """
+    Desenha a tela de ranking inteira numa surface W x H (usada por show_ranking_screen).
+    """
+    frame = pygame.Surface((W, H)).convert()
 
-        # título
-        title = title_font.render("RANKING - MELHORES TEMPOS", True, (255, 215, 0))
-        screen.blit(title, (W // 2 - title.get_width() // 2, 40))
+    # background
+    frame.fill((10, 10, 20))
 
-        y = 140
-        if not ranking:
-            no_txt = item_font.render("Nenhum registro ainda.", True, (220, 220, 220))
-            screen.blit(no_txt, (W // 2 - no_txt.get_width() // 2, y))
-        else:
-            for i, e in enumerate(ranking):
-                # formatar tempo mm:ss.mmm
-                total = float(e.get('time_seconds', 0.0))
-                minutes = int(total) // 60
-                seconds = int(total) % 60
-                ms = int((total - int(total)) * 1000)
-                timestr = f"{minutes:d}:{seconds:02d}.{ms:03d}"
-                name = e.get('name', '---')
-                text = f"{i+1}. {name} — {timestr}"
-                it = item_font.render(text, True, (230, 230, 230))
-                screen.blit(it, (W // 2 - it.get_width() // 2, y))
-                y += 44
-                # evita desenhar fora da tela
-                if y > H - 140:
-                    break
+    # título
+    title = TEXT.render(title_font, "RANKING - MELHORES TEMPOS", (255, 215, 0))
+    frame.blit(title, (W // 2 - title.get_width() // 2, 40))
 
-        hint = hint_font.render("Pressione ESC/ENTER/Y/A para voltar", True, (180, 180, 180))
-        screen.blit(hint, (W // 2 - hint.get_width() // 2, H - 80))
+    y = 140
+    if not ranking:
+        no_txt = TEXT.render(item_font, "Nenhum registro ainda.", (220, 220, 220))
+        frame.blit(no_txt, (W // 2 - no_txt.get_width() // 2, y))
+    else:
+        for i, e in enumerate(ranking):
+            # formatar tempo mm:ss.mmm
+            total = float(e.get('time_seconds', 0.0))
+            minutes = int(total) // 60
+            seconds = int(total) % 60
+            ms = int((total - int(total)) * 1000)
+            timestr = f"{minutes:d}:{seconds:02d}.{ms:03d}"
+            name = e.get('name', '---')
+            text = f"{i+1}. {name} — {timestr}"
+            it = TEXT.render(item_font, text, (230, 230, 230))
+            frame.blit(it, (W // 2 - it.get_width() // 2, y))
+            y += 44
+            # evita desenhar fora da tela
+            if y > H - 140:
+                break
 
-        pygame.display.flip()
-        clock.tick(30)
+    hint = TEXT.render(hint_font, "Pressione ESC/ENTER/Y/A para voltar", (180, 180, 180))
+    frame.blit(hint, (W // 2 - hint.get_width() // 2, H - 80))
+    return frame
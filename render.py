@@ -0,0 +1,439 @@
+# render.py
+import sys
+import math
+import pygame
+
+from config import (
+    RENDER_BACKEND,
+    RENDER_PIPELINED,
+    RENDER_DIRTY_RECTS,
+    DIRTY_RECT_MAX_FRACTION,
+    DIRTY_RECT_MAX_COUNT,
+    ROTATION_BUCKETS,
+    IDLE_EVENT_WAIT,
+    IDLE_MAX_WAIT_MS,
+)
+from assets import REGISTRY
+from audio import MUSIC
+
+"""
+Apresentação dos quadros: retângulos sujos nas arenas, fila de desenho em lote e espera
+por eventos nas telas paradas.
+
+DirtyRenderer — arenas dos chefes com retângulos sujos (dirty rects).
+
+Nas arenas quase toda a tela é o fundo estático; só o chefe, os jogadores, os projéteis,
+as poças, os lasers e o HUD mudam de um frame para o outro. Em vez de redesenhar o fundo
+inteiro e chamar pygame.display.flip() a cada frame, o DirtyRenderer:
+
+    1. begin():   restaura a partir do fundo só as áreas desenhadas no frame anterior;
+    2. add(rect): recebe os retângulos que cada entidade desenhou neste frame
+                  (os métodos draw(...) das entidades retornam esse retângulo);
+    3. present(): envia para o display só a união "anterior + atual" com
+                  pygame.display.update(rects).
+
+Se a área suja passar de DIRTY_RECT_MAX_FRACTION da tela (explosão de projéteis, tela
+cheia de lasers...) ou o número de retângulos passar de DIRTY_RECT_MAX_COUNT (milhares
+de projéteis), o quadro volta para o caminho completo (display.flip()), que nesse
+caso é mais barato que muitos retângulos. Com RENDER_DIRTY_RECTS = False o renderer
+sempre redesenha o fundo inteiro e usa flip() — o comportamento antigo.
+
+As arenas criam o renderer com stage_renderer(...), que escolhe entre o DirtyRenderer e o
+backend de texturas do SDL2 (texrender.TextureRenderer) conforme RENDER_BACKEND. As
+entidades desenham em renderer.target (a surface do display ou o alvo de texturas), só com
+blit/blits/fill — por isso as bordas usam outline_rect em vez de pygame.draw.rect. Com
+RENDER_PIPELINED o renderer escolhido é embrulhado num pipeline.PipelinedRenderer: as
+arenas passam o frame (simulação + desenho) para renderer.run(step, dt), que no modo serial
+só chama step(dt).
+
+Observação: no modo de resolução lógica (pygame.SCALED) o SDL reenvia a textura inteira
+em qualquer update; mesmo assim economizamos o blit do fundo em tela cheia a cada frame.
+
+RenderQueue — fila de desenho do frame nas arenas.
+
+Em vez de cada entidade desenhar na hora (um draw.circle por projétil, um blit por poça,
+uma Surface SRCALPHA nova por laser a cada frame), as entidades enviam comandos
+(surface, posição, camada) com submit(). No fim, flush() ordena pela camada (estável:
+dentro da camada vale a ordem de envio) e desenha tudo numa única chamada Surface.blits.
+As surfaces enviadas são "carimbos" prontos e compartilhados: circle_stamp(raio, cor)
+para projéteis e rect_stamp(tamanho, cor) para poças e lasers, criados uma vez por
+combinação e reaproveitados por todos os frames. Projéteis com arte usam um RotationSet:
+a imagem rotacionada em ROTATION_BUCKETS ângulos, pré-renderizada no carregamento da fase;
+cada projétil pega a rotação mais próxima da sua direção ao ser criado.
+
+IdleScreen — menu, ranking, entrada de nomes e quadrinhos.
+
+Essas telas ficam paradas a maior parte do tempo (num gabinete, o menu pode ficar horas
+sem ninguém jogando), mas eram redesenhadas inteiras a 30/60 FPS. Com o IdleScreen o loop
+só redesenha quando algo muda (hover, tecla, troca de quadrinho, janela exposta) e, entre
+um evento e outro, dorme em pygame.event.wait com timeout. Enquanto a música está em
+crossfade ou há prefetch de assets pendente, a espera cai para um frame, para que
+MUSIC.update() e REGISTRY.poll() continuem sendo chamados no ritmo de sempre.
+
+Uso:
+    idle = IdleScreen(clock, fps=60)
+    while rodando:
+        for ev in idle.events():
+            ...                     # mudou algo visível -> idle.invalidate()
+        if idle.dirty:
+            ...desenha...
+            idle.present()
+        MUSIC.update()
+"""
+
+
+class DirtyRenderer:
+    """
+    Controla o redesenho do fundo e a apresentação de um frame.
+
+    Construtor:
+        DirtyRenderer(screen, background, enabled=RENDER_DIRTY_RECTS, max_fraction=DIRTY_RECT_MAX_FRACTION,
+                      max_rects=DIRTY_RECT_MAX_COUNT)
+          - screen: surface do display.
+          - background: pygame.Surface do tamanho da tela, ou uma cor (r, g, b) se não houver imagem.
+          - enabled: usa retângulos sujos (True) ou sempre o quadro completo (False).
+          - max_fraction: fração da tela acima da qual o frame cai para o flip completo.
+          - max_rects: quantidade de retângulos acima da qual o frame cai para o flip completo.
+
+    Métodos:
+        - begin(): prepara o frame (restaura o fundo sob o frame anterior).
+        - add(rect): registra uma área desenhada (pygame.Rect, lista de Rects ou None).
+        - present(): apresenta o frame. Retorna a quantidade de pixels enviados.
+        - invalidate(): força um quadro completo no próximo frame (ex.: depois de uma tela
+                        sobreposta, como o tutorial).
+        - run(step, *args): executa o frame — step(*args) atualiza, desenha em target e chama
+                            present(). Retorna o resultado de step (ver pipeline.PipelinedRenderer).
+
+    Atributos:
+        - target: onde as entidades desenham (a própria surface do display).
+        - pixels_pushed: pixels enviados ao display no último frame.
+        - stats: dict com 'full_frames' e 'dirty_frames' (contagem acumulada).
+    """
+
+    def __init__(self, screen, background, enabled=RENDER_DIRTY_RECTS, max_fraction=DIRTY_RECT_MAX_FRACTION,
+                 max_rects=DIRTY_RECT_MAX_COUNT):
+        self.screen = screen
+        self.target = screen
+        self.background = background
+        self.enabled = enabled
+        self.screen_rect = screen.get_rect()
+        self.max_pixels = int(self.screen_rect.w * self.screen_rect.h * max_fraction)
+        self.max_rects = max_rects
+        self._prev = []
+        self._cur = []
+        self._full = True
+        self.pixels_pushed = 0
+        self.stats = {'full_frames': 0, 'dirty_frames': 0}
+
+    def invalidate(self):
+        self._full = True
+
+    def run(self, step, *args):
+        return step(*args)
+
+    def begin(self):
+        self._cur = []
+        if self._full or not self.enabled or len(self._prev) > self.max_rects:
+            self._restore(self.screen_rect)
+            return
+        if isinstance(self.background, pygame.Surface):
+            self.screen.blits([(self.background, r, r) for r in self._prev], False)
+        else:
+            for r in self._prev:
+                self.screen.fill(self.background, r)
+
+    def add(self, rect):
+        if rect is None:
+            return
+        if isinstance(rect, pygame.Rect):
+            self._cur.append(rect)
+        else:
+            self._cur.extend(r for r in rect if r is not None)
+
+    def present(self):
+        if self._full or not self.enabled or len(self._prev) + len(self._cur) > self.max_rects:
+            return self._present_full()
+        rects = _merge([r.clip(self.screen_rect) for r in self._prev + self._cur])
+        pixels = sum(r.w * r.h for r in rects)
+        if pixels > self.max_pixels:
+            return self._present_full()
+        pygame.display.update(rects)
+        self._prev = self._cur
+        self.pixels_pushed = pixels
+        self.stats['dirty_frames'] += 1
+        return pixels
+
+    def _present_full(self):
+        pygame.display.flip()
+        self._prev = self._cur
+        self._full = False
+        self.pixels_pushed = self.screen_rect.w * self.screen_rect.h
+        self.stats['full_frames'] += 1
+        return self.pixels_pushed
+
+    def _restore(self, rect):
+        if isinstance(self.background, pygame.Surface):
+            self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.fill(self.background, rect)
+
+
+def stage_renderer(screen, background, backend=None, pipelined=None):
+    """
+    Cria o renderer de uma arena conforme o backend escolhido.
+
+    Recebe:
+        - screen, background: como no DirtyRenderer.
+        - backend: 'surface' ou 'renderer' (None = RENDER_BACKEND deste módulo, que main.py
+          e benchmark.py podem trocar).
+        - pipelined: simulação numa thread separada do desenho (None = RENDER_PIPELINED
+          deste módulo; ver pipeline.py).
+    Retorna:
+        - DirtyRenderer ou texrender.TextureRenderer (dentro de um pipeline.PipelinedRenderer
+          no modo pipelined); as entidades desenham em renderer.target.
+          Se o backend 'renderer' não puder ser usado, avisa no stderr e usa o de surfaces.
+    """
+    backend = backend or RENDER_BACKEND
+    pipelined = RENDER_PIPELINED if pipelined is None else pipelined
+    renderer = None
+    if backend == 'renderer':
+        from texrender import TextureRenderer
+        try:
+            renderer = TextureRenderer(screen, background)
+        except Exception as e:
+            print(f"Backend 'renderer' indisponível ({e}), usando 'surface'", file=sys.stderr)
+    elif backend != 'surface':
+        print(f"Backend de desenho desconhecido: {backend!r}, usando 'surface'", file=sys.stderr)
+    if renderer is None:
+        renderer = DirtyRenderer(screen, background)
+    if pipelined:
+        from pipeline import PipelinedRenderer
+        renderer = PipelinedRenderer(renderer)
+    return renderer
+
+
+def outline_rect(target, color, rect, width=1):
+    """
+    Borda de `width` pixels de rect (mesmo desenho de pygame.draw.rect(target, color, rect, width)),
+    feita com fill: funciona numa Surface e no alvo do backend de renderer. Retorna o Rect.
+    """
+    r = pygame.Rect(rect)
+    target.fill(color, (r.x, r.y, r.w, width))
+    target.fill(color, (r.x, r.bottom - width, r.w, width))
+    target.fill(color, (r.x, r.y, width, r.h))
+    target.fill(color, (r.right - width, r.y, width, r.h))
+    return r
+
+
+# camadas da fila de desenho (menor = mais ao fundo)
+LAYER_GROUND = 0      # poças no chão
+LAYER_EFFECTS = 1     # lasers e outros overlays
+LAYER_BULLETS = 2     # projéteis
+
+
+class RenderQueue:
+    """
+    Fila de comandos de desenho de um frame, desenhada em lote com Surface.blits.
+
+    Métodos:
+        - submit(surface, pos, layer=0): agenda o blit de surface em pos (x, y) na camada.
+        - flush(target, rects=True): desenha tudo em target, na ordem das camadas (dentro da
+          camada, na ordem de envio), numa única chamada Surface.blits e esvazia a fila. Retorna a lista de Rects desenhados
+          (para o DirtyRenderer) ou None se rects=False.
+
+    Atributos:
+        - frame_stats: dict do último flush — 'commands' (blits feitos) e 'calls'
+          (chamadas de desenho ao pygame).
+        - totals: mesmos contadores acumulados.
+    """
+
+    def __init__(self):
+        # camada -> lista de (surface, pos) na ordem de envio
+        self._layers = {}
+        self._count = 0
+        self.frame_stats = {'commands': 0, 'calls': 0}
+        self.totals = {'commands': 0, 'calls': 0}
+
+    def __len__(self):
+        return self._count
+
+    def submit(self, surface, pos, layer=0):
+        cmds = self._layers.get(layer)
+        if cmds is None:
+            cmds = self._layers[layer] = []
+        cmds.append((surface, pos))
+        self._count += 1
+
+    def flush(self, target, rects=True):
+        layers, count = self._layers, self._count
+        self._layers, self._count = {}, 0
+        calls = 1 if count else 0
+        self.frame_stats = {'commands': count, 'calls': calls}
+        self.totals['commands'] += count
+        self.totals['calls'] += calls
+        if not count:
+            return [] if rects else None
+        # uma lista por camada (já na ordem de envio): basta concatenar na ordem das camadas
+        keys = sorted(layers)
+        cmds = layers[keys[0]]
+        for k in keys[1:]:
+            cmds.extend(layers[k])
+        return target.blits(cmds, rects)
+
+
+# carimbos prontos compartilhados: chave -> Surface
+_STAMPS = {}
+# cor reservada para o fundo transparente dos carimbos (mesma dos sprites com colorkey)
+_STAMP_KEY = (255, 0, 255)
+
+
+def circle_stamp(radius, color):
+    """
+    Círculo preenchido de raio `radius` e cor (r, g, b) numa surface 2r x 2r no formato do
+    display com colorkey (mesmo desenho de pygame.draw.circle centrado em (r, r)). Criado uma
+    vez por (raio, cor). Desenhe em (x - r, y - r) para centralizar em (x, y).
+    Sem RLEACCEL: em carimbos deste tamanho a codificação RLE custa mais por blit do que
+    economiza (ver `python benchmark.py bullets`).
+    """
+    key = ('circle', int(radius), tuple(color))
+    stamp = _STAMPS.get(key)
+    if stamp is None:
+        r = int(radius)
+        stamp = pygame.Surface((2 * r, 2 * r))
+        if pygame.display.get_surface() is not None:
+            stamp = stamp.convert()
+        stamp.fill(_STAMP_KEY)
+        pygame.draw.circle(stamp, color, (r, r), r)
+        stamp.set_colorkey(_STAMP_KEY)
+        _STAMPS[key] = stamp
+    return stamp
+
+
+def rect_stamp(size, color):
+    """
+    Retângulo de cor chapada (r, g, b) ou translúcida (r, g, b, a). O alpha vai na surface
+    inteira (set_alpha), mais barato que alpha por pixel. Criado uma vez por (tamanho, cor).
+    """
+    size = (int(size[0]), int(size[1]))
+    key = ('rect', size, tuple(color))
+    stamp = _STAMPS.get(key)
+    if stamp is None:
+        stamp = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            stamp = stamp.convert()
+        stamp.fill(color[:3])
+        if len(color) > 3:
+            stamp.set_alpha(color[3])
+        _STAMPS[key] = stamp
+    return stamp
+
+
+class RotationSet:
+    """
+    Rotações pré-renderizadas de uma imagem de projétil (a arte aponta para a direita, +x).
+
+    Construtor:
+        RotationSet(image, buckets=ROTATION_BUCKETS) — faz as `buckets` rotações na hora
+        (no carregamento da fase), com rotozoom (bordas suavizadas).
+
+    Métodos:
+        - for_direction(dx, dy): surface da rotação mais próxima do vetor (dx, dy)
+          (coordenadas de tela: y para baixo). Centralize-a na posição do projétil.
+
+    Atributos:
+        - buckets: quantidade de rotações.
+        - frames: lista das surfaces, frames[i] = imagem girada i * 360 / buckets graus
+          (sentido anti-horário na tela).
+    """
+
+    def __init__(self, image, buckets=ROTATION_BUCKETS):
+        self.buckets = max(1, int(buckets))
+        # alpha por pixel antes de girar: colorkey/alpha da surface não sobrevivem ao rotozoom
+        src = image.convert_alpha() if pygame.display.get_surface() is not None else image
+        step = 360.0 / self.buckets
+        self.frames = []
+        for i in range(self.buckets):
+            frame = pygame.transform.rotozoom(src, i * step, 1.0)
+            if pygame.display.get_surface() is not None:
+                frame = frame.convert_alpha()
+            self.frames.append(frame)
+
+    def for_direction(self, dx, dy):
+        # y da tela cresce para baixo: o ângulo anti-horário do vetor é atan2(-dy, dx)
+        angle = math.degrees(math.atan2(-dy, dx))
+        return self.frames[int(round(angle * self.buckets / 360.0)) % self.buckets]
+
+
+class IdleScreen:
+    """
+    Loop de eventos de uma tela parada: redesenho sob demanda + espera bloqueante.
+
+    Construtor:
+        IdleScreen(clock, fps=60, enabled=None, max_wait_ms=IDLE_MAX_WAIT_MS)
+          - clock: pygame.time.Clock (limita a taxa de redesenho a fps).
+          - enabled: None = config.IDLE_EVENT_WAIT; False = redesenha todo frame (antigo).
+          - max_wait_ms: espera máxima sem eventos.
+
+    Métodos:
+        - events(timeout_ms=None): lista de eventos. Se não há redesenho pendente, bloqueia
+          até chegar um evento ou passar timeout_ms (limitado a max_wait_ms; um frame se
+          música/assets ainda precisam de atualização). Eventos de janela exposta/redimensionada
+          marcam a tela como suja.
+        - invalidate(): pede um redesenho.
+        - present(): display.flip() do quadro desenhado e limita a taxa a fps.
+
+    Atributos:
+        - dirty: True se a tela precisa ser redesenhada.
+        - frames: quadros apresentados desde a criação.
+    """
+
+    REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED, pygame.WINDOWRESTORED)
+
+    def __init__(self, clock, fps=60, enabled=None, max_wait_ms=IDLE_MAX_WAIT_MS):
+        self.clock = clock
+        self.fps = fps
+        # lido na criação (e não na definição da função) para o benchmark poder alternar
+        self.enabled = IDLE_EVENT_WAIT if enabled is None else enabled
+        self.max_wait_ms = max_wait_ms
+        self.dirty = True
+        self.frames = 0
+
+    def invalidate(self):
+        self.dirty = True
+
+    def events(self, timeout_ms=None):
+        if not self.enabled:
+            # comportamento antigo: um quadro completo por frame
+            self.dirty = True
+            return pygame.event.get()
+        if self.dirty:
+            return pygame.event.get()
+        wait = self.max_wait_ms if timeout_ms is None else min(self.max_wait_ms, timeout_ms)
+        if MUSIC.busy() or REGISTRY.busy():
+            wait = min(wait, 1000 // self.fps)
+        first = pygame.event.wait(max(1, int(wait)))
+        evs = [] if first.type == pygame.NOEVENT else [first]
+        evs.extend(pygame.event.get())
+        if any(ev.type in self.REDRAW_EVENTS for ev in evs):
+            self.dirty = True
+        return evs
+
+    def present(self):
+        pygame.display.flip()
+        self.dirty = False
+        self.frames += 1
+        self.clock.tick(self.fps)
+
+
+def _merge(rects):
+    """Junta retângulos que se sobrepõem (evita enviar a mesma área duas vezes)."""
+    out = []
+    for r in rects:
+        if r.w <= 0 or r.h <= 0:
+            continue
+        i = r.collidelist(out)
+        while i != -1:
+            r = r.union(out.pop(i))
+            i = r.collidelist(out)
+        out.append(r)
+    return out
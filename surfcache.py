@@ -0,0 +1,161 @@
+# surfcache.py
+from collections import OrderedDict
+import pygame
+
+from config import DERIVED_CACHE_BUDGET_MB
+
+"""
+Cache LRU de surfaces derivadas (espelhadas, escaladas, rotacionadas, tingidas).
+
+Várias partes do jogo produzem surfaces novas a partir de uma original: o jogador
+espelha o frame de caminhada a cada frame quando olha para a esquerda, sprites são
+rotacionados/escalados etc. Cada transformação aloca e preenche uma surface inteira.
+Aqui o resultado fica guardado pela chave (surface de origem, operação, parâmetros)
+e a próxima chamada com os mesmos argumentos é só uma consulta ao dicionário.
+
+A memória é limitada por um orçamento em bytes (config.DERIVED_CACHE_BUDGET_MB): quando
+estoura, as entradas usadas há mais tempo são descartadas (LRU).
+
+A surface de origem é identificada por id() e a entrada guarda uma referência a ela,
+então o id não pode ser reaproveitado por outro objeto enquanto a entrada existir.
+Quando o registro de assets libera uma surface (release_scope/evict), as derivadas dela
+são descartadas junto (forget).
+
+Uso:
+    from surfcache import DERIVED
+    frame = DERIVED.flip(frame, True, False)
+"""
+
+
+def surface_bytes(surf):
+    """Memória ocupada pelos pixels de uma surface (pitch * altura), em bytes."""
+    if surf is None:
+        return 0
+    return surf.get_pitch() * surf.get_height()
+
+
+class SurfaceCache:
+    """
+    Cache LRU de surfaces derivadas com orçamento de memória.
+
+    Construtor:
+        SurfaceCache(budget_bytes) — limite de memória das surfaces guardadas.
+
+    Métodos:
+        - get(src, op, params, build)
+            Retorna a derivada de src identificada por (op, params); chama build() só na falta.
+        - flip(src, flip_x, flip_y) / scale(src, size, smooth=True)
+          rotate(src, angle) / rotozoom(src, angle, scale) / tint(src, color)
+            Atalhos para as transformações usadas pelo jogo (mesmo resultado de pygame.transform).
+        - forget(src)
+            Descarta todas as derivadas de uma surface de origem.
+        - clear()
+            Descarta tudo.
+        - report()
+            String curta com uso de memória e contadores (para log/benchmark).
+
+    Atributos:
+        - budget: limite em bytes.
+        - bytes: memória em uso (bytes).
+        - stats: dict com contadores 'hits', 'misses' e 'evictions'.
+
+    Observação:
+        - As surfaces retornadas são compartilhadas — não desenhe sobre elas.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget = int(budget_bytes)
+        self.bytes = 0
+        # chave -> (surface derivada, surface de origem, bytes); ordem = uso mais antigo primeiro
+        self._entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, src, op, params, build):
+        """
+        Recebe:
+            - src: pygame.Surface de origem.
+            - op: nome da operação (str).
+            - params: tupla (hashável) com os parâmetros da operação.
+            - build: função sem argumentos que cria a derivada (chamada só na falta).
+        Retorna:
+            - pygame.Surface derivada.
+        """
+        key = (id(src), op, params)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[0]
+        self.stats['misses'] += 1
+        surf = build()
+        size = surface_bytes(surf)
+        if size > self.budget:
+            # maior que o orçamento inteiro: entrega sem guardar
+            return surf
+        self._entries[key] = (surf, src, size)
+        self.bytes += size
+        while self.bytes > self.budget:
+            _key, (_surf, _src, old_size) = self._entries.popitem(last=False)
+            self.bytes -= old_size
+            self.stats['evictions'] += 1
+        return surf
+
+    # ------------------------ transformações ------------------------
+
+    def flip(self, src, flip_x, flip_y):
+        if not flip_x and not flip_y:
+            return src
+        return self.get(src, 'flip', (bool(flip_x), bool(flip_y)),
+                        lambda: pygame.transform.flip(src, flip_x, flip_y))
+
+    def scale(self, src, size, smooth=True):
+        size = (int(size[0]), int(size[1]))
+        if size == src.get_size():
+            return src
+        scaler = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        return self.get(src, 'scale', (size, bool(smooth)), lambda: scaler(src, size))
+
+    def rotate(self, src, angle):
+        return self.get(src, 'rotate', (float(angle),), lambda: pygame.transform.rotate(src, angle))
+
+    def rotozoom(self, src, angle, scale):
+        return self.get(src, 'rotozoom', (float(angle), float(scale)),
+                        lambda: pygame.transform.rotozoom(src, angle, scale))
+
+    def tint(self, src, color):
+        """Multiplica as cores de src por color (r, g, b), preservando a transparência."""
+        color = tuple(int(c) for c in color[:3])
+
+        def build():
+            # convert_alpha: multiplicar a cor de uma surface com colorkey estragaria a chave
+            out = src.convert_alpha() if pygame.display.get_surface() is not None else src.copy()
+            out.fill(color + (255,), special_flags=pygame.BLEND_RGBA_MULT)
+            return out
+        return self.get(src, 'tint', color, build)
+
+    # ------------------------ manutenção ------------------------
+
+    def forget(self, src):
+        """Descarta as derivadas de src. Retorna quantas entradas foram removidas."""
+        src_id = id(src)
+        keys = [k for k, e in self._entries.items() if k[0] == src_id and e[1] is src]
+        for k in keys:
+            self.bytes -= self._entries.pop(k)[2]
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def report(self):
+        s = self.stats
+        return (f"derivadas: {len(self._entries)} surface(s), {self.bytes / (1024 * 1024):.1f}/"
+                f"{self.budget / (1024 * 1024):.0f} MB, hits={s['hits']} misses={s['misses']} "
+                f"evictions={s['evictions']}")
+
+
+# instância única usada pelo jogo inteiro
+DERIVED = SurfaceCache(DERIVED_CACHE_BUDGET_MB * 1024 * 1024)
@@ -0,0 +1,44 @@
+# tests/test_assetpack.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import assetpack
+from assetpack import AssetPack, build_pack
+from config import BASE_ASSETS
+
+"""
+Testes do pacote de assets (assetpack.py).
+"""
+
+
+def _tree(tmp_path):
+    root = tmp_path / 'arte'
+    (root / 'img').mkdir(parents=True)
+    (root / 'img' / 'x.png').write_bytes(b'pixels')
+    return root
+
+
+def test_names_are_relative_to_the_assets_dir(tmp_path):
+    root = _tree(tmp_path)
+    out = str(tmp_path / 'assets.pak')
+    # pasta dada por caminho absoluto: o índice usa os mesmos nomes que o jogo procura
+    build_pack(str(root), out)
+    pack = AssetPack(out)
+    assert pack.names() == [f"{BASE_ASSETS}/img/x.png"]
+    assert pack.has(os.path.join(BASE_ASSETS, 'img', 'x.png'))
+
+
+def test_names_missing_from_the_pack_use_loose_files(tmp_path, monkeypatch):
+    root = _tree(tmp_path)
+    out = str(tmp_path / 'assets.pak')
+    build_pack(str(root), out)
+    monkeypatch.setattr(assetpack, 'get_pack', lambda: AssetPack(out))
+    loose = tmp_path / 'novo.png'
+    loose.write_bytes(b'novo')
+    assert assetpack.exists(os.path.join(BASE_ASSETS, 'img', 'x.png'))
+    assert assetpack.exists(str(loose))
+    with assetpack.open_asset(str(loose)) as f:
+        assert f.read() == b'novo'
+    assert not assetpack.exists(str(tmp_path / 'nada.png'))
@@ -0,0 +1,86 @@
+# tests/test_assets.py
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import assetpack
+import bakecache
+from assets import AssetRegistry, image_spec, atlas_spec
+from quality import QUALITY
+
+"""
+Testes do registro de assets (assets.py).
+"""
+
+
+def _png(tmp_path, name='sprite.png'):
+    path = str(tmp_path / name)
+    surf = pygame.Surface((40, 20))
+    surf.fill((10, 120, 200))
+    pygame.image.save(surf, path)
+    return path
+
+
+def _isolate(monkeypatch):
+    # arquivos soltos do tmp_path, sem pacote nem cache em disco
+    monkeypatch.setattr(assetpack, 'get_pack', lambda: None)
+    monkeypatch.setattr(bakecache, 'BAKE_CACHE_ENABLED', False)
+    pygame.display.init()
+    pygame.display.set_mode((64, 64))
+
+
+def test_quality_change_between_prefetch_and_load_is_a_cache_hit(tmp_path, monkeypatch):
+    _isolate(monkeypatch)
+    path = _png(tmp_path)
+    registry = AssetRegistry(workers=2)
+    try:
+        QUALITY.configure('high')
+        manifest = {'sprite': image_spec(path, size=(20, 10)), 'heroi': image_spec(path, height=30)}
+        registry.load(manifest)
+        assert registry.stats['misses'] == 2
+
+        # o governador rebaixa a qualidade antes de a fase pedir os mesmos assets de novo
+        QUALITY.configure('low')
+        again = {'sprite': image_spec(path, size=(20, 10)), 'heroi': image_spec(path, height=30)}
+        loaded = registry.load(again)
+        assert registry.stats == {'hits': 2, 'misses': 2, 'released': 0}
+        assert loaded['sprite'].get_size() == (20, 10)
+        assert len(registry) == 2
+    finally:
+        QUALITY.configure('auto')
+        registry.clear()
+
+
+def test_smooth_does_not_split_height_specs(tmp_path, monkeypatch):
+    _isolate(monkeypatch)
+    path = _png(tmp_path)
+    registry = AssetRegistry(workers=1)
+    try:
+        # height= sempre escala com rotozoom: smooth não muda o resultado nem a chave
+        first = registry.image(path, height=30, smooth=True)
+        second = registry.image(path, height=30, smooth=False)
+        assert first is second
+        assert registry.stats['hits'] == 1
+    finally:
+        registry.clear()
+
+
+def test_unreadable_atlas_frame_is_skipped(tmp_path, monkeypatch):
+    _isolate(monkeypatch)
+    good = _png(tmp_path, 'walk1.png')
+    bad = str(tmp_path / 'walk2.png')
+    with open(bad, 'wb') as f:
+        f.write(b'isto nao e um png')
+    registry = AssetRegistry(workers=1)
+    try:
+        spec = atlas_spec('teste', {'walk': [image_spec(good, height=30), image_spec(bad, height=30)]})
+        atlas = registry.request(spec)
+        assert len(atlas.frames('walk')) == 1
+        assert atlas.find(good) is not None
+        assert atlas.find(bad) is None
+    finally:
+        registry.clear()
@@ -0,0 +1,67 @@
+# tests/test_bakecache.py
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import bakecache
+
+"""
+Testes do cache de surfaces em disco (bakecache.py).
+"""
+
+
+def _setup(tmp_path, monkeypatch, max_mb=512):
+    monkeypatch.setattr(bakecache, 'BAKE_CACHE_DIR', str(tmp_path / 'baked'))
+    monkeypatch.setattr(bakecache, 'BAKE_CACHE_ENABLED', True)
+    monkeypatch.setattr(bakecache, 'BAKE_CACHE_MAX_MB', max_mb)
+    pygame.display.init()
+    pygame.display.set_mode((64, 64))
+
+
+def _source(tmp_path, name, content):
+    path = str(tmp_path / name)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+
+def _entries(tmp_path):
+    return sorted(os.listdir(tmp_path / 'baked'))
+
+
+def test_store_replaces_stale_entry_of_the_same_image(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch)
+    path = _source(tmp_path, 'fundo.png', b'v1')
+    surf = pygame.Surface((32, 16))
+    bakecache.store(path, 'size=(32, 16)', 'opaque', surf)
+    bakecache.store(path, 'size=(8, 4)', 'opaque', pygame.Surface((8, 4)))
+    assert len(_entries(tmp_path)) == 2
+
+    small = bakecache._entry_path(path, 'size=(8, 4)', 'opaque')
+
+    # PNG editado: a entrada antiga da mesma receita sai, a da outra receita fica
+    path = _source(tmp_path, 'fundo.png', b'v2')
+    bakecache.store(path, 'size=(32, 16)', 'opaque', surf)
+    assert len(_entries(tmp_path)) == 2
+    assert os.path.exists(small)
+    assert bakecache.read(path, 'size=(32, 16)', 'opaque') is not None
+
+
+def test_store_keeps_the_directory_under_the_size_limit(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch, max_mb=1)
+    surf = pygame.Surface((256, 256))  # 256 KB por entrada: cabem 3 no limite de 1 MB
+    paths = [_source(tmp_path, f"img{i}.png", bytes([i])) for i in range(5)]
+    for i, path in enumerate(paths[:3]):
+        bakecache.store(path, 'r', 'opaque', surf)
+        # datas de uso distintas (a resolução do relógio do sistema de arquivos varia)
+        os.utime(bakecache._entry_path(path, 'r', 'opaque'), (1000 + i, 1000 + i))
+    # a primeira imagem volta a ser usada: passa a ser a mais recente
+    assert bakecache.read(paths[0], 'r', 'opaque') is not None
+    bakecache.store(paths[3], 'r', 'opaque', surf)
+    bakecache.store(paths[4], 'r', 'opaque', surf)
+    total = sum(os.path.getsize(tmp_path / 'baked' / n) for n in _entries(tmp_path))
+    assert total <= 1024 * 1024
+    assert [bakecache.read(p, 'r', 'opaque') is not None for p in paths] == [True, False, False, True, True]
@@ -0,0 +1,206 @@
+# texrender.py
+from collections import OrderedDict
+import pygame
+
+try:
+    from pygame._sdl2.video import Window, Renderer, Texture
+except ImportError:
+    # pygame sem o módulo _sdl2 (muito antigo): só o backend de surfaces fica disponível
+    Window = Renderer = Texture = None
+
+from config import TEXTURE_CACHE_MAX_ENTRIES
+
+"""
+Backend de renderer/texturas do SDL2 para as arenas (alternativa ao render.DirtyRenderer).
+
+No backend de surfaces tudo é blit de CPU na surface do display e, no modo pygame.SCALED,
+o SDL ainda envia a surface inteira para uma textura e a amplia a cada flip. Aqui os
+sprites viram texturas uma única vez e cada entidade é uma cópia do renderer
+(SDL_RenderCopy): o mesmo renderer que o pygame criou para o modo SCALED, então a
+ampliação para a tela real também é uma cópia do renderer, sem o reenvio do quadro.
+Funciona com o renderer de software do SDL (máquinas sem GPU) e com os acelerados.
+
+Entra no lugar do DirtyRenderer sem mudar o código de desenho das fases:
+
+    - TextureRenderer tem a mesma interface (begin / add / present / invalidate) e o
+      atributo target, onde as entidades desenham;
+    - target é um TextureCanvas, que imita a parte da API de Surface usada pelas arenas
+      (blit, blits, fill, get_size, get_rect...) — draw(...) das entidades e
+      RenderQueue.flush funcionam sem saber qual backend está ativo.
+
+Cada surface desenhada ganha uma textura (cache LRU por surface, no máximo
+config.TEXTURE_CACHE_MAX_ENTRIES). Views de atlas (subsurfaces) usam a textura do atlas
+inteiro com o retângulo de origem, sem textura própria. As surfaces não podem mudar depois
+de desenhadas (os sprites, carimbos e linhas de texto do jogo não mudam).
+
+Escolha com config.RENDER_BACKEND ou `python main.py --backend renderer`
+(ver render.stage_renderer).
+"""
+
+
+def window_renderer():
+    """
+    Renderer SDL que o pygame criou para a janela no modo pygame.SCALED.
+
+    Retorna:
+        - pygame._sdl2.video.Renderer (emprestado: não é destruído junto com o objeto Python).
+    Levanta:
+        - RuntimeError se não houver (pygame sem _sdl2 ou display fora do modo SCALED).
+    """
+    if Renderer is None:
+        raise RuntimeError("pygame sem o módulo _sdl2")
+    try:
+        return Renderer.from_window(Window.from_display_module())
+    except Exception:
+        raise RuntimeError("a janela não tem renderer SDL (modo pygame.SCALED desligado, "
+                           "ver config.RENDER_LOGICAL_SIZE)")
+
+
+class TextureCanvas:
+    """
+    Alvo de desenho com a API de Surface usada pelas arenas, desenhando com um Renderer.
+
+    Construtor:
+        TextureCanvas(renderer, size, max_textures=TEXTURE_CACHE_MAX_ENTRIES)
+
+    Métodos (mesmos argumentos e retornos de pygame.Surface):
+        - blit(source, dest, area=None, special_flags=0) -> Rect
+        - blits(blit_sequence, doreturn=1) -> lista de Rects ou None
+        - fill(color, rect=None, special_flags=0) -> Rect
+        - get_size() / get_width() / get_height() / get_rect()
+        - texture(surface): (Texture, retângulo de origem ou None) — do cache.
+
+    special_flags é ignorado (as texturas usam a mistura de cada surface: alpha por pixel,
+    colorkey ou alpha da surface inteira).
+
+    Atributos:
+        - renderer: o pygame._sdl2.video.Renderer.
+        - stats: dict com 'textures' (criadas), 'hits' e 'evictions' do cache de texturas.
+    """
+
+    def __init__(self, renderer, size, max_textures=TEXTURE_CACHE_MAX_ENTRIES):
+        self.renderer = renderer
+        self._rect = pygame.Rect((0, 0), size)
+        self.max_textures = int(max_textures)
+        # id(surface) -> (Texture, surface, retângulo de origem ou None); ordem = LRU
+        self._textures = OrderedDict()
+        self.stats = {'textures': 0, 'hits': 0, 'evictions': 0}
+
+    def get_size(self):
+        return self._rect.size
+
+    def get_width(self):
+        return self._rect.w
+
+    def get_height(self):
+        return self._rect.h
+
+    def get_rect(self, **kwargs):
+        rect = self._rect.copy()
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def texture(self, surf):
+        key = id(surf)
+        entry = self._textures.get(key)
+        if entry is not None and entry[1] is surf:
+            self._textures.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[0], entry[2]
+        parent = surf.get_abs_parent()
+        if parent is not surf:
+            # view de atlas: textura do atlas inteiro + retângulo da view
+            tex, _src = self.texture(parent)
+            src = pygame.Rect(surf.get_abs_offset(), surf.get_size())
+        else:
+            tex, src = Texture.from_surface(self.renderer, surf), None
+            self.stats['textures'] += 1
+        self._textures[key] = (tex, surf, src)
+        while len(self._textures) > self.max_textures:
+            self._textures.popitem(last=False)
+            self.stats['evictions'] += 1
+        return tex, src
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        tex, src = self.texture(source)
+        x, y = dest[0], dest[1]
+        if area is not None:
+            area = pygame.Rect(area).clip(source.get_rect())
+            if src is not None:
+                area.move_ip(src.x, src.y)
+            src = area
+        w, h = (src.w, src.h) if src is not None else source.get_size()
+        drawn = pygame.Rect(x, y, w, h)
+        tex.draw(srcrect=src, dstrect=drawn)
+        return drawn.clip(self._rect)
+
+    def blits(self, blit_sequence, doreturn=1):
+        blit = self.blit
+        if doreturn:
+            return [blit(*item) for item in blit_sequence]
+        for item in blit_sequence:
+            blit(*item)
+        return None
+
+    def fill(self, color, rect=None, special_flags=0):
+        rect = self._rect.copy() if rect is None else pygame.Rect(rect).clip(self._rect)
+        if rect.w > 0 and rect.h > 0:
+            self.renderer.draw_color = pygame.Color(color)
+            self.renderer.fill_rect(rect)
+        return rect
+
+    def clear(self):
+        self._textures.clear()
+
+
+class TextureRenderer:
+    """
+    Apresentação de um frame das arenas pelo renderer SDL (mesma interface do DirtyRenderer).
+
+    Construtor:
+        TextureRenderer(screen, background)
+          - screen: surface do display (modo pygame.SCALED — ver window_renderer()).
+          - background: pygame.Surface do tamanho da tela, ou uma cor (r, g, b).
+
+    Métodos:
+        - begin(): desenha o fundo (uma cópia de textura; o quadro é sempre completo).
+        - add(rect): aceita e ignora (não há retângulos sujos: o renderer recompõe o quadro).
+        - present(): Renderer.present(). Retorna a quantidade de pixels do quadro.
+        - invalidate(): nada a fazer (todo quadro é completo).
+        - run(step, *args): executa o frame (step desenha e chama present); retorna o
+          resultado de step.
+
+    Atributos:
+        - target: TextureCanvas onde as entidades desenham.
+        - pixels_pushed / stats: como no DirtyRenderer ('full_frames' conta os quadros).
+    """
+
+    def __init__(self, screen, background):
+        renderer = window_renderer()
+        self.screen = screen
+        self.background = background
+        self.target = TextureCanvas(renderer, screen.get_size())
+        self.pixels_pushed = 0
+        self.stats = {'full_frames': 0, 'dirty_frames': 0}
+
+    def invalidate(self):
+        pass
+
+    def run(self, step, *args):
+        return step(*args)
+
+    def begin(self):
+        if isinstance(self.background, pygame.Surface):
+            self.target.blit(self.background, (0, 0))
+        else:
+            self.target.fill(self.background)
+
+    def add(self, rect):
+        pass
+
+    def present(self):
+        self.target.renderer.present()
+        self.pixels_pushed = self.target.get_width() * self.target.get_height()
+        self.stats['full_frames'] += 1
+        return self.pixels_pushed
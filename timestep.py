@@ -0,0 +1,84 @@
+# timestep.py
+from config import SIM_HZ, SIM_MAX_STEPS
+
+"""
+Simulação em passo fixo com interpolação no desenho.
+
+As arenas passavam o dt variável de clock.tick direto para os update(...) das entidades, que
+moviam pygame.Rect com int(velocidade * dt): em FPS alto o deslocamento de um frame arredondava
+para zero (movimento lento parava) e, depois de um carregamento demorado, o primeiro dt enorme
+fazia o jogador atravessar o chão.
+
+Aqui o tempo de cada frame entra num acumulador e a simulação avança em passos de 1 / SIM_HZ
+segundo — quantos couberem. O que sobra (menos de um passo) vira alpha, a fração do caminho
+entre o penúltimo e o último estado: o desenho interpola as posições com esse alpha, então um
+monitor de 120/144 Hz mostra movimento suave com a simulação nos mesmos 60 passos por segundo.
+Frames longos demais são cortados em SIM_MAX_STEPS passos (o resto do tempo é descartado).
+
+As entidades guardam a posição em float (x, y) separada do Rect inteiro usado nas colisões e
+a posição do passo anterior (prev_x, prev_y) para a interpolação — ver lerp.
+
+Uso:
+    timestep = FixedTimestep()
+    ...
+    for _ in range(timestep.advance(frame_dt)):
+        simulate(timestep.dt)
+    draw_scene(timestep.alpha)
+"""
+
+
+def lerp(a, b, alpha):
+    """Interpolação linear de a (alpha = 0) até b (alpha = 1)."""
+    return a + (b - a) * alpha
+
+
+class FixedTimestep:
+    """
+    Acumulador de tempo que converte o tempo de cada frame em passos fixos de simulação.
+
+    Construtor:
+        FixedTimestep(hz=SIM_HZ, max_steps=SIM_MAX_STEPS)
+
+    Métodos:
+        - advance(frame_dt): soma frame_dt (segundos) ao acumulador e retorna quantos passos de
+          dt rodar neste frame (0 a max_steps). Atualiza alpha.
+        - reset(): zera o acumulador (ex.: depois de uma tela sobreposta).
+        - report(): string curta com os contadores.
+
+    Atributos:
+        - dt: duração de um passo (segundos).
+        - alpha: fração (0.0 a 1.0) do próximo passo já decorrida — peso do último estado na
+          interpolação do desenho.
+        - stats: dict com 'frames', 'steps' e 'dropped_ms' (tempo descartado pelo limite).
+    """
+
+    def __init__(self, hz=SIM_HZ, max_steps=SIM_MAX_STEPS):
+        self.dt = 1.0 / float(hz)
+        self.max_steps = max(1, int(max_steps))
+        self.alpha = 1.0
+        self._acc = 0.0
+        self.stats = {'frames': 0, 'steps': 0, 'dropped_ms': 0.0}
+
+    def reset(self):
+        self._acc = 0.0
+        self.alpha = 1.0
+
+    def advance(self, frame_dt):
+        self._acc += max(0.0, frame_dt)
+        steps = int(self._acc / self.dt)
+        if steps > self.max_steps:
+            dropped = self._acc - self.max_steps * self.dt
+            self.stats['dropped_ms'] += dropped * 1000.0
+            steps = self.max_steps
+            self._acc = self.max_steps * self.dt
+        self._acc -= steps * self.dt
+        self.alpha = min(1.0, self._acc / self.dt)
+        self.stats['frames'] += 1
+        self.stats['steps'] += steps
+        return steps
+
+    def report(self):
+        s = self.stats
+        per_frame = s['steps'] / s['frames'] if s['frames'] else 0.0
+        return (f"passo fixo: {1.0 / self.dt:.0f} Hz, {s['steps']} passos em {s['frames']} frames "
+                f"({per_frame:.2f}/frame), descartado {s['dropped_ms']:.0f} ms")
@@ -6,22 +6,30 @@ import pygame
 
 from config import (
     QUADRINHO_DURATION_MS,
+    QUADRINHO_LOOKAHEAD,
     TUTORIAL_PATHS,
     JOYSTICK_SKIP_BUTTON_A,
     JOYSTICK_TUTORIAL_BUTTON_B,
     MOUSE_LEFT,
 )
+from assets import REGISTRY, SCOPE_STAGE, SCOPE_SESSION, image_spec
+from audio import MUSIC
+from render import IdleScreen
+from fonts import FONTS, TEXT
 
 
 # ---------------------- helpers de imagem ----------------------
 
-def load_and_scale(img_path, W, H, keep_aspect=True):
+def load_and_scale(img_path, W, H, keep_aspect=True, scope=SCOPE_STAGE):
     """
     Carrega uma imagem de disco e escala para caber em W x H.
 
     O que faz:
-        - Verifica se o arquivo existe; se não existir retorna None.
-        - Carrega com pygame.image.load(...).convert_alpha() (mantém canal alpha).
+        - Pede a imagem ao registro central de assets (assets.REGISTRY), que só decodifica
+          e escala o arquivo na primeira vez para cada (caminho, tamanho, modo).
+        - Se o arquivo não existir retorna None.
+        - Normaliza o formato pelo conteúdo (convert() se opaca, colorkey se o alpha for
+          binário, convert_alpha() se precisar de alpha por pixel — ver assets.normalize_surface).
         - Se keep_aspect for True, preserva proporção e escala para caber em W x H.
         - Se keep_aspect for False, escala exatamente para (W, H).
     Recebe:
@@ -29,32 +37,49 @@ def load_and_scale(img_path, W, H, keep_aspect=True):
         - W: largura destino (int).
         - H: altura destino (int).
         - keep_aspect: bool (padrão True) — manter proporção ou não.
+        - scope: escopo de vida no registro (padrão SCOPE_STAGE — liberado ao fim da fase).
     Retorna:
-        - pygame.Surface escalada ou None se o arquivo não existir.
+        - pygame.Surface escalada (compartilhada; não modificar) ou None se o arquivo não existir.
     Observações:
         - Usa pygame.transform.smoothscale para qualidade melhor.
         - Lança exceção se ocorrer erro de leitura/decodificação — deixamos propagar,
           mas no código chamador geralmente se verifica existência antes.
     """
-    if not os.path.exists(img_path):
-        return None
-    img = pygame.image.load(img_path).convert_alpha()
-    if keep_aspect:
-        iw, ih = img.get_size()
-        scale = min(W / iw, H / ih)
-        return pygame.transform.smoothscale(img, (int(iw * scale), int(ih * scale)))
-    return pygame.transform.smoothscale(img, (W, H))
+    return REGISTRY.image(img_path, size=(W, H), keep_aspect=keep_aspect, mode='auto', scope=scope)
+
+
+def quadrinhos_manifest(W, H, image_paths, scope=SCOPE_STAGE):
+    """
+    Manifesto de assets de uma sequência de quadrinhos (mesma escala usada por
+    show_quadrinhos_sequence: tela cheia, sem manter proporção).
+
+    Recebe:
+        - W, H: dimensão da tela (int).
+        - image_paths: lista de caminhos das imagens.
+        - scope: escopo de vida no registro de assets.
+    Retorna:
+        - dict caminho -> spec (ver assets.image_spec).
+    """
+    return {p: image_spec(p, size=(W, H), scope=scope) for p in image_paths}
 
 
 # ---------------------- sequência de 'quadrinhos' / tutoriais ----------------------
 
-def show_quadrinhos_sequence(screen, clock, W, H, image_paths, duration_ms=QUADRINHO_DURATION_MS):
+def show_quadrinhos_sequence(screen, clock, W, H, image_paths, duration_ms=QUADRINHO_DURATION_MS, scope=SCOPE_STAGE,
+                             lookahead=QUADRINHO_LOOKAHEAD, prefetch=None):
     """
     Mostra uma sequência de imagens (quadrinhos/tutorial) uma a uma.
 
     O que faz:
-        - Carrega (via load_and_scale) cada imagem da lista image_paths (mantendo
-          a escala definida pelo chamador).
+        - Carrega as imagens em modo "streaming" pelo registro de assets: a primeira é
+          exibida assim que fica pronta, enquanto as `lookahead` seguintes são decodificadas
+          e escaladas em segundo plano.
+        - Cada imagem já exibida é descartada do registro (exceto as que já estavam
+          carregadas antes ou têm escopo de sessão, como o tutorial), então no máximo
+          lookahead + 1 quadrinhos em tela cheia ficam na memória.
+        - Se `prefetch` for informado (manifesto da próxima fase), agenda o carregamento dele
+          em segundo plano logo depois dos primeiros quadrinhos, aproveitando o tempo em que
+          a sequência fica na tela; a cada frame o que já ficou pronto é finalizado aos poucos.
         - Exibe cada imagem por duration_ms milissegundos.
         - Permite pular a imagem atual com teclado (ENTER/SPACE), com o mouse (MOUSE_LEFT),
           ou com joystick A (JOYSTICK_SKIP_BUTTON_A).
@@ -67,65 +92,116 @@ def show_quadrinhos_sequence(screen, clock, W, H, image_paths, duration_ms=QUADR
         - W, H: dimensão da tela (int).
         - image_paths: lista de caminhos para imagens a exibir.
         - duration_ms: duração em ms para cada imagem (padrão vem de config).
+        - scope: escopo de vida das imagens no registro de assets (SCOPE_SESSION para o tutorial,
+          que é reaberto de vários lugares).
+        - lookahead: quantas imagens decodificar à frente da atual (padrão vem de config).
+        - prefetch: manifesto (dict nome -> spec) a pré-carregar durante a sequência, ou None.
     Retorna:
         - True  -> terminou a sequência normalmente.
         - False -> usuário pressionou ESC (ou saiu).
     Observações de implementação:
-        - Faz uso de load_and_scale(..., keep_aspect=False) na chamada original neste projeto,
-          mas aqui usamos o parâmetro recebido (o chamador passa keep_aspect=False normalmente).
+        - As imagens usam a mesma escala de load_and_scale(..., keep_aspect=False)
+          (ver quadrinhos_manifest).
         - A função é síncrona e bloqueante — o loop interno consome eventos até a sequência terminar.
     """
-    imgs = [load_and_scale(p, W, H, keep_aspect=False) for p in image_paths]
+    specs = list(quadrinhos_manifest(W, H, image_paths, scope=scope).values())
+    # só descarta depois de exibir o que esta sequência carregou (e não é de sessão)
+    evictable = [scope != SCOPE_SESSION and not REGISTRY.contains(sp) for sp in specs]
     idx = 0
-    num = len(imgs)
-    while idx < num:
-        img = imgs[idx]
-        start = pygame.time.get_ticks()
-        exited_early = False
-        # tempo de exibição para a imagem atual
-        while pygame.time.get_ticks() - start < duration_ms:
-            for ev in pygame.event.get():
-                if ev.type == pygame.QUIT:
-                    # fechar janela encerra completamente a aplicação
-                    pygame.quit()
-                    sys.exit(0)
-                if ev.type == pygame.KEYDOWN:
-                    if ev.key == pygame.K_ESCAPE:
-                        # cancelar toda a sequência
-                        return False
-                    if ev.key in (pygame.K_RETURN, pygame.K_SPACE):
-                        # pular para a próxima imagem
-                        exited_early = True
-                if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == MOUSE_LEFT:
-                    # clique do mouse pula para a próxima imagem
-                    exited_early = True
-                if ev.type == pygame.JOYBUTTONDOWN and ev.button == JOYSTICK_SKIP_BUTTON_A:
-                    # botão A do joystick pula
+    num = len(specs)
+    try:
+        while idx < num:
+            # agenda as próximas imagens em segundo plano (a atual primeiro, se ainda não carregou)
+            REGISTRY.prefetch({i: specs[i] for i in range(idx, min(num, idx + 1 + max(0, lookahead)))})
+            if prefetch and idx == 0:
+                # entra na fila depois dos primeiros quadrinhos, para não atrasar a abertura
+                REGISTRY.prefetch(prefetch)
+            img = REGISTRY.request(specs[idx])
+            if not _show_quadrinho(screen, clock, W, H, img, image_paths[idx], duration_ms):
+                return False
+            if evictable[idx]:
+                REGISTRY.evict(specs[idx])
+            idx += 1
+    finally:
+        # ESC no meio da sequência: descarta também o que ficou pré-carregado
+        for sp, ev in zip(specs[idx:], evictable[idx:]):
+            if ev:
+                REGISTRY.evict(sp)
+    return True
+
+
+def _show_quadrinho(screen, clock, W, H, img, image_path, duration_ms):
+    """
+    Exibe um único quadrinho por até duration_ms (ver show_quadrinhos_sequence).
+
+    Retorna:
+        - True  -> tempo esgotado ou usuário pulou a imagem.
+        - False -> usuário pressionou ESC (cancelar a sequência).
+    """
+    # a imagem é estática: só é reapresentada quando a janela pede; entre eventos o loop
+    # dorme até o fim do tempo do quadrinho (ou um frame, se há prefetch/crossfade pendente)
+    if img:
+        frame = img
+    else:
+        # fallback visual caso a imagem esteja ausente
+        frame = pygame.Surface((W, H)).convert()
+        frame.fill((0, 0, 0))
+        txt = TEXT.render(FONTS.get(None, 36), f"Imagem ausente: {image_path}", (255, 255, 255))
+        frame.blit(txt, ((W - txt.get_width()) // 2, H // 2))
+    idle = IdleScreen(clock, fps=60)
+    start = pygame.time.get_ticks()
+    exited_early = False
+    # tempo de exibição para a imagem atual
+    while pygame.time.get_ticks() - start < duration_ms:
+        for ev in idle.events(timeout_ms=duration_ms - (pygame.time.get_ticks() - start)):
+            if ev.type == pygame.QUIT:
+                # fechar janela encerra completamente a aplicação
+                pygame.quit()
+                sys.exit(0)
+            if ev.type == pygame.KEYDOWN:
+                if ev.key == pygame.K_ESCAPE:
+                    # cancelar toda a sequência
+                    return False
+                if ev.key in (pygame.K_RETURN, pygame.K_SPACE):
+                    # pular para a próxima imagem
                     exited_early = True
-                if ev.type == pygame.JOYBUTTONDOWN and ev.button == JOYSTICK_TUTORIAL_BUTTON_B:
-                    # abertura do tutorial enquanto outra sequência está sendo exibida:
-                    # chama recursivamente a sequência principal do tutorial (TUTORIAL_PATHS).
-                    # Note que isso empilha chamadas; comportamento intencional no projeto.
-                    show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000)
-            # desenha a imagem atual (ou fallback)
-            if img:
-                screen.blit(img, (0, 0))
-            else:
-                # fallback visual caso a imagem esteja ausente
-                screen.fill((0, 0, 0))
-                f = pygame.font.Font(None, 36)
-                txt = f.render(f"Imagem ausente: {image_paths[idx]}", True, (255, 255, 255))
-                screen.blit(txt, ((W - txt.get_width()) // 2, H // 2))
-            pygame.display.flip()
-            clock.tick(60)
-            if exited_early:
-                break
-        idx += 1
+            if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == MOUSE_LEFT:
+                # clique do mouse pula para a próxima imagem
+                exited_early = True
+            if ev.type == pygame.JOYBUTTONDOWN and ev.button == JOYSTICK_SKIP_BUTTON_A:
+                # botão A do joystick pula
+                exited_early = True
+            if ev.type == pygame.JOYBUTTONDOWN and ev.button == JOYSTICK_TUTORIAL_BUTTON_B:
+                # abertura do tutorial enquanto outra sequência está sendo exibida:
+                # chama recursivamente a sequência principal do tutorial (TUTORIAL_PATHS).
+                # Note que isso empilha chamadas; comportamento intencional no projeto.
+                show_quadrinhos_sequence(screen, clock, W, H, TUTORIAL_PATHS, duration_ms=6000, scope=SCOPE_SESSION)
+                idle.invalidate()
+        # desenha a imagem atual (ou fallback)
+        if idle.dirty:
+            screen.blit(frame, (0, 0))
+            idle.present()
+        # finaliza (convert) um asset pré-carregado por frame, sem travar a exibição
+        REGISTRY.poll()
+        MUSIC.update()
+        if exited_early:
+            break
     return True
 
 
 # ---------------------- entrada de nomes dos jogadores ----------------------
 
+def _name_boxes(W, H):
+    """
+    Caixas de texto da tela de nomes (mesmos retângulos no desenho e no clique do mouse).
+    Medidas em pixels da resolução lógica (config.RENDER_LOGICAL_SIZE), onde o mouse também
+    chega já convertido, então o clique acerta a caixa desenhada em qualquer monitor.
+    """
+    box1 = pygame.Rect(W // 2 - 280, H // 2 - 20, 560, 48)
+    box2 = pygame.Rect(W // 2 - 280, H // 2 + 60, 560, 48)
+    return box1, box2
+
+
 def get_player_names(screen, clock, W, H):
     """
     Interface simples para digitar nomes de dois jogadores.
@@ -150,16 +226,33 @@ def get_player_names(screen, clock, W, H):
           apenas no momento de confirmação (o código atual exige nome2 não vazio).
         - Limite de caracteres por campo: max_len (20).
     """
-    font = pygame.font.Font(None, 40)
-    title_font = pygame.font.Font(None, 64)
+    font = FONTS.get(None, 40)
+    title_font = FONTS.get(None, 64)
     input_boxes = ["", ""]
     active = 0
     max_len = 20
     prompt1 = "Nome do Jogador 1:"
     prompt2 = "Nome do Jogador 2:"
     info = "Enter para confirmar cada nome. ESC para cancelar."
+    box1, box2 = _name_boxes(W, H)
+    # parte fixa do formulário (fundo, título, rótulos, instrução) composta uma vez;
+    # o loop só redesenha as caixas após tecla/clique/botão (ver render.IdleScreen)
+    base = pygame.Surface((W, H)).convert()
+    base.fill((12, 12, 28))
+    title = TEXT.render(title_font, "Digite os nomes", (255, 255, 200))
+    base.blit(title, (W // 2 - title.get_width() // 2, H // 2 - 180))
+    p1 = TEXT.render(font, prompt1, (220, 220, 220))
+    p2 = TEXT.render(font, prompt2, (220, 220, 220))
+    base.blit(p1, (W // 2 - p1.get_width() // 2, H // 2 - 80))
+    base.blit(p2, (W // 2 - p2.get_width() // 2, H // 2))
+    info_s = TEXT.render(font, info, (180, 180, 180))
+    base.blit(info_s, (W // 2 - info_s.get_width() // 2, H // 2 + 140))
+    idle = IdleScreen(clock, fps=30)
     while True:
-        for ev in pygame.event.get():
+        for ev in idle.events():
+            if ev.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.JOYBUTTONDOWN):
+                # qualquer entrada pode mudar o texto ou o campo ativo
+                idle.invalidate()
             if ev.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit(0)
@@ -191,8 +284,6 @@ def get_player_names(screen, clock, W, H):
             if ev.type == pygame.MOUSEBUTTONDOWN:
                 # clique nas áreas predefinidas altera o campo ativo
                 mx, my = ev.pos
-                box1 = pygame.Rect(W // 2 - 280, H // 2 - 20, 560, 48)
-                box2 = pygame.Rect(W // 2 - 280, H // 2 + 60, 560, 48)
                 if box1.collidepoint(mx, my):
                     active = 0
                 if box2.collidepoint(mx, my):
@@ -210,26 +301,18 @@ def get_player_names(screen, clock, W, H):
                     active = 1 - active
 
         # renderização do formulário
-        screen.fill((12, 12, 28))
-        title = title_font.render("Digite os nomes", True, (255, 255, 200))
-        screen.blit(title, (W // 2 - title.get_width() // 2, H // 2 - 180))
-        p1 = font.render(prompt1, True, (220, 220, 220))
-        p2 = font.render(prompt2, True, (220, 220, 220))
-        screen.blit(p1, (W // 2 - p1.get_width() // 2, H // 2 - 80))
-        screen.blit(p2, (W // 2 - p2.get_width() // 2, H // 2))
-        # caixas de entrada
-        box1 = pygame.Rect(W // 2 - 280, H // 2 - 20, 560, 48)
-        box2 = pygame.Rect(W // 2 - 280, H // 2 + 60, 560, 48)
-        color_active = (200, 200, 240)
-        color_inactive = (80, 80, 110)
-        pygame.draw.rect(screen, color_active if active == 0 else color_inactive, box1, border_radius=6)
-        pygame.draw.rect(screen, color_active if active == 1 else color_inactive, box2, border_radius=6)
-        # mostra texto dos campos (ou placeholders)
-        txt1 = font.render(input_boxes[0] or "Player1", True, (10, 10, 20))
-        txt2 = font.render(input_boxes[1] or "Player2", True, (10, 10, 20))
-        screen.blit(txt1, (box1.x + 12, box1.y + 8))
-        screen.blit(txt2, (box2.x + 12, box2.y + 8))
-        info_s = font.render(info, True, (180, 180, 180))
-        screen.blit(info_s, (W // 2 - info_s.get_width() // 2, H // 2 + 140))
-        pygame.display.flip()
-        clock.tick(30)
+        if idle.dirty:
+            screen.blit(base, (0, 0))
+            # caixas de entrada
+            color_active = (200, 200, 240)
+            color_inactive = (80, 80, 110)
+            pygame.draw.rect(screen, color_active if active == 0 else color_inactive, box1, border_radius=6)
+            pygame.draw.rect(screen, color_active if active == 1 else color_inactive, box2, border_radius=6)
+            # mostra texto dos campos (ou placeholders); muda a cada tecla, então fica fora do
+            # TEXT (cada prefixo digitado viraria uma entrada e expulsaria os rótulos fixos)
+            txt1 = font.render(input_boxes[0] or "Player1", True, (10, 10, 20))
+            txt2 = font.render(input_boxes[1] or "Player2", True, (10, 10, 20))
+            screen.blit(txt1, (box1.x + 12, box1.y + 8))
+            screen.blit(txt2, (box2.x + 12, box2.y + 8))
+            idle.present()
+        MUSIC.update()